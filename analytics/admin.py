@@ -1,3 +1,8 @@
 from django.contrib import admin
+from .models import RetentionPolicy
 
-# Register your models here.
+
+@admin.register(RetentionPolicy)
+class RetentionPolicyAdmin(admin.ModelAdmin):
+    list_display = ('user', 'max_datasets', 'max_age_days', 'max_rows')
+    search_fields = ('user__username',)
@@ -1,7 +1,56 @@
+import importlib.util
+import math
+import numpy as np
 import pandas as pd
-from typing import Dict, Any, Tuple
+from typing import BinaryIO, Callable, Dict, Any, Iterator, List, Optional, Tuple, Union
+from django.conf import settings
 from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import Avg, Count, F, Max, Min, Sum
+from . import record_storage
 from .models import Dataset, EquipmentRecord
+from .statistics import NUMERIC_COLUMNS, SummaryAccumulator
+
+
+REQUIRED_COLUMNS = ['Equipment Name', 'Type', 'Flowrate', 'Pressure', 'Temperature']
+
+# Numeric EquipmentRecord fields, as aggregated by the summary queries
+NUMERIC_FIELDS = ['flowrate', 'pressure', 'temperature']
+
+# Declared ingestion schema: only these columns are parsed, with fixed dtypes.
+# Numerics stay float64 so stored values match the FloatField columns exactly.
+CSV_SCHEMA = {
+    'Equipment Name': str,
+    'Type': 'category',
+    'Flowrate': 'float64',
+    'Pressure': 'float64',
+    'Temperature': 'float64',
+}
+
+HAS_PYARROW = importlib.util.find_spec('pyarrow') is not None
+
+# Uploads are read straight from a path or an open file, never copied first
+CsvSource = Union[str, BinaryIO]
+
+VALIDATION_MESSAGES = {
+    'null_flowrate': "Null values found in Flowrate column",
+    'null_pressure': "Null values found in Pressure column",
+    'null_temperature': "Null values found in Temperature column",
+    'non_numeric_flowrate': "Non-numeric values found in Flowrate column",
+    'non_numeric_pressure': "Non-numeric values found in Pressure column",
+    'non_numeric_temperature': "Non-numeric values found in Temperature column",
+    'negative_flowrate': "Negative flowrate values found",
+    'negative_pressure': "Negative pressure values found",
+    'below_absolute_zero': "Temperature values below absolute zero found",
+}
+
+
+class DataValidationError(ValueError):
+    """Raised when uploaded equipment data fails validation"""
+    
+    def __init__(self, message: str, report: Optional[Dict[str, Any]] = None):
+        super().__init__(message)
+        self.report = report or {}
 
 
 class AnalyticsEngine:
@@ -9,6 +58,15 @@ class AnalyticsEngine:
     Analytics engine for processing chemical equipment data
     """
     
+    # Number of CSV rows parsed and validated at a time in streaming mode
+    CHUNK_SIZE = 50000
+    
+    # Number of EquipmentRecord rows sent per INSERT by bulk_create
+    BULK_BATCH_SIZE = 2000
+    
+    # Number of offending row numbers included in validation errors
+    MAX_REPORTED_ROWS = 10
+    
     @staticmethod
     def validate_equipment_data(df: pd.DataFrame) -> Tuple[bool, str]:
         """
@@ -20,33 +78,103 @@ class AnalyticsEngine:
         Returns:
             Tuple of (is_valid, error_message)
         """
-        required_columns = ['Equipment Name', 'Type', 'Flowrate', 'Pressure', 'Temperature']
+        # Check for empty data
+        if df.empty and all(col in df.columns for col in REQUIRED_COLUMNS):
+            return False, "Dataset is empty"
+        
+        try:
+            AnalyticsEngine.validate_and_coerce(df)
+        except DataValidationError as e:
+            return False, str(e)
+        
+        return True, ""
+    
+    @staticmethod
+    def validate_and_coerce(df: pd.DataFrame, first_row: int = 0,
+                            max_reported: int = MAX_REPORTED_ROWS) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+        """
+        Validate equipment data and coerce it into storable form in one pass
+        
+        Every numeric column is coerced to float64 once, and each validation
+        rule is evaluated as a boolean mask over the coerced columns. Rows
+        missing a name or type are dropped, as before; any rule violation
+        rejects the data.
         
+        Args:
+            df: DataFrame containing raw equipment data
+            first_row: Index of the first row of ``df`` within the whole file
+            max_reported: Maximum number of offending rows to report
+            
+        Returns:
+            Tuple of (cleaned DataFrame, validation report)
+            
+        Raises:
+            DataValidationError: If columns are missing or any row breaks a rule
+        """
         # Check required columns
-        missing_columns = [col for col in required_columns if col not in df.columns]
+        missing_columns = [col for col in REQUIRED_COLUMNS if col not in df.columns]
         if missing_columns:
-            return False, f"Missing required columns: {', '.join(missing_columns)}"
+            raise DataValidationError(
+                f"Missing required columns: {', '.join(missing_columns)}",
+                {'missing_columns': missing_columns}
+            )
         
-        # Check for empty data
-        if df.empty:
-            return False, "Dataset is empty"
+        coerced = {}
+        rule_masks = {}
+        for col in NUMERIC_COLUMNS:
+            raw = df[col]
+            if pd.api.types.is_float_dtype(raw.dtype):
+                values = raw
+            else:
+                values = pd.to_numeric(raw, errors='coerce').astype('float64')
+            null_mask = raw.isna()
+            coerced[col] = values
+            rule_masks[f'null_{col.lower()}'] = null_mask
+            rule_masks[f'non_numeric_{col.lower()}'] = values.isna() & ~null_mask
         
-        # Check for null values in critical columns
-        for col in ['Flowrate', 'Pressure', 'Temperature']:
-            if df[col].isnull().any():
-                return False, f"Null values found in {col} column"
+        # Basic sanity checks; NaN compares False so nulls are not double counted
+        rule_masks['negative_flowrate'] = coerced['Flowrate'] < 0
+        rule_masks['negative_pressure'] = coerced['Pressure'] < 0
+        rule_masks['below_absolute_zero'] = coerced['Temperature'] < -273.15
         
-        # Validate numeric ranges (basic sanity checks)
-        if (df['Flowrate'] < 0).any():
-            return False, "Negative flowrate values found"
+        invalid = np.zeros(len(df), dtype=bool)
+        error_counts = {}
+        for rule, mask in rule_masks.items():
+            mask = mask.to_numpy(dtype=bool)
+            count = int(np.count_nonzero(mask))
+            if count:
+                error_counts[rule] = count
+                invalid |= mask
         
-        if (df['Pressure'] < 0).any():
-            return False, "Negative pressure values found"
+        # File rows are 1-based and the header occupies row 1
+        error_rows = (np.flatnonzero(invalid)[:max_reported] + first_row + 2).tolist()
         
-        if (df['Temperature'] < -273.15).any():  # Absolute zero check
-            return False, "Temperature values below absolute zero found"
+        if error_counts:
+            problems = '; '.join(
+                f"{VALIDATION_MESSAGES[rule]} ({count} rows)"
+                for rule, count in error_counts.items()
+            )
+            raise DataValidationError(
+                f"{problems}. First offending rows: {', '.join(map(str, error_rows))}",
+                {'error_counts': error_counts, 'error_rows': error_rows}
+            )
         
-        return True, ""
+        # Remove rows without a name or type
+        keep = (df['Equipment Name'].notna() & df['Type'].notna()).to_numpy(dtype=bool)
+        
+        cleaned = pd.DataFrame({
+            'Equipment Name': df['Equipment Name'].to_numpy()[keep],
+            'Type': df['Type'].array[keep],
+            **{col: coerced[col].to_numpy()[keep] for col in NUMERIC_COLUMNS}
+        })
+        
+        report = {
+            'rows_checked': len(df),
+            'rows_dropped': len(df) - int(np.count_nonzero(keep)),
+            'error_counts': error_counts,
+            'error_rows': error_rows
+        }
+        return cleaned, report
     
     @staticmethod
     def calculate_summary(df: pd.DataFrame) -> Dict[str, Any]:
@@ -59,128 +187,451 @@ class AnalyticsEngine:
         Returns:
             Dictionary containing summary statistics
         """
-        # Basic counts
-        total_count = len(df)
-        
-        # Average values for numeric parameters
-        avg_flowrate = float(df['Flowrate'].mean())
-        avg_pressure = float(df['Pressure'].mean())
-        avg_temperature = float(df['Temperature'].mean())
-        
-        # Equipment type distribution
-        type_distribution = df['Type'].value_counts().to_dict()
-        
-        # Additional statistics
-        flowrate_stats = {
-            'min': float(df['Flowrate'].min()),
-            'max': float(df['Flowrate'].max()),
-            'std': float(df['Flowrate'].std())
-        }
+        return SummaryAccumulator.from_frame(df).summary()
+    
+    @staticmethod
+    def record_columns(df: pd.DataFrame) -> Tuple[list, list, list, list, list]:
+        """
+        Extract the stored record fields from a cleaned DataFrame as columns
         
-        pressure_stats = {
-            'min': float(df['Pressure'].min()),
-            'max': float(df['Pressure'].max()),
-            'std': float(df['Pressure'].std())
-        }
+        Each column is converted in one step from its underlying NumPy array
+        to a list of plain Python values, instead of materializing a pandas
+        Series per row.
         
-        temperature_stats = {
-            'min': float(df['Temperature'].min()),
-            'max': float(df['Temperature'].max()),
-            'std': float(df['Temperature'].std())
-        }
+        Args:
+            df: Cleaned DataFrame containing equipment data
+            
+        Returns:
+            Tuple of (names, types, flowrates, pressures, temperatures) lists
+        """
+        return (
+            df['Equipment Name'].astype(str).tolist(),
+            df['Type'].astype(str).tolist(),
+            df['Flowrate'].to_numpy(dtype='float64').tolist(),
+            df['Pressure'].to_numpy(dtype='float64').tolist(),
+            df['Temperature'].to_numpy(dtype='float64').tolist()
+        )
+    
+    @staticmethod
+    def column_arrays(df: pd.DataFrame) -> Dict[str, Any]:
+        """
+        Extract the stored record fields of a cleaned DataFrame for
+        columnar storage
         
+        Args:
+            df: Cleaned DataFrame containing equipment data
+            
+        Returns:
+            Dictionary mapping each record field to a list of strings or a
+            float64 array
+        """
         return {
-            'total_count': total_count,
-            'averages': {
-                'flowrate': avg_flowrate,
-                'pressure': avg_pressure,
-                'temperature': avg_temperature
-            },
-            'type_distribution': type_distribution,
-            'detailed_stats': {
-                'flowrate': flowrate_stats,
-                'pressure': pressure_stats,
-                'temperature': temperature_stats
-            }
+            'equipment_name': df['Equipment Name'].astype(str).tolist(),
+            'equipment_type': df['Type'].astype(str).tolist(),
+            'flowrate': df['Flowrate'].to_numpy(dtype='float64'),
+            'pressure': df['Pressure'].to_numpy(dtype='float64'),
+            'temperature': df['Temperature'].to_numpy(dtype='float64')
         }
     
     @staticmethod
-    def process_csv(file_path: str, user: User, filename: str) -> Tuple[Dataset, Dict[str, Any]]:
+    def build_records(dataset: Dataset, df: pd.DataFrame) -> List[EquipmentRecord]:
+        """
+        Build unsaved EquipmentRecord instances for a cleaned DataFrame
+        
+        Args:
+            dataset: Dataset the records belong to
+            df: Cleaned DataFrame containing equipment data
+            
+        Returns:
+            List of EquipmentRecord objects ready for bulk_create
+        """
+        dataset_id = dataset.id
+        return [
+            EquipmentRecord(
+                dataset_id=dataset_id,
+                equipment_name=name,
+                equipment_type=eq_type,
+                flowrate=flowrate,
+                pressure=pressure,
+                temperature=temperature
+            )
+            for name, eq_type, flowrate, pressure, temperature
+            in zip(*AnalyticsEngine.record_columns(df))
+        ]
+    
+    @staticmethod
+    def process_csv(source: CsvSource, user: User, filename: str,
+                    chunk_size: Optional[int] = CHUNK_SIZE,
+                    batch_size: int = BULK_BATCH_SIZE,
+                    progress_callback: Optional[Callable[[int], None]] = None,
+                    storage: Optional[str] = None) -> Tuple[Dataset, Dict[str, Any]]:
         """
         Process CSV file and store data in database
         
+        The file is streamed in chunks of ``chunk_size`` rows so peak memory
+        stays bounded by the chunk size rather than the file size. Pass
+        ``chunk_size=None`` to load the whole file at once.
+        
         Args:
-            file_path: Path to the CSV file
+            source: Path to the CSV file or a readable binary file object
             user: User who uploaded the file
             filename: Original filename
+            chunk_size: Rows to read per chunk, or None to read the whole file
+            batch_size: Rows per INSERT when bulk creating records
+            progress_callback: Optional callable receiving the number of
+                rows read so far after each chunk is stored
+            storage: Dataset.STORAGE_ROWS or Dataset.STORAGE_COLUMNAR,
+                the RECORD_STORAGE setting by default
             
         Returns:
             Tuple of (Dataset object, summary statistics)
         """
-        # Read CSV file
-        df = pd.read_csv(file_path)
-        
-        # Validate data
-        is_valid, error_message = AnalyticsEngine.validate_equipment_data(df)
-        if not is_valid:
-            raise ValueError(error_message)
-        
-        # Clean and prepare data
-        df = df.dropna()  # Remove any rows with null values
-        
-        # Ensure proper data types
-        df['Flowrate'] = pd.to_numeric(df['Flowrate'], errors='coerce')
-        df['Pressure'] = pd.to_numeric(df['Pressure'], errors='coerce')
-        df['Temperature'] = pd.to_numeric(df['Temperature'], errors='coerce')
-        
-        # Remove any rows that couldn't be converted to numeric
-        df = df.dropna()
-        
-        # Calculate summary statistics
-        summary = AnalyticsEngine.calculate_summary(df)
-        
-        # Create Dataset record
-        dataset = Dataset.objects.create(
-            filename=filename,
-            record_count=summary['total_count'],
-            user=user,
-            avg_flowrate=summary['averages']['flowrate'],
-            avg_pressure=summary['averages']['pressure'],
-            avg_temperature=summary['averages']['temperature'],
-            type_distribution=summary['type_distribution']
-        )
+        storage = storage or settings.RECORD_STORAGE
+        if storage not in record_storage.STORAGE_MODES:
+            raise ValueError(f"storage must be one of: {', '.join(record_storage.STORAGE_MODES)}")
         
-        # Create EquipmentRecord entries
-        equipment_records = []
-        for _, row in df.iterrows():
-            equipment_records.append(
-                EquipmentRecord(
-                    dataset=dataset,
-                    equipment_name=str(row['Equipment Name']),
-                    equipment_type=str(row['Type']),
-                    flowrate=float(row['Flowrate']),
-                    pressure=float(row['Pressure']),
-                    temperature=float(row['Temperature'])
-                )
+        accumulator = SummaryAccumulator()
+        
+        # Records are written as each chunk is validated, so a bad chunk
+        # further down the file must roll back everything inserted so far
+        with transaction.atomic():
+            dataset = Dataset.objects.create(
+                filename=filename,
+                record_count=0,
+                user=user,
+                avg_flowrate=0.0,
+                avg_pressure=0.0,
+                avg_temperature=0.0,
+                type_distribution={},
+                storage=storage
+            )
+            
+            AnalyticsEngine._ingest_chunks(
+                dataset, source, accumulator, chunk_size, batch_size, progress_callback
             )
+            summary = AnalyticsEngine._store_summary(dataset, accumulator)
         
-        # Bulk create for efficiency
-        EquipmentRecord.objects.bulk_create(equipment_records)
+        return dataset, summary
+    
+    @staticmethod
+    def append_csv(dataset: Dataset, source: CsvSource,
+                   chunk_size: Optional[int] = CHUNK_SIZE,
+                   batch_size: int = BULK_BATCH_SIZE) -> Tuple[Dataset, Dict[str, Any]]:
+        """
+        Append the rows of a CSV file to an existing dataset
+        
+        The dataset summary is updated from its stored accumulator state,
+        so the cost is proportional to the new rows only.
+        
+        Args:
+            dataset: Dataset to append to
+            source: Path or readable binary file object with the new rows
+            chunk_size: Rows to read per chunk, or None to read the whole file
+            batch_size: Rows per INSERT when bulk creating records
+            
+        Returns:
+            Tuple of (updated Dataset object, summary statistics)
+        """
+        with transaction.atomic():
+            # Lock the row so concurrent appends cannot lose each other's counts
+            dataset = Dataset.objects.select_for_update().get(pk=dataset.pk)
+            accumulator = AnalyticsEngine.load_accumulator(dataset)
+            
+            AnalyticsEngine._ingest_chunks(dataset, source, accumulator, chunk_size, batch_size)
+            dataset.version += 1
+            summary = AnalyticsEngine._store_summary(dataset, accumulator)
         
         return dataset, summary
     
     @staticmethod
-    def cleanup_old_datasets(user: User, limit: int = 5):
+    def load_accumulator(dataset: Dataset) -> SummaryAccumulator:
+        """
+        Restore the summary accumulator of a dataset
+        
+        Datasets created before accumulator state was stored are rebuilt
+        once from a single aggregate query over their records.
+        
+        Args:
+            dataset: Dataset whose accumulator to load
+            
+        Returns:
+            SummaryAccumulator covering every stored record of the dataset
+        """
+        if dataset.summary_state is not None:
+            return SummaryAccumulator.from_dict(dataset.summary_state)
+        
+        if record_storage.is_columnar(dataset):
+            columns = record_storage.load_columns(dataset, ['equipment_type', *NUMERIC_FIELDS])
+            return SummaryAccumulator.from_frame(pd.DataFrame({
+                'Type': columns['equipment_type'],
+                'Flowrate': columns['flowrate'],
+                'Pressure': columns['pressure'],
+                'Temperature': columns['temperature']
+            }))
+        
+        fields = NUMERIC_FIELDS
+        aggregates = {'count': Count('id')}
+        for field in fields:
+            aggregates[f'{field}_avg'] = Avg(field)
+            aggregates[f'{field}_min'] = Min(field)
+            aggregates[f'{field}_max'] = Max(field)
+            aggregates[f'{field}_sum_sq'] = Sum(F(field) * F(field))
+        totals = EquipmentRecord.objects.filter(dataset=dataset).aggregate(**aggregates)
+        
+        count = totals['count']
+        state = {'count': count, 'type_counts': dict(dataset.type_distribution or {})}
+        for field in fields:
+            mean = totals[f'{field}_avg'] or 0.0
+            state[field] = {
+                'mean': mean,
+                'm2': max((totals[f'{field}_sum_sq'] or 0.0) - count * mean * mean, 0.0),
+                'min': totals[f'{field}_min'],
+                'max': totals[f'{field}_max']
+            }
+        return SummaryAccumulator.from_dict(state)
+    
+    @staticmethod
+    def type_statistics(dataset: Dataset) -> List[Dict[str, Any]]:
+        """
+        Per equipment type statistics of every numeric parameter
+        
+        Computed by a single grouped aggregate query, so no records are
+        loaded into Python; columnar datasets are grouped in pandas over
+        their loaded columns instead. Standard deviations are sample
+        deviations, as in the dataset summary, derived from sums of squares
+        (SQLite's STDDEV_SAMP fails on single-record groups), and None for
+        types with a single record.
+        
+        Args:
+            dataset: Dataset to break down
+            
+        Returns:
+            One dictionary per equipment type, ordered by type, with its
+            count and the mean, min, max and std of each parameter
+        """
+        if record_storage.is_columnar(dataset):
+            return AnalyticsEngine._column_type_statistics(dataset)
+        
+        fields = NUMERIC_FIELDS
+        aggregates = {'count': Count('id')}
+        for field in fields:
+            aggregates[f'{field}_mean'] = Avg(field)
+            aggregates[f'{field}_min'] = Min(field)
+            aggregates[f'{field}_max'] = Max(field)
+            aggregates[f'{field}_sum_sq'] = Sum(F(field) * F(field))
+        
+        rows = (
+            EquipmentRecord.objects.filter(dataset=dataset)
+            .values('equipment_type')
+            .annotate(**aggregates)
+            .order_by('equipment_type')
+        )
+        
+        breakdown = []
+        for row in rows:
+            count = row['count']
+            entry = {'equipment_type': row['equipment_type'], 'count': count}
+            for field in fields:
+                mean = row[f'{field}_mean']
+                std = None
+                if count > 1:
+                    m2 = max(row[f'{field}_sum_sq'] - count * mean * mean, 0.0)
+                    std = math.sqrt(m2 / (count - 1))
+                entry[field] = {
+                    'mean': mean,
+                    'min': row[f'{field}_min'],
+                    'max': row[f'{field}_max'],
+                    'std': std
+                }
+            breakdown.append(entry)
+        return breakdown
+    
+    @staticmethod
+    def _column_type_statistics(dataset: Dataset) -> List[Dict[str, Any]]:
+        """type_statistics of a columnar dataset"""
+        frame = pd.DataFrame(record_storage.load_columns(dataset, ['equipment_type', *NUMERIC_FIELDS]))
+        grouped = frame.groupby('equipment_type', sort=True)[NUMERIC_FIELDS]
+        counts = grouped.size()
+        means, mins, maxs, stds = grouped.mean(), grouped.min(), grouped.max(), grouped.std()
+        
+        breakdown = []
+        for eq_type, count in counts.items():
+            entry = {'equipment_type': eq_type, 'count': int(count)}
+            for field in NUMERIC_FIELDS:
+                entry[field] = {
+                    'mean': float(means.at[eq_type, field]),
+                    'min': float(mins.at[eq_type, field]),
+                    'max': float(maxs.at[eq_type, field]),
+                    'std': float(stds.at[eq_type, field]) if count > 1 else None
+                }
+            breakdown.append(entry)
+        return breakdown
+    
+    @staticmethod
+    def _ingest_chunks(dataset: Dataset, source: CsvSource, accumulator: SummaryAccumulator,
+                       chunk_size: Optional[int], batch_size: int,
+                       progress_callback: Optional[Callable[[int], None]] = None):
+        """
+        Validate, store and accumulate every chunk of a CSV file
+        
+        Columnar datasets store each chunk as one column segment instead of
+        inserting a row per record.
+        """
+        rows_read = 0
+        # Appends start from the dataset's stored statistics
+        starting_count = accumulator.count
+        columnar = record_storage.is_columnar(dataset)
+        
+        for chunk in AnalyticsEngine._iter_csv_chunks(source, chunk_size):
+            chunk, report = AnalyticsEngine.validate_and_coerce(chunk, first_row=rows_read)
+            rows_read += report['rows_checked']
+            accumulator.update(chunk)
+            if columnar:
+                record_storage.write_segment(dataset, AnalyticsEngine.column_arrays(chunk))
+            else:
+                EquipmentRecord.objects.bulk_create(
+                    AnalyticsEngine.build_records(dataset, chunk),
+                    batch_size=batch_size
+                )
+            if progress_callback:
+                progress_callback(rows_read)
+        
+        # Counted after validation, which drops rows without a name or type
+        if accumulator.count == starting_count:
+            raise ValueError("Dataset is empty")
+    
+    @staticmethod
+    def _store_summary(dataset: Dataset, accumulator: SummaryAccumulator) -> Dict[str, Any]:
+        """Write the accumulator's summary into the dataset row"""
+        summary = accumulator.summary()
+        
+        dataset.record_count = summary['total_count']
+        dataset.avg_flowrate = summary['averages']['flowrate']
+        dataset.avg_pressure = summary['averages']['pressure']
+        dataset.avg_temperature = summary['averages']['temperature']
+        dataset.type_distribution = summary['type_distribution']
+        dataset.summary_state = accumulator.to_dict()
+        dataset.save(update_fields=[
+            'record_count', 'avg_flowrate', 'avg_pressure',
+            'avg_temperature', 'type_distribution', 'summary_state', 'version'
+        ])
+        
+        return summary
+    
+    @staticmethod
+    def read_csv(source: CsvSource, chunk_size: Optional[int] = None, typed_numerics: bool = True):
+        """
+        Read an equipment CSV file using the declared ingestion schema
+        
+        Only the required columns are parsed: numerics as float64, the
+        equipment type as a categorical. Whole-file reads use the pyarrow
+        engine when it is installed.
+        
+        Args:
+            source: Path to the CSV file or a readable binary file object
+            chunk_size: Rows per chunk, or None to read the whole file
+            typed_numerics: Parse numeric columns with their declared dtype;
+                when False pandas infers them so bad values can be reported
+            
+        Returns:
+            DataFrame, or a reader yielding DataFrames when chunk_size is set
+        """
+        dtype = dict(CSV_SCHEMA)
+        if not typed_numerics:
+            for col in NUMERIC_COLUMNS:
+                del dtype[col]
+        
+        if chunk_size is None and HAS_PYARROW and typed_numerics:
+            try:
+                return pd.read_csv(source, engine='pyarrow', usecols=list(CSV_SCHEMA), dtype=dtype)
+            except Exception:
+                # Missing columns and unparseable values are reported by the
+                # C engine path below, which validation already understands
+                AnalyticsEngine._rewind(source)
+        
+        return pd.read_csv(
+            source,
+            usecols=lambda col: col in CSV_SCHEMA,
+            dtype=dtype,
+            chunksize=chunk_size
+        )
+    
+    @staticmethod
+    def _iter_csv_chunks(source: CsvSource, chunk_size: Optional[int]) -> Iterator[pd.DataFrame]:
+        """Yield the CSV file as DataFrames of at most chunk_size rows"""
+        try:
+            if chunk_size is None:
+                yield AnalyticsEngine.read_csv(source)
+                return
+            
+            with AnalyticsEngine.read_csv(source, chunk_size) as reader:
+                yield from reader
+        except ValueError:
+            # The typed parser stops at the first value it cannot convert;
+            # re-scan without numeric dtypes to report every offending row
+            AnalyticsEngine._rewind(source)
+            AnalyticsEngine._diagnose_csv(source, chunk_size)
+            raise
+    
+    @staticmethod
+    def _rewind(source: CsvSource):
+        """Seek a file object source back to its start so it can be re-read"""
+        if hasattr(source, 'seek'):
+            source.seek(0)
+    
+    @staticmethod
+    def _diagnose_csv(source: CsvSource, chunk_size: Optional[int]):
+        """Run full validation over a CSV file, raising DataValidationError on failure"""
+        if chunk_size is None:
+            AnalyticsEngine.validate_and_coerce(AnalyticsEngine.read_csv(source, typed_numerics=False))
+            return
+        
+        rows_read = 0
+        with AnalyticsEngine.read_csv(source, chunk_size, typed_numerics=False) as reader:
+            for chunk in reader:
+                AnalyticsEngine.validate_and_coerce(chunk, first_row=rows_read)
+                rows_read += len(chunk)
+    
+    @staticmethod
+    def cleanup_old_datasets(user: User, limit: int = 5) -> int:
         """
         Remove old datasets beyond the specified limit
         
         Args:
             user: User whose datasets to clean up
             limit: Maximum number of datasets to keep
+            
+        Returns:
+            Number of datasets removed
+        """
+        stale_ids = list(
+            Dataset.objects.filter(user=user)
+            .order_by('-upload_timestamp')
+            .values_list('id', flat=True)[limit:]
+        )
+        return AnalyticsEngine.purge_datasets(stale_ids)
+    
+    @staticmethod
+    def purge_datasets(dataset_ids: List[int]) -> int:
+        """
+        Delete datasets and everything stored for them in one transaction
+        
+        One queryset delete covers all of them: a single DELETE of their
+        equipment records by dataset_id, an UPDATE detaching processing jobs
+        and a single DELETE of the datasets. Equipment records are never
+        loaded, as nothing else references them; only the id and owner of
+        each dataset are loaded, for the post_delete handlers that drop its
+        cached responses and stored reports.
+        
+        Args:
+            dataset_ids: IDs of the datasets to delete
+            
+        Returns:
+            Number of datasets removed
         """
-        user_datasets = Dataset.objects.filter(user=user).order_by('-upload_timestamp')
+        if not dataset_ids:
+            return 0
         
-        if user_datasets.count() > limit:
-            datasets_to_delete = user_datasets[limit:]
-            for dataset in datasets_to_delete:
-                dataset.delete()  # This will cascade delete related EquipmentRecords
\ No newline at end of file
+        with transaction.atomic():
+            _, deleted = Dataset.objects.filter(id__in=dataset_ids).only('id', 'user').delete()
+        return deleted.get(Dataset._meta.label, 0)
\ No newline at end of file
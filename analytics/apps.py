@@ -1,6 +1,61 @@
-from django.apps import AppConfig
+import os
+import sys
+import threading
+import time
+from django.apps import AppConfig, apps
+from django.conf import settings
+
+
+# Programs whose processes serve web requests
+SERVER_PROGRAMS = ('gunicorn', 'uwsgi', 'uvicorn', 'daphne', 'hypercorn', 'waitress-serve', 'mod_wsgi')
+
+
+def serves_requests() -> bool:
+    """
+    Whether this process serves web requests, rather than running a
+    management command (migrate, test, ...), a script or the runserver
+    autoreloader; BACKGROUND_SERVICES overrides the guess
+    """
+    if settings.BACKGROUND_SERVICES != 'auto':
+        return settings.BACKGROUND_SERVICES == 'on'
+    
+    program = os.path.basename(sys.argv[0]) if sys.argv else ''
+    if program in ('manage.py', 'django-admin'):
+        if len(sys.argv) < 2 or sys.argv[1] != 'runserver':
+            return False
+        # The autoreloader runs the server in a child process with RUN_MAIN set
+        return '--noreload' in sys.argv or os.environ.get('RUN_MAIN') == 'true'
+    return program in SERVER_PROGRAMS
+
+
+def start_background_services():
+    """
+    Start the report pool and the retention sweeper, and drain the job
+    queue of a server process
+    """
+    # Started from ready(), which runs before the app registry is complete
+    while not apps.ready:
+        time.sleep(0.05)
+    
+    from . import jobs, report_service, retention
+    report_service.start_pool()
+    # Full sweeps apply the age rule even when nobody uploads
+    retention.start_sweeper()
+    # Run jobs queued before a restart, and recover those it interrupted
+    jobs.wake_workers()
 
 
 class AnalyticsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'analytics'
+    
+    def ready(self):
+        # Register signal handlers that invalidate cached responses
+        from . import signals  # noqa: F401
+        
+        from . import report_service
+        # Report pool processes set Django up too, and must not start pools
+        if serves_requests() and not report_service._in_worker:
+            threading.Thread(
+                target=start_background_services, name='analytics-startup', daemon=True
+            ).start()
@@ -0,0 +1,311 @@
+import hashlib
+import io
+import os
+import shutil
+from datetime import datetime
+from typing import BinaryIO, Iterator, List, Optional
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.utils import timezone
+from .models import UploadSession, UploadPart, upload_expiry
+
+
+class UploadError(ValueError):
+    """Raised when a chunked upload request cannot be accepted"""
+
+
+def session_dir(session: UploadSession) -> str:
+    """Directory holding the received parts of an upload session"""
+    return os.path.join(settings.MEDIA_ROOT, 'uploads', str(session.id))
+
+
+def part_path(session: UploadSession, number: int) -> str:
+    """Path of a stored part file"""
+    return os.path.join(session_dir(session), f'{number:06d}.part')
+
+
+def create_session(user: User, filename: str, total_size: int,
+                   part_size: Optional[int] = None) -> UploadSession:
+    """
+    Start a resumable upload
+    
+    Args:
+        user: User uploading the file
+        filename: Original filename
+        total_size: Size of the whole file in bytes
+        part_size: Requested part size, kept between
+            CHUNKED_UPLOAD_MIN_PART_SIZE and CHUNKED_UPLOAD_MAX_PART_SIZE
+    
+    Returns:
+        The new UploadSession
+    """
+    if not filename.endswith('.csv'):
+        raise UploadError('File must be a CSV file')
+    
+    if total_size < 0 or total_size > settings.CHUNKED_UPLOAD_MAX_SIZE:
+        raise UploadError(
+            f'File size must be between 0 and {settings.CHUNKED_UPLOAD_MAX_SIZE} bytes'
+        )
+    
+    part_size = part_size or settings.CHUNKED_UPLOAD_PART_SIZE
+    part_size = max(
+        settings.CHUNKED_UPLOAD_MIN_PART_SIZE,
+        min(part_size, settings.CHUNKED_UPLOAD_MAX_PART_SIZE)
+    )
+    
+    session = UploadSession.objects.create(
+        user=user,
+        filename=filename,
+        total_size=total_size,
+        part_size=part_size
+    )
+    os.makedirs(session_dir(session), exist_ok=True)
+    return session
+
+
+def store_part(session: UploadSession, number: int, stream: BinaryIO,
+               expected_checksum: Optional[str] = None) -> UploadPart:
+    """
+    Write one part to disk, verifying its size and SHA-256 checksum
+    
+    The part is written to a temporary file and only moved into place once
+    it is complete and verified, so an interrupted request leaves the part
+    missing rather than corrupt. Re-sending a part replaces it.
+    
+    Args:
+        session: Upload session the part belongs to
+        number: 1-based part number
+        stream: Readable stream of the part body
+        expected_checksum: Hex SHA-256 digest sent by the client, if any
+    
+    Returns:
+        The stored UploadPart
+    """
+    if session.status != UploadSession.STATUS_RECEIVING:
+        raise UploadError('Upload is already complete')
+    
+    if number < 1 or number > session.total_parts:
+        raise UploadError(f'Part number must be between 1 and {session.total_parts}')
+    
+    expected_size = session.expected_part_size(number)
+    digest = hashlib.sha256()
+    size = 0
+    
+    final_path = part_path(session, number)
+    temp_path = f'{final_path}.tmp'
+    os.makedirs(session_dir(session), exist_ok=True)
+    
+    try:
+        with open(temp_path, 'wb') as part_file:
+            while True:
+                block = stream.read(64 * 1024)
+                if not block:
+                    break
+                size += len(block)
+                if size > expected_size:
+                    raise UploadError(f'Part {number} must be {expected_size} bytes')
+                digest.update(block)
+                part_file.write(block)
+        
+        if size != expected_size:
+            raise UploadError(f'Part {number} must be {expected_size} bytes, received {size}')
+        
+        checksum = digest.hexdigest()
+        if expected_checksum and expected_checksum.lower() != checksum:
+            raise UploadError(f'Checksum mismatch for part {number}')
+        
+        os.replace(temp_path, final_path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    
+    part, _ = UploadPart.objects.update_or_create(
+        session=session,
+        number=number,
+        defaults={'size': size, 'checksum': checksum}
+    )
+    
+    # An upload that is still receiving parts is not abandoned
+    UploadSession.objects.filter(id=session.id).update(expires_at=upload_expiry())
+    return part
+
+
+def missing_ranges(session: UploadSession) -> List[List[int]]:
+    """
+    Part numbers that have not been received yet, as inclusive
+    ``[first, last]`` ranges
+    
+    Built from the received part numbers, so the result stays small however
+    many parts the session has.
+    """
+    ranges = []
+    next_number = 1
+    for number in session.parts.order_by('number').values_list('number', flat=True):
+        if number > next_number:
+            ranges.append([next_number, number - 1])
+        next_number = number + 1
+    if next_number <= session.total_parts:
+        ranges.append([next_number, session.total_parts])
+    return ranges
+
+
+def session_status(session: UploadSession) -> dict:
+    """
+    Describe an upload session so a client can resume it
+    
+    Args:
+        session: Upload session to describe
+    
+    Returns:
+        Dictionary with the session layout and received part checksums
+    """
+    received = [
+        {'number': part.number, 'size': part.size, 'checksum': part.checksum}
+        for part in session.parts.all()
+    ]
+    
+    return {
+        'upload_id': str(session.id),
+        'filename': session.filename,
+        'size': session.total_size,
+        'part_size': session.part_size,
+        'total_parts': session.total_parts,
+        'status': session.status,
+        'expires_at': session.expires_at.isoformat(),
+        'received_parts': received,
+        'missing_ranges': missing_ranges(session)
+    }
+
+
+class PartsReader(io.RawIOBase):
+    """
+    Read the stored parts of a session as one continuous, seekable file
+    
+    Lets the ingestion worker stream the upload without first assembling
+    the parts into a single file.
+    """
+    
+    def __init__(self, session: UploadSession):
+        super().__init__()
+        self.session = session
+        self.position = 0
+        self.current_number = None
+        self.current_file = None
+    
+    def readable(self):
+        return True
+    
+    def seekable(self):
+        return True
+    
+    def tell(self):
+        return self.position
+    
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self.position
+        elif whence == io.SEEK_END:
+            offset += self.session.total_size
+        self.position = max(0, min(offset, self.session.total_size))
+        return self.position
+    
+    def readinto(self, buffer):
+        if self.position >= self.session.total_size:
+            return 0
+        
+        number = self.position // self.session.part_size + 1
+        if number != self.current_number:
+            self._close_current()
+            self.current_file = open(part_path(self.session, number), 'rb')
+            self.current_number = number
+        
+        self.current_file.seek(self.position - (number - 1) * self.session.part_size)
+        data = self.current_file.read(len(buffer))
+        buffer[:len(data)] = data
+        self.position += len(data)
+        return len(data)
+    
+    def iter_chunks(self, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+        """Yield the assembled file in blocks, like UploadedFile.chunks()"""
+        self.seek(0)
+        while True:
+            block = self.read(chunk_size)
+            if not block:
+                return
+            yield block
+    
+    def _close_current(self):
+        if self.current_file is not None:
+            self.current_file.close()
+            self.current_file = None
+            self.current_number = None
+    
+    def close(self):
+        self._close_current()
+        super().close()
+
+
+def check_complete(session: UploadSession):
+    """Raise UploadError unless every part of the session has been received"""
+    missing = missing_ranges(session)
+    if missing:
+        raise UploadError('Upload is incomplete, missing parts: ' + ', '.join(
+            str(first) if first == last else f'{first}-{last}' for first, last in missing
+        ))
+
+
+def mark_completed(session: UploadSession) -> bool:
+    """
+    Stop a session from receiving parts so a job can take it over
+    
+    The conditional UPDATE only succeeds for one caller, so concurrent
+    completions of the same upload cannot queue it twice.
+    
+    Returns:
+        Whether this call completed the session
+    """
+    completed = UploadSession.objects.filter(
+        id=session.id, status=UploadSession.STATUS_RECEIVING
+    ).update(status=UploadSession.STATUS_COMPLETED)
+    if completed:
+        session.status = UploadSession.STATUS_COMPLETED
+    return bool(completed)
+
+
+def open_upload(session: UploadSession) -> PartsReader:
+    """
+    Open a complete upload for reading
+    
+    Args:
+        session: Upload session whose parts have all been received
+    
+    Returns:
+        PartsReader over the assembled file
+    """
+    check_complete(session)
+    return PartsReader(session)
+
+
+def discard_session(session: UploadSession):
+    """Delete an upload session and its stored parts"""
+    shutil.rmtree(session_dir(session), ignore_errors=True)
+    session.delete()
+
+
+def expire_sessions(now: Optional[datetime] = None) -> int:
+    """
+    Delete upload sessions that have expired, with their stored parts
+    
+    Completed sessions are left to the ingestion jobs reading them.
+    
+    Returns:
+        Number of sessions removed
+    """
+    expired = UploadSession.objects.filter(
+        status=UploadSession.STATUS_RECEIVING, expires_at__lt=now or timezone.now()
+    )
+    removed = 0
+    for session in expired.iterator():
+        discard_session(session)
+        removed += 1
+    return removed
@@ -0,0 +1,200 @@
+import json
+import struct
+import numpy as np
+from typing import Dict, Any, List, Sequence, Tuple
+
+
+# Identifies a columnar equipment record payload, followed by a version byte
+MAGIC = b'EQCOLS'
+VERSION = 1
+
+CONTENT_TYPE = 'application/vnd.equipment-columns'
+
+# Every buffer starts on an 8-byte boundary so float64 arrays can be viewed
+# in place (e.g. with a JavaScript Float64Array) without copying
+ALIGNMENT = 8
+
+# How each equipment record field is laid out in the binary payload
+FIELD_TYPES = {
+    'equipment_name': 'utf8',
+    'equipment_type': 'dictionary',
+    'flowrate': 'float64',
+    'pressure': 'float64',
+    'temperature': 'float64'
+}
+
+
+def rows_to_columns(rows: Sequence[tuple], fields: Sequence[str]) -> Dict[str, list]:
+    """
+    Transpose value rows into one list per field
+    
+    Args:
+        rows: Tuples of values in the order of ``fields``
+        fields: Field names
+    
+    Returns:
+        Dictionary mapping each field to its list of values
+    """
+    if not rows:
+        return {field: [] for field in fields}
+    return {field: list(values) for field, values in zip(fields, zip(*rows))}
+
+
+def _padding(size: int) -> bytes:
+    return b'\0' * (-size % ALIGNMENT)
+
+
+def _encode_column(field: str, values: list) -> Tuple[Dict[str, Any], bytes]:
+    """Encode one column, returning its header entry and buffer"""
+    column_type = FIELD_TYPES[field]
+    entry = {'name': field, 'type': column_type}
+    
+    if column_type == 'float64':
+        buffer = np.asarray(values, dtype='<f8').tobytes()
+    elif column_type == 'dictionary':
+        # Equipment types repeat heavily, so send each distinct value once
+        categories, codes = np.unique(np.asarray(values, dtype=object), return_inverse=True)
+        entry['categories'] = [str(category) for category in categories]
+        buffer = codes.astype('<i4').tobytes()
+    else:
+        # Arrow-style variable width strings: n + 1 offsets, then UTF-8 data
+        encoded = [value.encode('utf-8') for value in values]
+        offsets = np.zeros(len(encoded) + 1, dtype='<i4')
+        np.cumsum([len(value) for value in encoded], out=offsets[1:])
+        buffer = offsets.tobytes() + _padding(offsets.nbytes) + b''.join(encoded)
+    
+    entry['byte_length'] = len(buffer)
+    return entry, buffer
+
+
+def encode_columns(columns: Dict[str, list], metadata: Dict[str, Any] = None) -> bytes:
+    """
+    Encode equipment record columns as a compact binary payload
+    
+    Layout: ``MAGIC``, a version byte, a reserved byte, a little-endian
+    uint32 header length, a JSON header describing the columns (space padded
+    to an 8-byte boundary), then one 8-byte aligned buffer per column in
+    header order:
+    
+    - ``float64``: little-endian IEEE 754 doubles
+    - ``dictionary``: little-endian int32 codes into the header ``categories``
+    - ``utf8``: int32 offsets (row count + 1), padding, then UTF-8 bytes
+    
+    Args:
+        columns: Dictionary mapping field names to lists of values
+        metadata: Extra JSON-serialisable values for the header
+    
+    Returns:
+        Encoded payload
+    """
+    row_count = len(next(iter(columns.values()), []))
+    entries = []
+    buffers = []
+    for field, values in columns.items():
+        entry, buffer = _encode_column(field, values)
+        entries.append(entry)
+        buffers.append(buffer + _padding(len(buffer)))
+    
+    header = dict(metadata or {}, row_count=row_count, columns=entries)
+    header_bytes = json.dumps(header, separators=(',', ':')).encode('utf-8')
+    
+    prefix = MAGIC + bytes([VERSION, 0])
+    header_start = len(prefix) + 4
+    header_bytes += b' ' * (-(header_start + len(header_bytes)) % ALIGNMENT)
+    
+    return b''.join([prefix, struct.pack('<I', len(header_bytes)), header_bytes] + buffers)
+
+
+class ColumnReader:
+    """
+    Read the columns of an encode_columns payload on demand
+    
+    Only the header is parsed up front. A column is decoded when asked for,
+    and only at the requested rows, so a short page of one field neither
+    touches the other buffers nor materialises the strings it skips.
+    """
+    
+    def __init__(self, payload: bytes):
+        view = memoryview(payload)
+        if bytes(view[:len(MAGIC)]) != MAGIC or view[len(MAGIC)] != VERSION:
+            raise ValueError('Not a columnar equipment record payload')
+        
+        header_start = len(MAGIC) + 2
+        (header_length,) = struct.unpack_from('<I', view, header_start)
+        header_start += 4
+        self.header = json.loads(bytes(view[header_start:header_start + header_length]))
+        self.row_count = self.header['row_count']
+        
+        # Buffer offsets follow from the byte lengths in the header
+        self._buffers: Dict[str, Tuple[Dict[str, Any], memoryview]] = {}
+        position = header_start + header_length
+        for entry in self.header['columns']:
+            self._buffers[entry['name']] = (entry, view[position:position + entry['byte_length']])
+            position += entry['byte_length'] + (-entry['byte_length'] % ALIGNMENT)
+    
+    @property
+    def fields(self) -> List[str]:
+        """Names of the encoded columns, in payload order"""
+        return list(self._buffers)
+    
+    def column(self, field: str, rows: Any = None) -> Any:
+        """
+        Decode one column
+        
+        Args:
+            field: Column name
+            rows: None for every row, a slice, or an integer array of row
+                numbers
+        
+        Returns:
+            A numpy array for float64 columns, a list for string columns
+        """
+        entry, buffer = self._buffers[field]
+        
+        if entry['type'] == 'float64':
+            values = np.frombuffer(buffer, dtype='<f8', count=self.row_count)
+            return values if rows is None else values[rows]
+        
+        if entry['type'] == 'dictionary':
+            codes = np.frombuffer(buffer, dtype='<i4', count=self.row_count)
+            if rows is not None:
+                codes = codes[rows]
+            categories = entry['categories']
+            return [categories[code] for code in codes.tolist()]
+        
+        offsets = np.frombuffer(buffer, dtype='<i4', count=self.row_count + 1)
+        data_start = offsets.nbytes + (-offsets.nbytes % ALIGNMENT)
+        if rows is None:
+            data = bytes(buffer[data_start:])
+            bounds = offsets.tolist()
+            return [data[start:end].decode('utf-8') for start, end in zip(bounds[:-1], bounds[1:])]
+        
+        # Slice the offsets first so only the selected strings are decoded
+        data = buffer[data_start:]
+        if isinstance(rows, slice):
+            bounds = offsets[rows.start:(None if rows.stop is None else rows.stop + 1)].tolist()
+            return [str(data[start:end], 'utf-8') for start, end in zip(bounds[:-1], bounds[1:])]
+        rows = np.asarray(rows, dtype=np.int64)
+        return [
+            str(data[start:end], 'utf-8')
+            for start, end in zip(offsets[rows].tolist(), offsets[rows + 1].tolist())
+        ]
+    
+    def value(self, field: str, row: int) -> Any:
+        """Decode a single value of one column"""
+        return self.column(field, np.array([row]))[0]
+
+
+def decode_columns(payload: bytes) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Decode a payload produced by encode_columns
+    
+    Args:
+        payload: Encoded bytes
+    
+    Returns:
+        Tuple of (header, columns) where numeric columns are numpy arrays
+        and string columns are lists
+    """
+    reader = ColumnReader(payload)
+    return reader.header, {field: reader.column(field) for field in reader.fields}
@@ -0,0 +1,508 @@
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections, transaction
+from django.db.models import F
+from django.urls import reverse
+from django.utils import timezone
+from .models import Dataset, ProcessingJob, UploadSession
+from .analytics_engine import AnalyticsEngine
+from . import chunked_upload, report_service, retention
+
+
+logger = logging.getLogger(__name__)
+
+# Lazily created pool of threads draining the job table
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+# Latest progress of jobs running in this process, fresher than the
+# throttled progress stored on their rows
+_live_progress: Dict[str, Dict[str, float]] = {}
+_progress_lock = threading.Lock()
+
+
+def job_spool_dir() -> str:
+    """Directory where uploaded files wait for a worker"""
+    return os.path.join(settings.MEDIA_ROOT, 'jobs')
+
+
+def lease_path(job: ProcessingJob) -> str:
+    """
+    File whose modification time renews the lease of a running job when
+    the database cannot, see ProgressRecorder
+    """
+    return os.path.join(job_spool_dir(), f'{job.id}.lease')
+
+
+def enqueue_upload(user: User, uploaded_file) -> ProcessingJob:
+    """
+    Spool an uploaded CSV file to disk and queue it for background processing
+    
+    Args:
+        user: User who uploaded the file
+        uploaded_file: Django UploadedFile from the request
+        
+    Returns:
+        The queued ProcessingJob
+    """
+    job = ProcessingJob(user=user, filename=uploaded_file.name)
+    
+    spool_dir = job_spool_dir()
+    os.makedirs(spool_dir, exist_ok=True)
+    job.file_path = os.path.join(spool_dir, f'{job.id}.csv')
+    
+    with open(job.file_path, 'wb') as spool_file:
+        for chunk in uploaded_file.chunks():
+            spool_file.write(chunk)
+    
+    job.save()
+    
+    # Only wake the workers once the job row is visible to their connections
+    transaction.on_commit(wake_workers)
+    return job
+
+
+def enqueue_upload_session(user: User, session: UploadSession) -> ProcessingJob:
+    """
+    Queue a completed chunked upload for background processing
+    
+    The worker streams the stored parts through PartsReader, so the file is
+    neither copied nor assembled on the request path.
+    
+    Args:
+        user: User who owns the resulting dataset
+        session: Upload session marked completed with
+            chunked_upload.mark_completed
+        
+    Returns:
+        The queued ProcessingJob
+    """
+    job = ProcessingJob.objects.create(user=user, filename=session.filename, upload=session)
+    transaction.on_commit(wake_workers)
+    return job
+
+
+def report_filename(dataset: Dataset, full_listing: bool = False) -> str:
+    """Download file name of a dataset's PDF report"""
+    suffix = '_full' if full_listing else ''
+    return f'equipment_report_{dataset.filename}_{dataset.id}{suffix}.pdf'
+
+
+def enqueue_report(user: User, dataset: Dataset, full_listing: bool = False) -> ProcessingJob:
+    """
+    Queue rendering of a dataset's PDF report in the report process pool
+    
+    Args:
+        user: User requesting the report
+        dataset: Dataset to render the report of
+        full_listing: Render the detailed report listing every record
+        
+    Returns:
+        The queued ProcessingJob
+    """
+    job = ProcessingJob.objects.create(
+        user=user,
+        kind=ProcessingJob.KIND_REPORT,
+        filename=report_filename(dataset, full_listing),
+        dataset=dataset,
+        full_listing=full_listing
+    )
+    
+    # Pool processes read the job row through their own connections
+    transaction.on_commit(lambda: report_service.submit_report_job(job.id))
+    return job
+
+
+def wake_workers():
+    """Ask the worker pool to drain any queued jobs"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.JOB_WORKERS,
+                thread_name_prefix='processing-job'
+            )
+    _executor.submit(drain_queue)
+
+
+def drain_queue() -> int:
+    """
+    Re-queue abandoned jobs, then claim and run queued jobs until none are left
+    
+    Returns:
+        Number of jobs run
+    """
+    jobs_run = 0
+    try:
+        recover_stale_jobs()
+        while True:
+            job = claim_next_job()
+            if job is None:
+                return jobs_run
+            run_job(job)
+            jobs_run += 1
+    finally:
+        # Worker threads hold their own connections; release them when idle
+        connections.close_all()
+
+
+def claim_next_job() -> Optional[ProcessingJob]:
+    """
+    Atomically move the oldest queued job to running
+    
+    The conditional UPDATE only succeeds for one claimer, so several
+    threads or processes can drain the same table safely.
+    
+    Returns:
+        The claimed job, or None when the queue is empty
+    """
+    while True:
+        job_id = (
+            ProcessingJob.objects.filter(status=ProcessingJob.STATUS_QUEUED)
+            .order_by('created_at')
+            .values_list('id', flat=True)
+            .first()
+        )
+        if job_id is None:
+            return None
+        
+        job = claim_job(job_id)
+        if job is not None:
+            return job
+
+
+def claim_job(job_id) -> Optional[ProcessingJob]:
+    """
+    Atomically move one queued job to running
+    
+    Returns:
+        The claimed job, or None if another worker claimed it first
+    """
+    now = timezone.now()
+    claimed = ProcessingJob.objects.filter(
+        id=job_id, status=ProcessingJob.STATUS_QUEUED
+    ).update(
+        status=ProcessingJob.STATUS_RUNNING,
+        started_at=now,
+        heartbeat_at=now,
+        attempts=F('attempts') + 1
+    )
+    if not claimed:
+        return None
+    return ProcessingJob.objects.select_related('user', 'dataset', 'upload').get(id=job_id)
+
+
+def recover_stale_jobs(now: Optional[datetime] = None) -> int:
+    """
+    Re-queue running jobs whose worker stopped sending heartbeats
+    
+    Their worker crashed or the server restarted mid-job; the ingestion
+    transaction of a dead worker was rolled back with its connection. A job
+    whose lease file was touched within the timeout is still running. Jobs
+    claimed JOB_MAX_ATTEMPTS times, or whose input is gone, are failed
+    instead and their input removed.
+    
+    Returns:
+        Number of jobs re-queued or failed
+    """
+    now = now or timezone.now()
+    cutoff = now - timedelta(seconds=settings.JOB_LEASE_TIMEOUT)
+    stale = ProcessingJob.objects.filter(
+        status=ProcessingJob.STATUS_RUNNING, heartbeat_at__lt=cutoff
+    ).select_related('upload')
+    
+    recovered = 0
+    for job in stale.iterator():
+        if _lease_renewed(job, cutoff):
+            continue
+        
+        # Only the first process to notice the stale job acts on it
+        lease = ProcessingJob.objects.filter(
+            id=job.id, status=ProcessingJob.STATUS_RUNNING, heartbeat_at=job.heartbeat_at
+        )
+        has_input = job.kind == ProcessingJob.KIND_REPORT or _has_input(job)
+        
+        if has_input and job.attempts < settings.JOB_MAX_ATTEMPTS:
+            recovered += lease.update(
+                status=ProcessingJob.STATUS_QUEUED,
+                started_at=None,
+                heartbeat_at=None,
+                progress=0.0,
+                rows_processed=0
+            )
+            continue
+        
+        if lease.update(
+            status=ProcessingJob.STATUS_FAILED,
+            error='The worker running this job stopped before it finished',
+            finished_at=now
+        ):
+            recovered += 1
+            _discard_input(job)
+    
+    if recovered:
+        logger.warning('Recovered %d abandoned processing job(s)', recovered)
+    return recovered
+
+
+def _lease_renewed(job: ProcessingJob, cutoff: datetime) -> bool:
+    """Whether a job's lease file was touched after ``cutoff``"""
+    try:
+        return os.path.getmtime(lease_path(job)) >= cutoff.timestamp()
+    except OSError:
+        return False
+
+
+def _has_input(job: ProcessingJob) -> bool:
+    """Whether the uploaded file of an ingestion job still exists"""
+    if job.file_path:
+        return os.path.exists(job.file_path)
+    return job.upload is not None
+
+
+def _open_input(job: ProcessingJob):
+    """Open the uploaded file of an ingestion job, returning it and its size"""
+    if job.file_path:
+        return open(job.file_path, 'rb'), os.path.getsize(job.file_path)
+    if job.upload is None:
+        raise ValueError('The uploaded file no longer exists')
+    return chunked_upload.open_upload(job.upload), job.upload.total_size
+
+
+def _discard_input(job: ProcessingJob):
+    """Remove the spooled file or upload session of an ingestion job"""
+    if job.file_path:
+        try:
+            os.remove(job.file_path)
+        except OSError:
+            pass
+    elif job.upload is not None:
+        chunked_upload.discard_session(job.upload)
+
+
+class ProgressRecorder:
+    """
+    Record the progress of a running ingestion job
+    
+    Ingestion runs inside one transaction, so progress saved through the
+    job's own connection would stay invisible to other server processes
+    until the job commits. It is written instead, at most every
+    JOB_PROGRESS_INTERVAL seconds, through a separate autocommit
+    connection, which also renews the job's lease. SQLite allows a single
+    writer, held by the ingestion, so there progress is only kept in memory
+    for the status requests of this process, and the lease is renewed by
+    touching the job's lease file, which every process on the host sees.
+    """
+    
+    def __init__(self, job: ProcessingJob):
+        self.job = job
+        self.key = str(job.id)
+        self.last_write = time.monotonic()
+        self.connection = None
+        self.lease_path = None
+        if connections[DEFAULT_DB_ALIAS].vendor != 'sqlite':
+            self.connection = connections.create_connection(DEFAULT_DB_ALIAS)
+        else:
+            self.lease_path = lease_path(job)
+            os.makedirs(os.path.dirname(self.lease_path), exist_ok=True)
+            open(self.lease_path, 'a').close()
+    
+    def update(self, progress: float, rows_processed: int):
+        with _progress_lock:
+            _live_progress[self.key] = {'progress': progress, 'rows_processed': rows_processed}
+        
+        now = time.monotonic()
+        if now - self.last_write < settings.JOB_PROGRESS_INTERVAL:
+            return
+        self.last_write = now
+        
+        if self.connection is None:
+            try:
+                os.utime(self.lease_path)
+            except OSError:
+                logger.warning('Could not renew the lease of job %s', self.key, exc_info=True)
+            return
+        
+        opts = ProcessingJob._meta
+        quote = self.connection.ops.quote_name
+        columns = [opts.get_field(name).column for name in ('progress', 'rows_processed', 'heartbeat_at', 'id')]
+        params = [
+            progress,
+            rows_processed,
+            opts.get_field('heartbeat_at').get_db_prep_value(timezone.now(), self.connection),
+            opts.get_field('id').get_db_prep_value(self.job.id, self.connection)
+        ]
+        try:
+            with self.connection.cursor() as cursor:
+                cursor.execute(
+                    f'UPDATE {quote(opts.db_table)} SET {quote(columns[0])} = %s, '
+                    f'{quote(columns[1])} = %s, {quote(columns[2])} = %s WHERE {quote(columns[3])} = %s',
+                    params
+                )
+        except DatabaseError:
+            # Progress is informational; the job itself carries on
+            logger.warning('Could not record progress of job %s', self.key, exc_info=True)
+    
+    def close(self):
+        with _progress_lock:
+            _live_progress.pop(self.key, None)
+        if self.connection is not None:
+            self.connection.close()
+        if self.lease_path is not None:
+            try:
+                os.remove(self.lease_path)
+            except OSError:
+                pass
+
+
+def run_job(job: ProcessingJob):
+    """
+    Run a claimed job and record the outcome
+    
+    Args:
+        job: Job in the running state
+    """
+    if job.kind == ProcessingJob.KIND_REPORT:
+        run_report_job(job)
+    else:
+        run_ingest_job(job)
+
+
+def run_ingest_job(job: ProcessingJob):
+    """
+    Process the spooled CSV file or chunked upload of a claimed ingestion job
+    
+    Args:
+        job: Job in the running state
+    """
+    recorder = ProgressRecorder(job)
+    
+    try:
+        source, file_size = _open_input(job)
+        file_size = file_size or 1
+        
+        with source:
+            def report_progress(rows_read):
+                # The parser reads ahead in buffers, so the file position is
+                # a close estimate of how much of the input has been handled
+                recorder.update(min(99.0, source.tell() * 100.0 / file_size), rows_read)
+            
+            dataset, summary = AnalyticsEngine.process_csv(
+                source, job.user, job.filename, progress_callback=report_progress
+            )
+        
+        ProcessingJob.objects.filter(id=job.id).update(
+            status=ProcessingJob.STATUS_SUCCEEDED,
+            progress=100.0,
+            rows_processed=summary['total_count'],
+            dataset=dataset,
+            finished_at=timezone.now()
+        )
+        
+        # Old datasets are removed by the retention sweeper
+        retention.request_sweep(job.user_id)
+        
+        # Render the report ahead of the first download in the report pool,
+        # without holding up clients waiting for this job
+        try:
+            enqueue_report(job.user, dataset)
+        except Exception:
+            logger.warning('Could not queue the report of dataset %s', dataset.id, exc_info=True)
+    except Exception as e:
+        ProcessingJob.objects.filter(id=job.id).update(
+            status=ProcessingJob.STATUS_FAILED,
+            error=str(e),
+            finished_at=timezone.now()
+        )
+    finally:
+        recorder.close()
+        _discard_input(job)
+
+
+def run_report_job(job: ProcessingJob):
+    """
+    Render the PDF report of a claimed report job
+    
+    Args:
+        job: Job in the running state
+    """
+    try:
+        if job.dataset is None:
+            raise ValueError('Dataset no longer exists')
+        
+        report_service.get_report(job.dataset, job.full_listing)
+        
+        ProcessingJob.objects.filter(id=job.id).update(
+            status=ProcessingJob.STATUS_SUCCEEDED,
+            progress=100.0,
+            finished_at=timezone.now()
+        )
+    except Exception as e:
+        ProcessingJob.objects.filter(id=job.id).update(
+            status=ProcessingJob.STATUS_FAILED,
+            error=str(e),
+            finished_at=timezone.now()
+        )
+
+
+def job_status(job: ProcessingJob) -> Dict:
+    """
+    Describe a job for the status endpoint
+    
+    Args:
+        job: Job to describe
+    
+    Returns:
+        Dictionary with state, progress and result of the job
+    """
+    progress = job.progress
+    rows_processed = job.rows_processed
+    
+    if job.status == ProcessingJob.STATUS_RUNNING:
+        with _progress_lock:
+            live = _live_progress.get(str(job.id))
+        if live:
+            progress = live['progress']
+            rows_processed = live['rows_processed']
+    
+    result = {
+        'job_id': str(job.id),
+        'kind': job.kind,
+        'status': job.status,
+        'filename': job.filename,
+        'progress': round(progress, 1),
+        'rows_processed': rows_processed,
+        'dataset_id': job.dataset_id,
+        'error': job.error or None,
+        'created_at': job.created_at.isoformat(),
+        'started_at': job.started_at.isoformat() if job.started_at else None,
+        'finished_at': job.finished_at.isoformat() if job.finished_at else None
+    }
+    
+    # Finished ingestion jobs carry what a synchronous upload used to return
+    if (job.kind == ProcessingJob.KIND_INGEST and job.status == ProcessingJob.STATUS_SUCCEEDED
+            and job.dataset is not None):
+        result['record_count'] = job.dataset.record_count
+        result['summary'] = {
+            'total_count': job.dataset.record_count,
+            'averages': {
+                'flowrate': job.dataset.avg_flowrate,
+                'pressure': job.dataset.avg_pressure,
+                'temperature': job.dataset.avg_temperature
+            },
+            'type_distribution': job.dataset.type_distribution
+        }
+    
+    if job.kind == ProcessingJob.KIND_REPORT and job.status == ProcessingJob.STATUS_SUCCEEDED:
+        result['report_url'] = reverse('download_report', args=[job.dataset_id])
+        if job.full_listing:
+            result['report_url'] += '?listing=full'
+    
+    return result
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+from analytics.chunked_upload import expire_sessions
+from analytics.jobs import drain_queue
+
+
+class Command(BaseCommand):
+    help = 'Run queued background processing jobs until the queue is empty, then remove expired uploads'
+    
+    def handle(self, *args, **options):
+        jobs_run = drain_queue()
+        expired = expire_sessions()
+        self.stdout.write(self.style.SUCCESS(f'Processed {jobs_run} job(s), removed {expired} expired upload(s)'))
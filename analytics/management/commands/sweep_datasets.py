@@ -0,0 +1,22 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from analytics import retention
+
+
+class Command(BaseCommand):
+    help = 'Delete datasets outside the retention rules (RETENTION_* settings and per-user policies)'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--user', help='Only sweep the datasets of this username')
+        parser.add_argument('--batch-size', type=int, help='Datasets deleted per transaction')
+    
+    def handle(self, *args, **options):
+        user_ids = None
+        if options['user']:
+            try:
+                user_ids = [User.objects.get(username=options['user']).id]
+            except User.DoesNotExist:
+                raise CommandError(f"User {options['user']} not found")
+        
+        removed = retention.sweep(user_ids, batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Removed {removed} dataset(s)'))
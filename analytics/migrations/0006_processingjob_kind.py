@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0005_dataset_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='processingjob',
+            name='kind',
+            field=models.CharField(choices=[('ingest', 'CSV ingestion'), ('report', 'PDF report rendering')], default='ingest', max_length=20),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0006_processingjob_kind'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='processingjob',
+            name='full_listing',
+            field=models.BooleanField(default=False),
+        ),
+    ]
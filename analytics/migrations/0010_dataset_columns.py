@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:34
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0009_retentionpolicy'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DatasetColumns',
+            fields=[
+                ('dataset', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='columns', serialize=False, to='analytics.dataset')),
+                ('payload', models.BinaryField()),
+            ],
+        ),
+        migrations.AddField(
+            model_name='dataset',
+            name='storage',
+            field=models.CharField(choices=[('rows', 'One EquipmentRecord row per record'), ('columnar', 'Packed columns in DatasetColumns')], default='rows', max_length=20),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:47
+
+import analytics.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0010_dataset_columns'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='uploadsession',
+            name='expires_at',
+            field=models.DateTimeField(default=analytics.models.upload_expiry),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0011_uploadsession_expires_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='processingjob',
+            name='attempts',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='processingjob',
+            name='heartbeat_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:56
+
+import django.db.models.deletion
+import numpy as np
+from django.db import migrations, models
+
+
+def split_dataset_columns(apps, schema_editor):
+    """Turn each DatasetColumns blob into the first segment of its dataset"""
+    from analytics.columnar import ColumnReader
+    
+    DatasetColumns = apps.get_model('analytics', 'DatasetColumns')
+    ColumnSegment = apps.get_model('analytics', 'ColumnSegment')
+    for dataset_id, payload in DatasetColumns.objects.values_list('dataset_id', 'payload').iterator():
+        reader = ColumnReader(payload)
+        if not reader.row_count:
+            continue
+        names = np.array(reader.column('equipment_name'), dtype=str)
+        ColumnSegment.objects.create(
+            dataset_id=dataset_id,
+            first_row=0,
+            row_count=reader.row_count,
+            payload=bytes(payload),
+            name_order=np.argsort(names, kind='stable').astype('<i4').tobytes()
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0013_record_dataset_name_id_index'),
+    ]
+    
+    operations = [
+        migrations.AlterField(
+            model_name='dataset',
+            name='storage',
+            field=models.CharField(choices=[('rows', 'One EquipmentRecord row per record'), ('columnar', 'Packed column segments in ColumnSegment')], default='rows', max_length=20),
+        ),
+        migrations.CreateModel(
+            name='ColumnSegment',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('first_row', models.BigIntegerField()),
+                ('row_count', models.IntegerField()),
+                ('payload', models.BinaryField()),
+                ('name_order', models.BinaryField()),
+                ('dataset', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='column_segments', to='analytics.dataset')),
+            ],
+        ),
+        migrations.RunPython(split_dataset_columns, migrations.RunPython.noop),
+        migrations.DeleteModel(
+            name='DatasetColumns',
+        ),
+        migrations.AddConstraint(
+            model_name='columnsegment',
+            constraint=models.UniqueConstraint(fields=('dataset', 'first_row'), name='column_segment_dataset_row_uniq'),
+        ),
+    ]
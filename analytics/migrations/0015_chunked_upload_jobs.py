@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-17 07:06
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0014_column_segments'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='processingjob',
+            name='upload',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='jobs', to='analytics.uploadsession'),
+        ),
+        migrations.AddField(
+            model_name='uploadsession',
+            name='status',
+            field=models.CharField(choices=[('receiving', 'Receiving parts'), ('completed', 'Completed, owned by its ingestion job')], default='receiving', max_length=20),
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-17 09:12
+
+from django.db import migrations, models
+
+
+def fill_name_ranges(apps, schema_editor):
+    """Record the smallest and largest equipment name of existing segments"""
+    import numpy as np
+    from analytics.columnar import ColumnReader
+    
+    ColumnSegment = apps.get_model('analytics', 'ColumnSegment')
+    for segment in ColumnSegment.objects.iterator():
+        reader = ColumnReader(segment.payload)
+        order = np.frombuffer(segment.name_order, dtype='<i4')
+        segment.first_name = reader.value('equipment_name', int(order[0]))
+        segment.last_name = reader.value('equipment_name', int(order[-1]))
+        segment.save(update_fields=['first_name', 'last_name'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0015_chunked_upload_jobs'),
+    ]
+    
+    operations = [
+        migrations.AddField(
+            model_name='columnsegment',
+            name='first_name',
+            field=models.CharField(default='', max_length=255),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='columnsegment',
+            name='last_name',
+            field=models.CharField(default='', max_length=255),
+            preserve_default=False,
+        ),
+        migrations.RunPython(fill_name_ranges, migrations.RunPython.noop),
+    ]
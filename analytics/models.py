@@ -1,3 +1,6 @@
+import uuid
+from datetime import timedelta
+from django.conf import settings
 from django.db import models
 from django.contrib.auth.models import User
 from django.utils import timezone
@@ -5,6 +8,13 @@ from django.utils import timezone
 
 class Dataset(models.Model):
     """Model for storing dataset metadata and summary statistics"""
+    STORAGE_ROWS = 'rows'
+    STORAGE_COLUMNAR = 'columnar'
+    STORAGE_CHOICES = [
+        (STORAGE_ROWS, 'One EquipmentRecord row per record'),
+        (STORAGE_COLUMNAR, 'Packed column segments in ColumnSegment'),
+    ]
+    
     filename = models.CharField(max_length=255)
     upload_timestamp = models.DateTimeField(auto_now_add=True)
     record_count = models.IntegerField()
@@ -18,8 +28,23 @@ class Dataset(models.Model):
     # Equipment type distribution (JSON field)
     type_distribution = models.JSONField()
     
+    # Serialized SummaryAccumulator state, used to update the summary
+    # incrementally without re-reading equipment records
+    summary_state = models.JSONField(null=True, blank=True)
+    
+    # Incremented whenever rows are appended, so cached responses for an
+    # earlier state of the dataset are never served
+    version = models.PositiveIntegerField(default=1)
+    
+    # Where the equipment records live, see analytics/record_storage.py
+    storage = models.CharField(max_length=20, choices=STORAGE_CHOICES, default=STORAGE_ROWS)
+    
     class Meta:
         ordering = ['-upload_timestamp']
+        indexes = [
+            # Dataset list and history: one user's datasets, newest first
+            models.Index(fields=['user', '-upload_timestamp'], name='dataset_user_recent_idx'),
+        ]
     
     def __str__(self):
         return f"{self.filename} - {self.upload_timestamp.strftime('%Y-%m-%d %H:%M')}"
@@ -36,6 +61,186 @@ class EquipmentRecord(models.Model):
     
     class Meta:
         ordering = ['equipment_name']
+        indexes = [
+            # Record listings and keyset pages of one dataset in the default
+            # ordering, with id breaking ties between equal names
+            models.Index(fields=['dataset', 'equipment_name', 'id'], name='record_dataset_name_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.equipment_name} ({self.equipment_type})"
+
+
+class ColumnSegment(models.Model):
+    """
+    One batch of a columnar dataset's equipment records, encoded with analytics.columnar
+    
+    Every ingested chunk and every appended file adds a segment, so records
+    already stored are never rewritten. Numeric fields are packed float64
+    arrays and equipment types are dictionary encoded.
+    """
+    dataset = models.ForeignKey(Dataset, on_delete=models.CASCADE, related_name='column_segments')
+    # Insertion position of the segment's first record, counted from 0
+    first_row = models.BigIntegerField()
+    row_count = models.IntegerField()
+    payload = models.BinaryField()
+    # Little-endian int32 row numbers of the segment in equipment name
+    # order, ties in insertion order, so name-ordered pages can binary search
+    name_order = models.BinaryField()
+    # Smallest and largest equipment names of the segment, so name-ordered
+    # pages pick the segments they overlap without fetching any payload
+    first_name = models.CharField(max_length=255)
+    last_name = models.CharField(max_length=255)
+    
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['dataset', 'first_row'], name='column_segment_dataset_row_uniq'),
+        ]
+    
+    def __str__(self):
+        return f"Records {self.first_row}-{self.first_row + self.row_count - 1} of dataset {self.dataset_id}"
+
+
+class RetentionPolicy(models.Model):
+    """
+    Per-user dataset retention rules, replacing the global RETENTION_* settings
+    
+    A rule left empty does not apply to the user. The newest dataset is
+    always kept.
+    """
+    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='retention_policy')
+    
+    # Keep at most this many datasets, newest first
+    max_datasets = models.PositiveIntegerField(null=True, blank=True)
+    # Remove datasets uploaded more than this many days ago
+    max_age_days = models.PositiveIntegerField(null=True, blank=True)
+    # Keep the newest datasets while their equipment records add up to at most this many rows
+    max_rows = models.PositiveBigIntegerField(null=True, blank=True)
+    
+    class Meta:
+        verbose_name_plural = 'retention policies'
+    
+    def __str__(self):
+        return f"Retention policy of {self.user.username}"
+
+
+class ProcessingJob(models.Model):
+    """Background job queued in the database and run by the in-process worker pool"""
+    STATUS_QUEUED = 'queued'
+    STATUS_RUNNING = 'running'
+    STATUS_SUCCEEDED = 'succeeded'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_QUEUED, 'Queued'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_SUCCEEDED, 'Succeeded'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+    
+    KIND_INGEST = 'ingest'
+    KIND_REPORT = 'report'
+    KIND_CHOICES = [
+        (KIND_INGEST, 'CSV ingestion'),
+        (KIND_REPORT, 'PDF report rendering'),
+    ]
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES, default=KIND_INGEST)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_QUEUED)
+    
+    # Uploaded file, spooled to disk until a worker picks the job up
+    filename = models.CharField(max_length=255)
+    file_path = models.CharField(max_length=500, blank=True)
+    # Completed chunked upload whose parts the job reads in place of a
+    # spooled file
+    upload = models.ForeignKey(
+        'UploadSession', on_delete=models.SET_NULL, null=True, blank=True, related_name='jobs'
+    )
+    
+    # Progress as a percentage of the input file read
+    progress = models.FloatField(default=0.0)
+    rows_processed = models.IntegerField(default=0)
+    
+    # Times the job was claimed, and the last sign of life of its worker;
+    # running jobs without one for JOB_LEASE_TIMEOUT seconds are re-queued
+    attempts = models.PositiveIntegerField(default=0)
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    
+    # Dataset created by an ingestion job, or rendered by a report job
+    dataset = models.ForeignKey(Dataset, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    
+    # Report jobs: list every equipment record instead of a sample
+    full_listing = models.BooleanField(default=False)
+    error = models.TextField(blank=True)
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        ordering = ['created_at']
+    
+    def __str__(self):
+        return f"{self.filename} ({self.status})"
+
+
+def upload_expiry():
+    """Expiry time of an upload session active now"""
+    return timezone.now() + timedelta(seconds=settings.CHUNKED_UPLOAD_EXPIRY)
+
+
+class UploadSession(models.Model):
+    """Resumable upload of a large CSV file sent in fixed-size parts"""
+    STATUS_RECEIVING = 'receiving'
+    STATUS_COMPLETED = 'completed'
+    STATUS_CHOICES = [
+        (STATUS_RECEIVING, 'Receiving parts'),
+        (STATUS_COMPLETED, 'Completed, owned by its ingestion job'),
+    ]
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    filename = models.CharField(max_length=255)
+    total_size = models.BigIntegerField()
+    part_size = models.IntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    # Pushed back whenever a part arrives; abandoned sessions are removed
+    # with their parts once it has passed
+    expires_at = models.DateTimeField(default=upload_expiry)
+    
+    # Completed sessions accept no more parts and do not expire; the
+    # ingestion job reading them removes them when it ends
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_RECEIVING)
+    
+    class Meta:
+        ordering = ['-created_at']
+    
+    @property
+    def total_parts(self):
+        return max(1, -(-self.total_size // self.part_size))
+    
+    def expected_part_size(self, number):
+        """Size in bytes of the given 1-based part number"""
+        if number < self.total_parts:
+            return self.part_size
+        return self.total_size - self.part_size * (self.total_parts - 1)
+    
+    def __str__(self):
+        return f"{self.filename} ({self.total_size} bytes)"
+
+
+class UploadPart(models.Model):
+    """One received part of an upload session, stored on disk"""
+    session = models.ForeignKey(UploadSession, on_delete=models.CASCADE, related_name='parts')
+    number = models.IntegerField()
+    size = models.IntegerField()
+    checksum = models.CharField(max_length=64)  # SHA-256 hex digest
+    
+    class Meta:
+        ordering = ['number']
+        unique_together = ['session', 'number']
     
     def __str__(self):
-        return f"{self.equipment_name} ({self.equipment_type})"
\ No newline at end of file
+        return f"{self.session_id} part {self.number}"
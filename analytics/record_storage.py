@@ -0,0 +1,296 @@
+import numpy as np
+from itertools import chain
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+from django.db.models import Sum
+from . import columnar
+from .models import ColumnSegment, Dataset, EquipmentRecord
+
+
+# Record fields in the order columnar datasets store them
+STORED_FIELDS = tuple(columnar.FIELD_TYPES)
+
+# Storage modes a dataset can be created with
+STORAGE_MODES = tuple(mode for mode, _ in Dataset.STORAGE_CHOICES)
+
+# Readers below work with either storage mode. Row datasets are read from
+# EquipmentRecord with a query per page or cursor; columnar datasets read
+# their ColumnSegment metadata first, fetch the payloads of the segments a
+# request overlaps and decode only the fields and records asked for.
+
+# A segment's metadata, read without its payload: id, insertion position of
+# its first record, record count, and smallest and largest equipment names
+SegmentInfo = Tuple[int, int, int, str, str]
+
+# A loaded segment: insertion position of its first record, a reader over
+# its payload, and its row numbers in equipment name order
+Segment = Tuple[int, columnar.ColumnReader, np.ndarray]
+
+
+def is_columnar(dataset: Dataset) -> bool:
+    """Whether a dataset keeps its records in ColumnSegment rows"""
+    return dataset.storage == Dataset.STORAGE_COLUMNAR
+
+
+def _segment_infos(dataset: Dataset) -> List[SegmentInfo]:
+    """Metadata of a columnar dataset's segments in insertion order"""
+    return list(
+        ColumnSegment.objects.filter(dataset_id=dataset.id)
+        .order_by('first_row')
+        .values_list('id', 'first_row', 'row_count', 'first_name', 'last_name')
+    )
+
+
+def _load_segments(segment_ids: Sequence[int]) -> Dict[int, Segment]:
+    """Fetch and open the payloads of the given segments, by segment id"""
+    rows = (
+        ColumnSegment.objects.filter(id__in=segment_ids)
+        .values_list('id', 'first_row', 'payload', 'name_order')
+    )
+    return {
+        segment_id: (first_row, columnar.ColumnReader(payload), np.frombuffer(name_order, dtype='<i4'))
+        for segment_id, first_row, payload, name_order in rows
+    }
+
+
+def write_segment(dataset: Dataset, columns: Dict[str, Any]):
+    """
+    Store records as a new segment of a columnar dataset
+    
+    Existing segments are left untouched, so appending costs time
+    proportional to the new records only.
+    
+    Args:
+        dataset: Columnar dataset
+        columns: Dictionary mapping every field of STORED_FIELDS to the
+            values of the new records
+    """
+    row_count = len(columns['equipment_name'])
+    if not row_count:
+        return
+    
+    first_row = (
+        ColumnSegment.objects.filter(dataset_id=dataset.id)
+        .aggregate(total=Sum('row_count'))['total'] or 0
+    )
+    names = columns['equipment_name']
+    name_order = np.argsort(np.array(names, dtype=str), kind='stable')
+    ColumnSegment.objects.create(
+        dataset_id=dataset.id,
+        first_row=first_row,
+        row_count=row_count,
+        payload=columnar.encode_columns({field: columns[field] for field in STORED_FIELDS}),
+        name_order=name_order.astype('<i4').tobytes(),
+        first_name=names[name_order[0]],
+        last_name=names[name_order[-1]]
+    )
+
+
+def load_columns(dataset: Dataset, fields: Sequence[str] = STORED_FIELDS) -> Dict[str, Any]:
+    """
+    Load whole columns of a columnar dataset in one query
+    
+    Args:
+        dataset: Columnar dataset
+        fields: Fields to return; the others are not decoded
+    
+    Returns:
+        Dictionary mapping each field to its values in insertion order:
+        numpy arrays for numeric fields, lists for string fields
+    """
+    infos = _segment_infos(dataset)
+    loaded = _load_segments([info[0] for info in infos])
+    segments = [loaded[info[0]] for info in infos]
+    columns = {}
+    for field in fields:
+        parts = [reader.column(field) for _, reader, _ in segments]
+        if columnar.FIELD_TYPES[field] == 'float64':
+            columns[field] = np.concatenate(parts) if parts else np.empty(0)
+        else:
+            columns[field] = list(chain.from_iterable(parts))
+    return columns
+
+
+def _as_list(values: Any) -> list:
+    """Decoded column values as a list of Python values"""
+    return values.tolist() if isinstance(values, np.ndarray) else values
+
+
+def _start_after(segment: Segment, after: Tuple[str, int]) -> int:
+    """Index into a segment's name order of its first record after ``after``"""
+    first_row, reader, order = segment
+    low, high = 0, len(order)
+    # Decodes one name per step instead of the whole name column
+    while low < high:
+        middle = (low + high) // 2
+        row = int(order[middle])
+        if (reader.value('equipment_name', row), first_row + row + 1) <= after:
+            low = middle + 1
+        else:
+            high = middle
+    return low
+
+
+def _segment_page(infos: List[SegmentInfo], loaded: Dict[int, Segment], fields: Sequence[str],
+                  limit: Optional[int], after: Optional[Tuple[str, int]]
+                  ) -> Tuple[Dict[str, list], Optional[Tuple[str, int]]]:
+    """
+    column_page over the given segments
+    
+    Payloads are fetched into ``loaded`` only for the segments the page
+    window overlaps, so callers walking several pages can share it.
+    """
+    # A segment whose largest possible key is not past the cursor is done
+    if after is not None:
+        infos = [info for info in infos if (info[4], info[1] + info[2]) > after]
+    # Visit segments by their smallest possible key: once the page is full,
+    # a segment starting past its last candidate, and every one after it,
+    # cannot contribute and is never fetched
+    infos = sorted(infos, key=lambda info: (info[3], info[1] + 1))
+    
+    names: List[str] = []
+    positions = np.empty(0, dtype=np.int64)
+    sources = np.empty(0, dtype=np.int64)
+    for segment_id, first_row, _, first_name, _ in infos:
+        if limit is not None and len(names) > limit:
+            if (first_name, first_row + 1) > (names[-1], int(positions[-1])):
+                break
+        if segment_id not in loaded:
+            loaded.update(_load_segments([segment_id]))
+        segment = loaded[segment_id]
+        _, reader, order = segment
+        start = _start_after(segment, after) if after is not None else 0
+        # One record beyond the limit tells whether another page follows
+        rows = order[start:] if limit is None else order[start:start + limit + 1]
+        names.extend(reader.column('equipment_name', rows))
+        positions = np.concatenate([positions, first_row + rows.astype(np.int64) + 1])
+        sources = np.concatenate([sources, np.full(len(rows), segment_id)])
+        
+        # Keep the candidates merged by (name, position), and no more than
+        # the page needs
+        merged = np.lexsort((positions, np.array(names, dtype=str)))
+        if limit is not None:
+            merged = merged[:limit + 1]
+        names = [names[index] for index in merged.tolist()]
+        positions = positions[merged]
+        sources = sources[merged]
+    
+    if not names:
+        return {field: [] for field in fields}, None
+    
+    has_more = limit is not None and len(names) > limit
+    if limit is not None:
+        names = names[:limit]
+        positions = positions[:limit]
+        sources = sources[:limit]
+    
+    page = {}
+    for field in fields:
+        values: List[Any] = [None] * len(names)
+        for segment_id in np.unique(sources).tolist():
+            first_row, reader, _ = loaded[segment_id]
+            slots = np.flatnonzero(sources == segment_id)
+            rows = positions[slots] - first_row - 1
+            for slot, value in zip(slots.tolist(), _as_list(reader.column(field, rows))):
+                values[slot] = value
+        page[field] = values
+    
+    next_position = (names[-1], int(positions[-1])) if has_more else None
+    return page, next_position
+
+
+def column_page(dataset: Dataset, fields: Sequence[str], limit: Optional[int] = None,
+                after: Optional[Tuple[str, int]] = None) -> Tuple[Dict[str, list], Optional[Tuple[str, int]]]:
+    """
+    One page of a columnar dataset's records, as one list per field
+    
+    Records are ordered by equipment name, then by their 1-based insertion
+    position, which stands in for the record id of row datasets. Segments
+    outside the page window, judged by their stored name range, are not
+    fetched; the others are binary searched for the cursor and only the
+    page's records of the requested fields are decoded.
+    
+    Args:
+        dataset: Columnar dataset
+        fields: Fields to return
+        limit: Maximum number of records, or None for all
+        after: ``(equipment_name, position)`` of the last record of the
+            previous page
+    
+    Returns:
+        Tuple of (columns, ``(equipment_name, position)`` of the page's last
+        record when another page follows, else None)
+    """
+    return _segment_page(_segment_infos(dataset), {}, fields, limit, after)
+
+
+def iter_record_batches(dataset: Dataset, fields: Sequence[str], batch_size: int,
+                        order_by: str = 'id') -> Iterator[List[tuple]]:
+    """
+    Yield lists of equipment record value tuples, ``batch_size`` at a time
+    
+    Args:
+        dataset: Dataset to read
+        fields: Fields of each tuple
+        batch_size: Records per batch
+        order_by: 'id' for insertion order, or a string field such as
+            'equipment_name'; columnar datasets support these two
+    """
+    if is_columnar(dataset):
+        infos = _segment_infos(dataset)
+        if order_by == 'id':
+            # One segment's payload in memory at a time
+            for info in infos:
+                _, reader, _ = _load_segments([info[0]])[info[0]]
+                for start in range(0, reader.row_count, batch_size):
+                    rows = slice(start, start + batch_size)
+                    yield list(zip(*(_as_list(reader.column(field, rows)) for field in fields)))
+            return
+        if order_by != 'equipment_name':
+            raise ValueError("Columnar datasets are ordered by 'id' or 'equipment_name'")
+        
+        loaded: Dict[int, Segment] = {}
+        after = None
+        while True:
+            page, after = _segment_page(infos, loaded, fields, batch_size, after)
+            if page[fields[0]]:
+                yield list(zip(*(page[field] for field in fields)))
+            if after is None:
+                return
+    
+    # Rows come from a database cursor via iterator(), so neither model
+    # instances nor the full result set are ever held in memory
+    rows = (
+        EquipmentRecord.objects.filter(dataset=dataset)
+        .order_by(order_by)
+        .values_list(*fields)
+        .iterator(chunk_size=batch_size)
+    )
+    
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def head_records(dataset: Dataset, fields: Sequence[str], count: int,
+                 order_by: str = 'equipment_name') -> List[tuple]:
+    """First ``count`` records of a dataset as value tuples"""
+    if is_columnar(dataset):
+        return next(iter_record_batches(dataset, fields, count, order_by), [])
+    return list(
+        EquipmentRecord.objects.filter(dataset=dataset)
+        .order_by(order_by)
+        .values_list(*fields)[:count]
+    )
+
+
+def count_records(dataset: Dataset) -> int:
+    """Number of stored records of a dataset"""
+    if is_columnar(dataset):
+        # Kept in step with the stored columns by every ingest and append
+        return dataset.record_count
+    return EquipmentRecord.objects.filter(dataset=dataset).count()
@@ -1,11 +1,14 @@
 import io
 import os
 from datetime import datetime
+from functools import lru_cache
+from itertools import chain
+from typing import BinaryIO
 from reportlab.lib.pagesizes import letter, A4
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 from reportlab.lib import colors
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, LongTable, TableStyle, Image
 from reportlab.graphics.shapes import Drawing
 from reportlab.graphics.charts.piecharts import Pie
 from reportlab.graphics.charts.barcharts import VerticalBarChart
@@ -13,34 +16,152 @@ from reportlab.lib.colors import HexColor
 import matplotlib.pyplot as plt
 import matplotlib
 matplotlib.use('Agg')  # Use non-interactive backend
-from .models import Dataset, EquipmentRecord
+from desktop_app.shared.chart_cache import ChartCache, chart_key
+from django.conf import settings
+from . import record_storage
+from .models import Dataset
 
 
-class ReportGenerator:
+TABLE_HEADER_COMMANDS = [
+    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+    ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black)
+]
+
+
+# Rendered charts shared by every report of this process; datasets with the
+# same type distribution reuse the same drawing
+report_charts = ChartCache(settings.CHART_CACHE_MAX_BYTES)
+
+# Equipment detail columns, with their widths in the report
+DETAIL_FIELDS = ['equipment_name', 'equipment_type', 'flowrate', 'pressure', 'temperature']
+DETAIL_HEADER = ['Equipment Name', 'Type', 'Flowrate', 'Pressure', 'Temperature']
+DETAIL_COL_WIDTHS = [1.5*inch, 1.2*inch, 0.8*inch, 0.8*inch, 0.8*inch]
+
+# Records shown in the equipment details sample of a detailed report
+DETAIL_SAMPLE_SIZE = 20
+
+# Records fetched per query and laid out per table in a full listing
+LISTING_CHUNK_SIZE = 500
+
+
+class FlowableStream(list):
     """
-    PDF report generator for chemical equipment analytics
+    Report story that pulls its flowables from an iterator while it is built
+    
+    SimpleDocTemplate.build consumes the story from the front, so topping the
+    list up on access keeps a few flowables in memory rather than the tables
+    of every record.
     """
     
-    def __init__(self):
-        self.styles = getSampleStyleSheet()
-        self.title_style = ParagraphStyle(
+    # Flowables kept ahead of the one being laid out
+    LOOKAHEAD = 2
+    
+    def __init__(self, flowables):
+        super().__init__()
+        self._source = iter(flowables)
+    
+    def _fill(self):
+        while self._source is not None and list.__len__(self) < self.LOOKAHEAD:
+            try:
+                self.append(next(self._source))
+            except StopIteration:
+                self._source = None
+    
+    def __len__(self):
+        self._fill()
+        return list.__len__(self)
+    
+    def __getitem__(self, index):
+        self._fill()
+        return list.__getitem__(self, index)
+
+
+def format_detail_row(record):
+    """Format a values_list row of DETAIL_FIELDS as a details table row"""
+    name, equipment_type, flowrate, pressure, temperature = record
+    return [name, equipment_type, f"{flowrate:.1f}", f"{pressure:.1f}", f"{temperature:.1f}"]
+
+
+@lru_cache(maxsize=None)
+def report_styles():
+    """
+    Paragraph and table styles of the report, built once per process
+    
+    Returns:
+        Dictionary of the sample stylesheet and the report's named styles
+    """
+    sample = getSampleStyleSheet()
+    return {
+        'sample': sample,
+        'title': ParagraphStyle(
             'CustomTitle',
-            parent=self.styles['Heading1'],
+            parent=sample['Heading1'],
             fontSize=18,
             spaceAfter=30,
             textColor=colors.darkblue,
             alignment=1  # Center alignment
-        )
-        self.heading_style = ParagraphStyle(
+        ),
+        'heading': ParagraphStyle(
             'CustomHeading',
-            parent=self.styles['Heading2'],
+            parent=sample['Heading2'],
             fontSize=14,
             spaceAfter=12,
             textColor=colors.darkblue
-        )
+        ),
+        'metadata_table': TableStyle([
+            ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
+            ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 0), (-1, -1), 10),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
+            ('BACKGROUND', (1, 0), (1, -1), colors.beige),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black)
+        ]),
+        'data_table': TableStyle(TABLE_HEADER_COMMANDS + [
+            ('FONTSIZE', (0, 0), (-1, -1), 10),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 12)
+        ]),
+        'details_table': TableStyle(TABLE_HEADER_COMMANDS + [
+            ('FONTSIZE', (0, 0), (-1, -1), 8),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 8)
+        ])
+    }
+
+
+class ReportGenerator:
+    """
+    PDF report generator for chemical equipment analytics
+    """
+    
+    # Bump when the report layout changes so stored reports are re-rendered
+    TEMPLATE_VERSION = 1
+    
+    def __init__(self):
+        styles = report_styles()
+        self.styles = styles['sample']
+        self.title_style = styles['title']
+        self.heading_style = styles['heading']
+        self.table_styles = styles
     
     def create_pie_chart(self, data_dict, title, width=400, height=300):
-        """Create a pie chart for equipment type distribution"""
+        """Create a pie chart for equipment type distribution, cached by content"""
+        key = chart_key('pie', data_dict, title=title, width=width, height=height)
+        chart = report_charts.get_or_render(
+            key, lambda: self.render_pie_chart(data_dict, width, height).expandUserNodes()
+        )
+        
+        # Platypus keeps layout state on the flowable, so every report gets
+        # its own Drawing around the cached, already expanded shapes
+        return Drawing(width, height, *chart.contents)
+    
+    def render_pie_chart(self, data_dict, width, height):
+        """Draw the pie chart of create_pie_chart"""
         drawing = Drawing(width, height)
         
         pie = Pie()
@@ -71,6 +192,18 @@ class ReportGenerator:
     
     def create_bar_chart_image(self, data_dict, title, filename):
         """Create a bar chart using matplotlib and save as image"""
+        key = chart_key('distribution_bar', data_dict, title=title)
+        image = report_charts.get_or_render(
+            key, lambda: self.render_bar_chart_png(data_dict, title)
+        )
+        
+        with open(filename, 'wb') as image_file:
+            image_file.write(image)
+        
+        return filename
+    
+    def render_bar_chart_png(self, data_dict, title):
+        """Draw the bar chart of create_bar_chart_image as PNG bytes"""
         plt.figure(figsize=(10, 6))
         
         equipment_types = list(data_dict.keys())
@@ -90,181 +223,209 @@ class ReportGenerator:
                     f'{int(height)}', ha='center', va='bottom')
         
         plt.tight_layout()
-        plt.savefig(filename, dpi=150, bbox_inches='tight')
+        image = io.BytesIO()
+        plt.savefig(image, format='png', dpi=150, bbox_inches='tight')
         plt.close()
         
-        return filename
+        return image.getvalue()
     
-    def generate_pdf_report(self, dataset_id, output_path=None):
+    def write_report(self, dataset_id, sink: BinaryIO, detailed=False, full_listing=False):
         """
-        Generate a comprehensive PDF report for a dataset
+        Render the PDF report of a dataset into a file-like sink
         
         Args:
             dataset_id: ID of the dataset to generate report for
-            output_path: Optional path to save the PDF file
-            
-        Returns:
-            Path to the generated PDF file
+            sink: Writable binary file object receiving the PDF
+            detailed: Include the distribution table and equipment details
+            full_listing: Detailed report listing every record instead of a
+                sample; records are streamed from the database in chunks
         """
         try:
-            dataset = Dataset.objects.get(id=dataset_id)
-            equipment_records = EquipmentRecord.objects.filter(dataset=dataset)
-            
-            # Create output path if not provided
-            if not output_path:
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                filename = f"equipment_report_{dataset.id}_{timestamp}.pdf"
-                output_path = os.path.join('media', 'reports', filename)
-                
-                # Create reports directory if it doesn't exist
-                os.makedirs(os.path.dirname(output_path), exist_ok=True)
-            
-            # Create PDF document
-            doc = SimpleDocTemplate(output_path, pagesize=A4)
-            story = []
-            
-            # Title
-            title = Paragraph(
-                f"Chemical Equipment Analysis Report<br/>{dataset.filename}",
-                self.title_style
-            )
-            story.append(title)
-            story.append(Spacer(1, 20))
-            
-            # Report metadata
-            metadata_data = [
-                ['Report Generated:', datetime.now().strftime("%Y-%m-%d %H:%M:%S")],
-                ['Dataset File:', dataset.filename],
-                ['Upload Date:', dataset.upload_timestamp.strftime("%Y-%m-%d %H:%M:%S")],
-                ['Total Equipment Count:', str(dataset.record_count)],
-                ['User:', dataset.user.username]
-            ]
-            
-            metadata_table = Table(metadata_data, colWidths=[2*inch, 3*inch])
-            metadata_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
-                ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-                ('FONTSIZE', (0, 0), (-1, -1), 10),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
-                ('BACKGROUND', (1, 0), (1, -1), colors.beige),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black)
-            ]))
-            
-            story.append(metadata_table)
-            story.append(Spacer(1, 30))
-            
-            # Summary Statistics
-            story.append(Paragraph("Summary Statistics", self.heading_style))
-            
-            summary_data = [
-                ['Parameter', 'Average Value', 'Unit'],
-                ['Flowrate', f"{dataset.avg_flowrate:.2f}", 'L/min'],
-                ['Pressure', f"{dataset.avg_pressure:.2f}", 'bar'],
-                ['Temperature', f"{dataset.avg_temperature:.2f}", 'K']
-            ]
+            dataset = Dataset.objects.select_related('user').get(id=dataset_id)
             
-            summary_table = Table(summary_data, colWidths=[2*inch, 1.5*inch, 1*inch])
-            summary_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-                ('FONTSIZE', (0, 0), (-1, -1), 10),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black)
-            ]))
+            story = self.build_story(dataset, detailed or full_listing, sample=not full_listing)
+            if full_listing:
+                story = FlowableStream(chain(story, self.iter_listing(dataset)))
             
-            story.append(summary_table)
-            story.append(Spacer(1, 30))
-            
-            # Equipment Type Distribution
-            story.append(Paragraph("Equipment Type Distribution", self.heading_style))
-            
-            # Create pie chart
-            pie_chart = self.create_pie_chart(
-                dataset.type_distribution,
-                "Equipment Type Distribution"
-            )
-            story.append(pie_chart)
-            story.append(Spacer(1, 20))
-            
-            # Distribution table
-            dist_data = [['Equipment Type', 'Count', 'Percentage']]
-            total_count = sum(dataset.type_distribution.values())
-            
-            for eq_type, count in dataset.type_distribution.items():
-                percentage = (count / total_count) * 100
-                dist_data.append([eq_type, str(count), f"{percentage:.1f}%"])
-            
-            dist_table = Table(dist_data, colWidths=[2*inch, 1*inch, 1*inch])
-            dist_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-                ('FONTSIZE', (0, 0), (-1, -1), 10),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black)
-            ]))
-            
-            story.append(dist_table)
-            story.append(Spacer(1, 30))
-            
-            # Equipment Details (first 20 records to avoid overly long reports)
-            story.append(Paragraph("Equipment Details (Sample)", self.heading_style))
-            
-            equipment_data = [['Equipment Name', 'Type', 'Flowrate', 'Pressure', 'Temperature']]
-            
-            for record in equipment_records[:20]:  # Limit to first 20 records
-                equipment_data.append([
-                    record.equipment_name,
-                    record.equipment_type,
-                    f"{record.flowrate:.1f}",
-                    f"{record.pressure:.1f}",
-                    f"{record.temperature:.1f}"
-                ])
-            
-            if len(equipment_records) > 20:
-                equipment_data.append(['...', '...', '...', '...', '...'])
-                equipment_data.append([
-                    f"Total: {len(equipment_records)} records",
-                    '', '', '', ''
-                ])
-            
-            equipment_table = Table(equipment_data, colWidths=[1.5*inch, 1.2*inch, 0.8*inch, 0.8*inch, 0.8*inch])
-            equipment_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-                ('FONTSIZE', (0, 0), (-1, -1), 8),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black)
-            ]))
-            
-            story.append(equipment_table)
-            
-            # Build PDF
+            doc = SimpleDocTemplate(sink, pagesize=A4)
             doc.build(story)
             
-            return output_path
-            
         except Dataset.DoesNotExist:
             raise ValueError(f"Dataset with ID {dataset_id} not found")
         except Exception as e:
             raise Exception(f"Error generating PDF report: {str(e)}")
     
+    def build_story(self, dataset, detailed=False, sample=True):
+        """
+        Build the flowables of a dataset report
+        
+        Args:
+            dataset: Dataset to report on
+            detailed: Include the distribution table and equipment details
+            sample: Include the equipment details sample in a detailed report
+            
+        Returns:
+            List of ReportLab flowables
+        """
+        story = []
+        
+        # Title
+        title = Paragraph(
+            f"Chemical Equipment Analysis Report<br/>{dataset.filename}",
+            self.title_style
+        )
+        story.append(title)
+        story.append(Spacer(1, 20))
+        
+        # Report metadata
+        metadata_data = [
+            ['Report Generated:', datetime.now().strftime("%Y-%m-%d %H:%M:%S")],
+            ['Dataset File:', dataset.filename],
+            ['Upload Date:', dataset.upload_timestamp.strftime("%Y-%m-%d %H:%M:%S")],
+            ['Total Equipment Count:', str(dataset.record_count)],
+            ['User:', dataset.user.username]
+        ]
+        
+        metadata_table = Table(metadata_data, colWidths=[2*inch, 3*inch])
+        metadata_table.setStyle(self.table_styles['metadata_table'])
+        
+        story.append(metadata_table)
+        story.append(Spacer(1, 30))
+        
+        # Summary Statistics
+        story.append(Paragraph("Summary Statistics", self.heading_style))
+        
+        summary_data = [
+            ['Parameter', 'Average Value', 'Unit'],
+            ['Flowrate', f"{dataset.avg_flowrate:.2f}", 'L/min'],
+            ['Pressure', f"{dataset.avg_pressure:.2f}", 'bar'],
+            ['Temperature', f"{dataset.avg_temperature:.2f}", 'K']
+        ]
+        
+        summary_table = Table(summary_data, colWidths=[2*inch, 1.5*inch, 1*inch])
+        summary_table.setStyle(self.table_styles['data_table'])
+        
+        story.append(summary_table)
+        story.append(Spacer(1, 30))
+        
+        # Equipment Type Distribution
+        story.append(Paragraph("Equipment Type Distribution", self.heading_style))
+        
+        # Create pie chart
+        pie_chart = self.create_pie_chart(
+            dataset.type_distribution,
+            "Equipment Type Distribution"
+        )
+        story.append(pie_chart)
+        story.append(Spacer(1, 20))
+        
+        if detailed:
+            story.extend(self.build_details(dataset, sample))
+        
+        return story
+    
+    def build_details(self, dataset, sample=True):
+        """Distribution table and equipment details sample of a detailed report"""
+        story = []
+        
+        # Distribution table
+        dist_data = [['Equipment Type', 'Count', 'Percentage']]
+        total_count = sum(dataset.type_distribution.values())
+        
+        for eq_type, count in dataset.type_distribution.items():
+            percentage = (count / total_count) * 100
+            dist_data.append([eq_type, str(count), f"{percentage:.1f}%"])
+        
+        dist_table = Table(dist_data, colWidths=[2*inch, 1*inch, 1*inch])
+        dist_table.setStyle(self.table_styles['data_table'])
+        
+        story.append(dist_table)
+        story.append(Spacer(1, 30))
+        
+        if not sample:
+            return story
+        
+        # Equipment Details (first records only to avoid overly long reports)
+        story.append(Paragraph("Equipment Details (Sample)", self.heading_style))
+        
+        equipment_data = [DETAIL_HEADER]
+        
+        for record in record_storage.head_records(dataset, DETAIL_FIELDS, DETAIL_SAMPLE_SIZE):
+            equipment_data.append(format_detail_row(record))
+        
+        record_count = record_storage.count_records(dataset)
+        if record_count > DETAIL_SAMPLE_SIZE:
+            equipment_data.append(['...', '...', '...', '...', '...'])
+            equipment_data.append([
+                f"Total: {record_count} records",
+                '', '', '', ''
+            ])
+        
+        equipment_table = Table(equipment_data, colWidths=DETAIL_COL_WIDTHS)
+        equipment_table.setStyle(self.table_styles['details_table'])
+        
+        story.append(equipment_table)
+        return story
+    
+    def iter_listing(self, dataset):
+        """
+        Yield the equipment details of every record of a dataset
+        
+        Records are read in batches of LISTING_CHUNK_SIZE (with a
+        server-side iterator, or sliced from the loaded columns of a
+        columnar dataset) and laid out one table per batch, so the table
+        layout of the whole dataset is never held at once. Each table
+        repeats its header on every page it spans.
+        """
+        yield Paragraph(
+            f"Equipment Details ({record_storage.count_records(dataset)} records)",
+            self.heading_style
+        )
+        
+        batches = record_storage.iter_record_batches(
+            dataset, DETAIL_FIELDS, LISTING_CHUNK_SIZE, order_by='equipment_name'
+        )
+        for batch in batches:
+            yield self.listing_table([format_detail_row(record) for record in batch])
+    
+    def listing_table(self, rows):
+        """Details table of one chunk of a full listing"""
+        table = LongTable([DETAIL_HEADER] + rows, colWidths=DETAIL_COL_WIDTHS, repeatRows=1)
+        table.setStyle(self.table_styles['details_table'])
+        return table
+    
+    def generate_pdf_report(self, dataset_id, output_path=None, full_listing=False):
+        """
+        Generate a comprehensive PDF report for a dataset
+        
+        Args:
+            dataset_id: ID of the dataset to generate report for
+            output_path: Optional path to save the PDF file
+            full_listing: List every record instead of a sample
+            
+        Returns:
+            Path to the generated PDF file
+        """
+        # Create output path if not provided
+        if not output_path:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            filename = f"equipment_report_{dataset_id}_{timestamp}.pdf"
+            output_path = os.path.join('media', 'reports', filename)
+            
+            # Create reports directory if it doesn't exist
+            os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        
+        with open(output_path, 'wb') as output_file:
+            self.write_report(dataset_id, output_file, detailed=True, full_listing=full_listing)
+        
+        return output_path
+    
     def generate_report_buffer(self, dataset_id):
         """
-        Generate PDF report and return as BytesIO buffer for HTTP response
+        Generate PDF report and return as BytesIO buffer
+        
+        Prefer write_report with a file or response as the sink, which
+        avoids holding a second copy of the PDF.
         
         Args:
             dataset_id: ID of the dataset to generate report for
@@ -273,92 +434,8 @@ class ReportGenerator:
             BytesIO buffer containing the PDF data
         """
         buffer = io.BytesIO()
+        self.write_report(dataset_id, buffer)
         
-        try:
-            dataset = Dataset.objects.get(id=dataset_id)
-            equipment_records = EquipmentRecord.objects.filter(dataset=dataset)
-            
-            # Create PDF document in memory
-            doc = SimpleDocTemplate(buffer, pagesize=A4)
-            story = []
-            
-            # Title
-            title = Paragraph(
-                f"Chemical Equipment Analysis Report<br/>{dataset.filename}",
-                self.title_style
-            )
-            story.append(title)
-            story.append(Spacer(1, 20))
-            
-            # Report metadata
-            metadata_data = [
-                ['Report Generated:', datetime.now().strftime("%Y-%m-%d %H:%M:%S")],
-                ['Dataset File:', dataset.filename],
-                ['Upload Date:', dataset.upload_timestamp.strftime("%Y-%m-%d %H:%M:%S")],
-                ['Total Equipment Count:', str(dataset.record_count)],
-                ['User:', dataset.user.username]
-            ]
-            
-            metadata_table = Table(metadata_data, colWidths=[2*inch, 3*inch])
-            metadata_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
-                ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-                ('FONTSIZE', (0, 0), (-1, -1), 10),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
-                ('BACKGROUND', (1, 0), (1, -1), colors.beige),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black)
-            ]))
-            
-            story.append(metadata_table)
-            story.append(Spacer(1, 30))
-            
-            # Summary Statistics
-            story.append(Paragraph("Summary Statistics", self.heading_style))
-            
-            summary_data = [
-                ['Parameter', 'Average Value', 'Unit'],
-                ['Flowrate', f"{dataset.avg_flowrate:.2f}", 'L/min'],
-                ['Pressure', f"{dataset.avg_pressure:.2f}", 'bar'],
-                ['Temperature', f"{dataset.avg_temperature:.2f}", 'K']
-            ]
-            
-            summary_table = Table(summary_data, colWidths=[2*inch, 1.5*inch, 1*inch])
-            summary_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-                ('FONTSIZE', (0, 0), (-1, -1), 10),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black)
-            ]))
-            
-            story.append(summary_table)
-            story.append(Spacer(1, 30))
-            
-            # Equipment Type Distribution
-            story.append(Paragraph("Equipment Type Distribution", self.heading_style))
-            
-            # Create pie chart
-            pie_chart = self.create_pie_chart(
-                dataset.type_distribution,
-                "Equipment Type Distribution"
-            )
-            story.append(pie_chart)
-            story.append(Spacer(1, 20))
-            
-            # Build PDF
-            doc.build(story)
-            
-            # Reset buffer position
-            buffer.seek(0)
-            return buffer
-            
-        except Dataset.DoesNotExist:
-            raise ValueError(f"Dataset with ID {dataset_id} not found")
-        except Exception as e:
-            raise Exception(f"Error generating PDF report: {str(e)}")
\ No newline at end of file
+        # Reset buffer position
+        buffer.seek(0)
+        return buffer
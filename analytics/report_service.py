@@ -0,0 +1,162 @@
+import multiprocessing
+import os
+import threading
+import uuid
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Optional
+from django.conf import settings
+
+
+# Lazily created pool of processes rendering PDF reports
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+# Set in pool processes, which render directly instead of resubmitting
+_in_worker = False
+
+# Models and the report modules are imported inside the functions below:
+# spawned pool processes import this module before _warm_worker has set
+# Django up.
+
+
+def _warm_worker(settings_module: str):
+    """
+    Prepare a pool process: set up Django and preload the rendering stack
+    
+    Importing ReportLab and matplotlib takes longer than rendering a small
+    report, so it is paid once per process rather than on the first job.
+    """
+    global _in_worker
+    _in_worker = True
+    
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
+    import django
+    django.setup()
+    
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot  # noqa: F401
+    from . import report_store  # noqa: F401  (imports ReportLab)
+
+
+def get_executor() -> ProcessPoolExecutor:
+    """Return the report rendering pool, starting it on first use"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # Spawned rather than forked, so pool processes never share the
+            # parent's database connections or threads
+            _executor = ProcessPoolExecutor(
+                max_workers=settings.REPORT_WORKERS,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_warm_worker,
+                initargs=(os.environ.get('DJANGO_SETTINGS_MODULE', 'chemical_equipment_visualizer.settings'),)
+            )
+    return _executor
+
+
+def _discard_executor(executor: ProcessPoolExecutor):
+    """
+    Drop a broken pool so the next call to get_executor starts a new one
+    
+    A pool process that dies (killed for memory, or crashing inside
+    ReportLab or matplotlib) breaks the whole pool: every later submit
+    raises BrokenProcessPool.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is executor:
+            _executor = None
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _submit(fn: Callable, *args) -> Future:
+    """Submit a call to the pool, replacing the pool if it is broken"""
+    executor = get_executor()
+    try:
+        future = executor.submit(fn, *args)
+    except BrokenProcessPool:
+        _discard_executor(executor)
+        executor = get_executor()
+        future = executor.submit(fn, *args)
+    
+    def discard_if_broken(done: Future):
+        if not done.cancelled() and isinstance(done.exception(), BrokenProcessPool):
+            _discard_executor(executor)
+    
+    future.add_done_callback(discard_if_broken)
+    return future
+
+
+def _ping() -> bool:
+    return True
+
+
+def start_pool():
+    """
+    Start every pool process ahead of the first report
+    
+    Each process sets up Django and imports the rendering stack when it
+    starts, so starting them at server startup keeps that cost off the
+    first report requests.
+    """
+    for _ in range(settings.REPORT_WORKERS):
+        _submit(_ping)
+
+
+def _render_dataset_report(dataset_id: int, full_listing: bool = False) -> str:
+    """Render a stored report inside a pool process"""
+    from .models import Dataset
+    from . import report_store
+    return report_store.get_report(Dataset.objects.get(id=dataset_id), full_listing)
+
+
+def _run_report_job(job_id: str) -> bool:
+    """Claim and run a queued report job inside a pool process"""
+    from .jobs import claim_job, run_job
+    job = claim_job(uuid.UUID(job_id))
+    if job is None:
+        return False
+    run_job(job)
+    return True
+
+
+def render_report(dataset_id: int, full_listing: bool = False) -> str:
+    """
+    Render the stored report of a dataset in the pool and wait for it
+    
+    The calling thread only waits on the result, so rendering does not hold
+    the GIL of the API process.
+    
+    Returns:
+        Path to the PDF file
+    """
+    if _in_worker:
+        return _render_dataset_report(dataset_id, full_listing)
+    try:
+        return _submit(_render_dataset_report, dataset_id, full_listing).result()
+    except BrokenProcessPool:
+        # A pool process died while rendering, possibly on another job;
+        # the broken pool has been replaced, so try once more
+        return _submit(_render_dataset_report, dataset_id, full_listing).result()
+
+
+def get_report(dataset, full_listing: bool = False) -> str:
+    """
+    Return the path of the dataset's stored report, rendering it in the pool
+    when it has not been rendered yet
+    
+    Returns:
+        Path to the PDF file
+    """
+    from . import report_store
+    path = report_store.report_path(dataset, full_listing)
+    if os.path.exists(path):
+        return path
+    return render_report(dataset.id, full_listing)
+
+
+def submit_report_job(job_id) -> Future:
+    """Run a queued report job in the pool without waiting for it"""
+    return _submit(_run_report_job, str(job_id))
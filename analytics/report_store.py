@@ -0,0 +1,110 @@
+import os
+import re
+import shutil
+import tempfile
+from django.conf import settings
+from .models import Dataset
+from .report_generator import ReportGenerator
+
+
+# Rendered report file names: dataset version, template version, listing suffix
+REPORT_NAME = re.compile(r'^v(\d+)-t(\d+)(?:-full)?\.pdf$')
+
+
+def report_store_dir() -> str:
+    """Directory holding rendered PDF reports"""
+    return os.path.join(settings.MEDIA_ROOT, 'reports', 'store')
+
+
+def dataset_report_dir(dataset_id: int) -> str:
+    """Directory holding the rendered reports of one dataset"""
+    return os.path.join(report_store_dir(), str(dataset_id))
+
+
+def report_name(dataset: Dataset, full_listing: bool = False) -> str:
+    """
+    File name of the rendered report for the current state of a dataset
+    
+    The name includes the dataset version and the report template version,
+    so appending rows or changing the template never serves a stale file.
+    """
+    suffix = '-full' if full_listing else ''
+    return f'v{dataset.version}-t{ReportGenerator.TEMPLATE_VERSION}{suffix}.pdf'
+
+
+def report_path(dataset: Dataset, full_listing: bool = False) -> str:
+    """Path of the rendered report for the current state of a dataset"""
+    return os.path.join(dataset_report_dir(dataset.id), report_name(dataset, full_listing))
+
+
+def get_report(dataset: Dataset, full_listing: bool = False) -> str:
+    """
+    Return the path of the dataset's rendered report, rendering it if needed
+    
+    The report is rendered to a temporary file and moved into place, so
+    concurrent requests never see a partly written file; at worst two of
+    them render the same report once each.
+    
+    Args:
+        dataset: Dataset to get the report of
+        full_listing: Detailed report listing every equipment record
+    
+    Returns:
+        Path to the PDF file
+    """
+    path = report_path(dataset, full_listing)
+    if os.path.exists(path):
+        return path
+    
+    directory = dataset_report_dir(dataset.id)
+    os.makedirs(directory, exist_ok=True)
+    
+    fd, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        # Render straight into the file rather than through a memory buffer
+        with os.fdopen(fd, 'wb') as temp_file:
+            ReportGenerator().write_report(dataset.id, temp_file, full_listing=full_listing)
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    
+    remove_stale_reports(dataset)
+    return path
+
+
+def remove_stale_reports(dataset: Dataset):
+    """
+    Delete reports rendered for earlier versions of a dataset or template
+    
+    A slow render of an old version can finish after the report of a newer
+    one was stored, so only versions below both the given dataset's and the
+    one currently in the database are deleted; newer files are left alone.
+    
+    Args:
+        dataset: Dataset whose report was just rendered
+    """
+    current_version = Dataset.objects.filter(id=dataset.id).values_list('version', flat=True).first()
+    if current_version is None:
+        # Deleted meanwhile; its post_delete eviction removes the directory
+        return
+    version = min(dataset.version, current_version)
+    
+    directory = dataset_report_dir(dataset.id)
+    for name in os.listdir(directory):
+        match = REPORT_NAME.match(name)
+        if not match:
+            continue
+        file_version, template_version = int(match[1]), int(match[2])
+        if file_version < version or (
+            file_version == version and template_version < ReportGenerator.TEMPLATE_VERSION
+        ):
+            try:
+                os.remove(os.path.join(directory, name))
+            except OSError:
+                pass
+
+
+def evict_reports(dataset_id: int):
+    """Delete every rendered report of a dataset"""
+    shutil.rmtree(dataset_report_dir(dataset_id), ignore_errors=True)
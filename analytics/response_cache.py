@@ -0,0 +1,115 @@
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from .models import Dataset
+
+
+# Hit and miss counters of this process
+_stats = {'hits': 0, 'misses': 0}
+_stats_lock = threading.Lock()
+
+
+def _count(outcome: str):
+    with _stats_lock:
+        _stats[outcome] += 1
+
+
+def user_generation(user_id: int) -> int:
+    """
+    Current cache generation of a user's dataset list
+    
+    Every upload, append or delete moves the generation on, so list and
+    history entries cached under an earlier generation are never read
+    again and simply expire.
+    """
+    key = f'responses:user:{user_id}:generation'
+    generation = cache.get(key)
+    if generation is None:
+        # Start from the clock so a generation evicted from the cache is
+        # never handed out again
+        cache.add(key, time.time_ns(), timeout=None)
+        generation = cache.get(key, 0)
+    return generation
+
+
+def dataset_meta(dataset_id: int) -> Optional[Dict[str, Any]]:
+    """
+    Owner, version and upload time of a dataset, cached
+    
+    Returns:
+        Dictionary with user_id, version and upload_timestamp, or None when
+        the dataset does not exist
+    """
+    key = f'responses:dataset:{dataset_id}:meta'
+    meta = cache.get(key)
+    if meta is None:
+        meta = (
+            Dataset.objects.filter(id=dataset_id)
+            .values('user_id', 'version', 'upload_timestamp')
+            .first()
+        )
+        if meta is None:
+            return None
+        cache.set(key, meta, settings.RESPONSE_CACHE_TIMEOUT)
+    return meta
+
+
+def user_key(user_id: int, name: str) -> str:
+    """Cache key for a response built from all of a user's datasets"""
+    return f'responses:user:{user_id}:g{user_generation(user_id)}:{name}'
+
+
+def dataset_key(dataset_id: int, version: int, name: str) -> str:
+    """Cache key for a response built from one version of a dataset"""
+    return f'responses:dataset:{dataset_id}:v{version}:{name}'
+
+
+def get_or_build(key: str, builder: Callable[[], Any]) -> Tuple[Any, bool]:
+    """
+    Return the cached value for ``key``, building and storing it on a miss
+    
+    Returns:
+        Tuple of (value, whether it came from the cache)
+    """
+    value = cache.get(key)
+    if value is not None:
+        _count('hits')
+        return value, True
+    
+    _count('misses')
+    value = builder()
+    cache.set(key, value, settings.RESPONSE_CACHE_TIMEOUT)
+    return value, False
+
+
+def invalidate_dataset(dataset_id: int, user_id: int):
+    """Drop cached responses affected by a change to a dataset"""
+    cache.delete(f'responses:dataset:{dataset_id}:meta')
+    cache.set(f'responses:user:{user_id}:generation', time.time_ns(), timeout=None)
+
+
+def schedule_invalidation(dataset_id: int, user_id: int):
+    """
+    Invalidate once the current transaction commits
+    
+    Invalidating earlier would let a concurrent request re-cache the state
+    from before the change.
+    """
+    transaction.on_commit(lambda: invalidate_dataset(dataset_id, user_id))
+
+
+def stats() -> Dict[str, Any]:
+    """Hit and miss counters of this process"""
+    with _stats_lock:
+        hits, misses = _stats['hits'], _stats['misses']
+    
+    lookups = hits + misses
+    return {
+        'backend': settings.CACHES['default']['BACKEND'],
+        'hits': hits,
+        'misses': misses,
+        'hit_rate': round(hits / lookups, 3) if lookups else None
+    }
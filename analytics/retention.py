@@ -0,0 +1,175 @@
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Set
+from django.conf import settings
+from django.db import connections
+from django.utils import timezone
+from . import chunked_upload
+from .analytics_engine import AnalyticsEngine
+from .models import Dataset, RetentionPolicy
+
+
+logger = logging.getLogger(__name__)
+
+# Retention rules, named as on RetentionPolicy
+RULES = ('max_datasets', 'max_age_days', 'max_rows')
+
+# Users whose datasets the in-process sweeper checks on its next pass
+_pending_users: Set[int] = set()
+_pending_lock = threading.Lock()
+_wake = threading.Event()
+
+# Lazily started in-process sweeper thread
+_sweeper: Optional[threading.Thread] = None
+_sweeper_lock = threading.Lock()
+
+
+def default_policy() -> Dict[str, Optional[int]]:
+    """Retention rules of users without a RetentionPolicy"""
+    return {
+        'max_datasets': settings.RETENTION_MAX_DATASETS,
+        'max_age_days': settings.RETENTION_MAX_AGE_DAYS,
+        'max_rows': settings.RETENTION_MAX_ROWS
+    }
+
+
+def stale_dataset_ids(user_id: int, policy: Dict[str, Optional[int]],
+                      now: Optional[datetime] = None) -> List[int]:
+    """
+    IDs of a user's datasets that fall outside a retention policy
+    
+    Datasets are walked newest first, reading only their id, upload time and
+    record count. Once a dataset breaks a rule, every older one does too.
+    The newest dataset is always kept.
+    
+    Args:
+        user_id: Owner of the datasets
+        policy: Retention rules; None disables a rule
+        now: Reference time for the age rule
+    
+    Returns:
+        IDs of the datasets to delete, newest first
+    """
+    if not any(policy[rule] for rule in RULES):
+        return []
+    
+    cutoff = None
+    if policy['max_age_days']:
+        cutoff = (now or timezone.now()) - timedelta(days=policy['max_age_days'])
+    
+    datasets = (
+        Dataset.objects.filter(user_id=user_id)
+        .order_by('-upload_timestamp')
+        .values_list('id', 'upload_timestamp', 'record_count')
+    )
+    
+    stale = []
+    rows_kept = 0
+    for position, (dataset_id, uploaded_at, record_count) in enumerate(datasets.iterator()):
+        rows_kept += record_count
+        if position == 0:
+            continue
+        if (stale
+                or (policy['max_datasets'] and position >= policy['max_datasets'])
+                or (cutoff and uploaded_at < cutoff)
+                or (policy['max_rows'] and rows_kept > policy['max_rows'])):
+            stale.append(dataset_id)
+    return stale
+
+
+def sweep(user_ids: Optional[Iterable[int]] = None, batch_size: Optional[int] = None) -> int:
+    """
+    Delete datasets outside their owners' retention policies
+    
+    Datasets are purged in transactions of at most ``batch_size`` datasets,
+    so a large backlog never holds one long transaction.
+    
+    Args:
+        user_ids: Users to check; every user with datasets when None
+        batch_size: Datasets deleted per transaction, RETENTION_BATCH_SIZE by default
+    
+    Returns:
+        Number of datasets removed
+    """
+    batch_size = batch_size or settings.RETENTION_BATCH_SIZE
+    
+    if user_ids is None:
+        user_ids = Dataset.objects.order_by().values_list('user_id', flat=True).distinct()
+    user_ids = list(user_ids)
+    
+    policies = {
+        policy.pop('user_id'): policy
+        for policy in RetentionPolicy.objects.filter(user_id__in=user_ids).values('user_id', *RULES)
+    }
+    
+    now = timezone.now()
+    removed = 0
+    for user_id in user_ids:
+        stale = stale_dataset_ids(user_id, policies.get(user_id) or default_policy(), now)
+        for start in range(0, len(stale), batch_size):
+            removed += AnalyticsEngine.purge_datasets(stale[start:start + batch_size])
+    return removed
+
+
+def start_sweeper():
+    """Start the in-process sweeper thread unless it is already running"""
+    global _sweeper
+    with _sweeper_lock:
+        if _sweeper is None or not _sweeper.is_alive():
+            _sweeper = threading.Thread(target=_sweep_loop, name='retention-sweeper', daemon=True)
+            _sweeper.start()
+
+
+def request_sweep(user_id: int):
+    """
+    Ask the in-process sweeper to enforce a user's retention policy
+    
+    Called after uploads, so the request returns without waiting for
+    deletions. The sweeper thread is started on first use if the server
+    did not start it already.
+    """
+    with _pending_lock:
+        _pending_users.add(user_id)
+    start_sweeper()
+    _wake.set()
+
+
+def _sweep_loop():
+    """
+    Sweep the users who uploaded whenever woken, and every user each
+    RETENTION_SWEEP_INTERVAL seconds so the age rule applies without
+    uploads; being woken does not postpone the full sweep
+    """
+    # Monotonic time of the last full sweep, set so the first pass is one
+    last_full = time.monotonic() - settings.RETENTION_SWEEP_INTERVAL
+    while True:
+        interval = settings.RETENTION_SWEEP_INTERVAL
+        if interval:
+            _wake.wait(timeout=max(0.0, last_full + interval - time.monotonic()))
+        else:
+            _wake.wait()
+        _wake.clear()
+        
+        with _pending_lock:
+            user_ids = list(_pending_users)
+            _pending_users.clear()
+        
+        full = bool(interval) and time.monotonic() - last_full >= interval
+        try:
+            sweep(None if full else user_ids)
+            if full:
+                # Abandoned chunked uploads are removed on the full sweeps
+                chunked_upload.expire_sessions()
+        except Exception:
+            # Retry these users on the next pass, e.g. after SQLite reported
+            # the database locked by a concurrent upload
+            with _pending_lock:
+                _pending_users.update(user_ids)
+            logger.exception('Dataset retention sweep failed')
+        finally:
+            if full:
+                last_full = time.monotonic()
+            # Release this thread's connection while it sleeps
+            connections.close_all()
@@ -0,0 +1,19 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from .models import Dataset
+from . import report_store, response_cache
+
+
+@receiver(post_save, sender=Dataset)
+@receiver(post_delete, sender=Dataset)
+def invalidate_cached_responses(sender, instance, **kwargs):
+    """Keep cached dataset responses in step with uploads, appends and deletes"""
+    response_cache.schedule_invalidation(instance.id, instance.user_id)
+
+
+@receiver(post_delete, sender=Dataset)
+def evict_stored_reports(sender, instance, **kwargs):
+    """Remove rendered reports together with their dataset"""
+    dataset_id = instance.id
+    transaction.on_commit(lambda: report_store.evict_reports(dataset_id))
@@ -0,0 +1,197 @@
+import math
+import numpy as np
+import pandas as pd
+from typing import Dict, Any, Optional
+
+
+NUMERIC_COLUMNS = ['Flowrate', 'Pressure', 'Temperature']
+
+
+def numeric_kernel(values: np.ndarray) -> Dict[str, Any]:
+    """
+    Compute count, mean, min, max and M2 for every column of a 2-D array
+    
+    All numeric columns are reduced together along axis 0 of one
+    contiguous float64 array rather than column by column.
+    
+    Args:
+        values: Array of shape (rows, columns)
+        
+    Returns:
+        Dictionary of per-column arrays: count, mean, min, max and m2
+        (sum of squared deviations from the mean)
+    """
+    values = np.ascontiguousarray(values, dtype=np.float64)
+    count = values.shape[0]
+    
+    if count == 0:
+        empty = np.full(values.shape[1], np.nan)
+        return {'count': 0, 'mean': empty, 'min': empty, 'max': empty,
+                'm2': np.zeros(values.shape[1])}
+    
+    mean = values.sum(axis=0) / count
+    deviations = values - mean
+    return {
+        'count': count,
+        'mean': mean,
+        'min': values.min(axis=0),
+        'max': values.max(axis=0),
+        'm2': np.einsum('ij,ij->j', deviations, deviations)
+    }
+
+
+class SummaryAccumulator:
+    """
+    Mergeable running statistics for equipment data
+    
+    Tracks count, mean, M2, min and max per numeric column plus per-type
+    counts. Chunks are folded in with update() and partial results are
+    combined with merge() using Chan's parallel variance formula, so the
+    final summary is exact without holding all rows in memory.
+    """
+    
+    def __init__(self):
+        width = len(NUMERIC_COLUMNS)
+        self.count = 0
+        self.mean = np.zeros(width)
+        self.m2 = np.zeros(width)
+        self.min = np.full(width, np.inf)
+        self.max = np.full(width, -np.inf)
+        self.type_counts: Dict[str, int] = {}
+    
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> 'SummaryAccumulator':
+        """Create an accumulator holding the statistics of one DataFrame"""
+        accumulator = cls()
+        accumulator.update(df)
+        return accumulator
+    
+    def update(self, df: pd.DataFrame) -> 'SummaryAccumulator':
+        """
+        Fold a cleaned chunk of equipment data into the running statistics
+        
+        Args:
+            df: Cleaned DataFrame containing equipment data
+            
+        Returns:
+            The accumulator itself
+        """
+        if df.empty:
+            return self
+        
+        stats = numeric_kernel(df[NUMERIC_COLUMNS].to_numpy(dtype=np.float64))
+        
+        chunk = SummaryAccumulator()
+        chunk.count = stats['count']
+        chunk.mean = stats['mean']
+        chunk.m2 = stats['m2']
+        chunk.min = stats['min']
+        chunk.max = stats['max']
+        # Categorical columns report unused categories with a zero count
+        chunk.type_counts = {
+            str(eq_type): int(count)
+            for eq_type, count in df['Type'].value_counts().items()
+            if count
+        }
+        return self.merge(chunk)
+    
+    def merge(self, other: 'SummaryAccumulator') -> 'SummaryAccumulator':
+        """
+        Merge another accumulator into this one (Chan et al.)
+        
+        Args:
+            other: Accumulator for a disjoint set of rows
+            
+        Returns:
+            The accumulator itself
+        """
+        if other.count == 0:
+            return self
+        
+        if self.count == 0:
+            self.count = other.count
+            self.mean = other.mean.copy()
+            self.m2 = other.m2.copy()
+        else:
+            total = self.count + other.count
+            delta = other.mean - self.mean
+            self.mean = self.mean + delta * (other.count / total)
+            self.m2 = self.m2 + other.m2 + delta * delta * (self.count * other.count / total)
+            self.count = total
+        
+        self.min = np.minimum(self.min, other.min)
+        self.max = np.maximum(self.max, other.max)
+        
+        for eq_type, count in other.type_counts.items():
+            self.type_counts[eq_type] = self.type_counts.get(eq_type, 0) + count
+        
+        return self
+    
+    def summary(self) -> Dict[str, Any]:
+        """
+        Build summary statistics in the shape returned by calculate_summary
+        
+        Returns:
+            Dictionary containing summary statistics
+        """
+        averages = {}
+        detailed_stats = {}
+        
+        for i, col in enumerate(NUMERIC_COLUMNS):
+            key = col.lower()
+            if self.count > 1:
+                std = math.sqrt(max(float(self.m2[i]), 0.0) / (self.count - 1))
+            else:
+                std = math.nan
+            averages[key] = float(self.mean[i]) if self.count else math.nan
+            detailed_stats[key] = {
+                'min': float(self.min[i]) if self.count else math.nan,
+                'max': float(self.max[i]) if self.count else math.nan,
+                'std': std
+            }
+        
+        type_distribution = dict(
+            sorted(self.type_counts.items(), key=lambda item: item[1], reverse=True)
+        )
+        
+        return {
+            'total_count': self.count,
+            'averages': averages,
+            'type_distribution': type_distribution,
+            'detailed_stats': detailed_stats
+        }
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the accumulator state into JSON-compatible values"""
+        state = {
+            'count': self.count,
+            'type_counts': dict(self.type_counts)
+        }
+        for i, col in enumerate(NUMERIC_COLUMNS):
+            state[col.lower()] = {
+                'mean': float(self.mean[i]),
+                'm2': float(self.m2[i]),
+                # JSON has no infinity; an empty accumulator stores null bounds
+                'min': float(self.min[i]) if self.count else None,
+                'max': float(self.max[i]) if self.count else None
+            }
+        return state
+    
+    @classmethod
+    def from_dict(cls, state: Optional[Dict[str, Any]]) -> 'SummaryAccumulator':
+        """Restore an accumulator serialized with to_dict()"""
+        accumulator = cls()
+        if not state or not state.get('count'):
+            return accumulator
+        
+        accumulator.count = int(state['count'])
+        accumulator.type_counts = {
+            str(eq_type): int(count) for eq_type, count in state['type_counts'].items()
+        }
+        for i, col in enumerate(NUMERIC_COLUMNS):
+            column_state = state[col.lower()]
+            accumulator.mean[i] = column_state['mean']
+            accumulator.m2[i] = column_state['m2']
+            accumulator.min[i] = column_state['min']
+            accumulator.max[i] = column_state['max']
+        return accumulator
@@ -1,3 +1,428 @@
-from django.test import TestCase
+import hashlib
+import io
+import os
+import tempfile
+from datetime import timedelta
 
-# Create your tests here.
+import numpy as np
+import pandas as pd
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+
+from . import chunked_upload, columnar, jobs, record_storage, report_store, retention
+from .analytics_engine import AnalyticsEngine
+from .models import Dataset, EquipmentRecord, ProcessingJob
+from .statistics import NUMERIC_COLUMNS, SummaryAccumulator
+
+
+class QueryPlanTests(TestCase):
+    """
+    The dataset list and record listings must be served from their
+    composite indexes, without sorting at query time
+    """
+    
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='plan-user')
+        cls.dataset = Dataset.objects.create(
+            user=cls.user,
+            filename='plan.csv',
+            record_count=2,
+            avg_flowrate=1.0,
+            avg_pressure=1.0,
+            avg_temperature=1.0,
+            type_distribution={'Pump': 2}
+        )
+        EquipmentRecord.objects.bulk_create([
+            EquipmentRecord(
+                dataset=cls.dataset,
+                equipment_name=f'EQ-{i}',
+                equipment_type='Pump',
+                flowrate=1.0,
+                pressure=1.0,
+                temperature=1.0
+            )
+            for i in range(2)
+        ])
+    
+    def query_plan(self, queryset):
+        """Query plan text of a queryset on the current database"""
+        if connection.vendor == 'postgresql':
+            # Test tables are tiny, so steer the planner away from the
+            # sequential scans it would otherwise prefer
+            with connection.cursor() as cursor:
+                cursor.execute('SET LOCAL enable_seqscan = off')
+        return queryset.explain()
+    
+    def assert_uses_index(self, queryset, index_name):
+        if connection.vendor not in ('sqlite', 'postgresql'):
+            self.skipTest(f'No query plan check for {connection.vendor}')
+        
+        plan = self.query_plan(queryset)
+        self.assertIn(index_name, plan)
+        if connection.vendor == 'sqlite':
+            self.assertNotIn('TEMP B-TREE', plan)
+        else:
+            self.assertNotIn('Sort', plan)
+    
+    def test_dataset_list_uses_user_index(self):
+        self.assert_uses_index(
+            Dataset.objects.filter(user=self.user),
+            'dataset_user_recent_idx'
+        )
+    
+    def test_recent_datasets_use_user_index(self):
+        self.assert_uses_index(
+            Dataset.objects.filter(user=self.user).order_by('-upload_timestamp')[:5],
+            'dataset_user_recent_idx'
+        )
+    
+    def test_record_listing_uses_dataset_index(self):
+        self.assert_uses_index(
+            EquipmentRecord.objects.filter(dataset=self.dataset),
+            'record_dataset_name_idx'
+        )
+    
+    def test_record_page_uses_dataset_index(self):
+        self.assert_uses_index(
+            EquipmentRecord.objects.filter(dataset=self.dataset, equipment_name__gte='EQ-0')
+            .exclude(equipment_name='EQ-0', id__lte=0)
+            .order_by('equipment_name', 'id')[:10],
+            'record_dataset_name_idx'
+        )
+
+
+class IngestTests(TestCase):
+    """CSV ingestion must reject files that leave no usable records"""
+    
+    def test_file_without_named_records_is_empty(self):
+        user = User.objects.create_user(username='ingest-user')
+        content = (
+            b'Equipment Name,Type,Flowrate,Pressure,Temperature\n'
+            b',Pump,1,2,3\n'
+            b'EQ-1,,1,2,3\n'
+        )
+        for storage in (Dataset.STORAGE_ROWS, Dataset.STORAGE_COLUMNAR):
+            with self.subTest(storage=storage):
+                with self.assertRaisesMessage(ValueError, 'Dataset is empty'):
+                    AnalyticsEngine.process_csv(io.BytesIO(content), user, 'blank.csv', storage=storage)
+                self.assertFalse(Dataset.objects.exists())
+
+
+class SummaryAccumulatorTests(SimpleTestCase):
+    """Merged partial statistics must match pandas over the whole frame"""
+    
+    def setUp(self):
+        rng = np.random.default_rng(4)
+        self.frame = pd.DataFrame({
+            'Type': rng.choice(['Pump', 'Valve', 'Reactor'], size=300),
+            'Flowrate': rng.normal(120, 30, size=300),
+            'Pressure': rng.uniform(1, 10, size=300),
+            'Temperature': rng.normal(100, 15, size=300)
+        })
+    
+    def assert_matches_frame(self, accumulator):
+        summary = accumulator.summary()
+        self.assertEqual(summary['total_count'], len(self.frame))
+        self.assertEqual(summary['type_distribution'], self.frame['Type'].value_counts().to_dict())
+        for column in NUMERIC_COLUMNS:
+            key = column.lower()
+            self.assertAlmostEqual(summary['averages'][key], self.frame[column].mean(), places=9)
+            self.assertAlmostEqual(summary['detailed_stats'][key]['std'], self.frame[column].std(), places=9)
+            self.assertEqual(summary['detailed_stats'][key]['min'], self.frame[column].min())
+            self.assertEqual(summary['detailed_stats'][key]['max'], self.frame[column].max())
+    
+    def test_merged_partitions_match_pandas(self):
+        partitions = [self.frame.iloc[:1], self.frame.iloc[1:1], self.frame.iloc[1:120], self.frame.iloc[120:]]
+        accumulator = SummaryAccumulator()
+        for partition in partitions:
+            accumulator.merge(SummaryAccumulator.from_frame(partition))
+        self.assert_matches_frame(accumulator)
+    
+    def test_merge_into_empty_accumulator(self):
+        accumulator = SummaryAccumulator().merge(SummaryAccumulator.from_frame(self.frame))
+        self.assert_matches_frame(accumulator)
+    
+    def test_restored_state_matches_pandas(self):
+        head = SummaryAccumulator.from_frame(self.frame.iloc[:100])
+        restored = SummaryAccumulator.from_dict(head.to_dict())
+        restored.update(self.frame.iloc[100:])
+        self.assert_matches_frame(restored)
+    
+    def test_empty_state_round_trip(self):
+        restored = SummaryAccumulator.from_dict(SummaryAccumulator().to_dict())
+        self.assertEqual(restored.count, 0)
+        self.assert_matches_frame(restored.merge(SummaryAccumulator.from_frame(self.frame)))
+
+
+class PartsReaderTests(TestCase):
+    """Chunked upload parts must reassemble into the original file"""
+    
+    def setUp(self):
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        settings_override = override_settings(MEDIA_ROOT=media_root.name, CHUNKED_UPLOAD_MIN_PART_SIZE=1)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        
+        self.content = b'Equipment Name,Type,Flowrate,Pressure,Temperature\nEQ-1,Pump,1,2,3\n'
+        user = User.objects.create_user(username='upload-user')
+        self.session = chunked_upload.create_session(user, 'parts.csv', len(self.content), part_size=16)
+    
+    def part(self, number):
+        start = (number - 1) * self.session.part_size
+        return self.content[start:start + self.session.part_size]
+    
+    def test_out_of_order_parts_reassemble(self):
+        numbers = list(range(1, self.session.total_parts + 1))
+        for number in reversed(numbers):
+            chunked_upload.store_part(self.session, number, io.BytesIO(self.part(number)))
+        
+        with chunked_upload.open_upload(self.session) as reader:
+            self.assertEqual(reader.read(), self.content)
+            self.assertEqual(b''.join(reader.iter_chunks(chunk_size=7)), self.content)
+    
+    def test_checksum_mismatch_rejects_part(self):
+        checksum = hashlib.sha256(b'something else').hexdigest()
+        with self.assertRaisesMessage(chunked_upload.UploadError, 'Checksum mismatch for part 2'):
+            chunked_upload.store_part(self.session, 2, io.BytesIO(self.part(2)), checksum)
+        
+        self.assertEqual(chunked_upload.missing_ranges(self.session), [[1, self.session.total_parts]])
+        with self.assertRaises(chunked_upload.UploadError):
+            chunked_upload.open_upload(self.session)
+    
+    def test_matching_checksum_accepts_part(self):
+        checksum = hashlib.sha256(self.part(1)).hexdigest()
+        chunked_upload.store_part(self.session, 1, io.BytesIO(self.part(1)), checksum.upper())
+        self.assertEqual(chunked_upload.missing_ranges(self.session), [[2, self.session.total_parts]])
+    
+    def test_completion_is_claimed_once(self):
+        for number in range(1, self.session.total_parts + 1):
+            chunked_upload.store_part(self.session, number, io.BytesIO(self.part(number)))
+        
+        self.assertTrue(chunked_upload.mark_completed(self.session))
+        self.assertFalse(chunked_upload.mark_completed(self.session))
+        with self.assertRaisesMessage(chunked_upload.UploadError, 'Upload is already complete'):
+            chunked_upload.store_part(self.session, 1, io.BytesIO(self.part(1)))
+
+
+class ColumnarEncodingTests(SimpleTestCase):
+    """encode_columns output must decode back to the same records"""
+    
+    columns = {
+        'equipment_name': ['', 'Pompe à chaleur', '反应釜-1', 'EQ-🚀', ''],
+        'equipment_type': ['Pump', 'Échangeur', '', 'Pump', 'Échangeur'],
+        'flowrate': [1.5, 0.0, -2.25, 1e300, 7.0],
+        'pressure': [1.0, 2.0, 3.0, 4.0, 5.0],
+        'temperature': [-273.15, 0.0, 100.0, 20.5, 37.0]
+    }
+    
+    def test_round_trip(self):
+        header, decoded = columnar.decode_columns(columnar.encode_columns(self.columns, {'next_cursor': None}))
+        self.assertEqual(header['row_count'], 5)
+        self.assertIsNone(header['next_cursor'])
+        for field, values in self.columns.items():
+            self.assertEqual(list(decoded[field]), values)
+    
+    def test_empty_columns_round_trip(self):
+        _, decoded = columnar.decode_columns(
+            columnar.encode_columns({field: [] for field in self.columns})
+        )
+        self.assertEqual({field: list(values) for field, values in decoded.items()},
+                         {field: [] for field in self.columns})
+    
+    def test_reader_decodes_selected_rows(self):
+        reader = columnar.ColumnReader(columnar.encode_columns(self.columns))
+        self.assertEqual(reader.column('equipment_name', slice(1, 3)), self.columns['equipment_name'][1:3])
+        self.assertEqual(reader.column('equipment_name', np.array([4, 2, 0])), ['', '反应釜-1', ''])
+        self.assertEqual(reader.column('equipment_type', np.array([1])), ['Échangeur'])
+        self.assertEqual(reader.column('flowrate', np.array([3])).tolist(), [1e300])
+        self.assertEqual(reader.value('equipment_name', 3), 'EQ-🚀')
+    
+    def test_rejects_other_payloads(self):
+        with self.assertRaises(ValueError):
+            columnar.decode_columns(b'not a payload at all')
+
+
+class ColumnPageTests(TestCase):
+    """Name-ordered pages of columnar datasets must only fetch the segments they need"""
+    
+    # Equipment names of each appended segment
+    SEGMENTS = [['b', 'a', 'c'], ['x', 'y', 'z'], ['b', 'd', 'a']]
+    
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create_user(username='column-page-user')
+        cls.dataset = Dataset.objects.create(
+            user=user,
+            filename='segments.csv',
+            storage=Dataset.STORAGE_COLUMNAR,
+            record_count=9,
+            avg_flowrate=1.0,
+            avg_pressure=1.0,
+            avg_temperature=1.0,
+            type_distribution={}
+        )
+        for names in cls.SEGMENTS:
+            record_storage.write_segment(cls.dataset, {
+                'equipment_name': names,
+                'equipment_type': ['Pump'] * len(names),
+                'flowrate': [1.0] * len(names),
+                'pressure': [2.0] * len(names),
+                'temperature': [3.0] * len(names)
+            })
+    
+    def test_walk_matches_name_order(self):
+        names = [name for segment in self.SEGMENTS for name in segment]
+        batches = record_storage.iter_record_batches(
+            self.dataset, ['equipment_name'], 2, order_by='equipment_name'
+        )
+        self.assertEqual([row[0] for batch in batches for row in batch], sorted(names))
+    
+    def test_page_skips_segments_past_its_window(self):
+        # The segment metadata, then the two segments holding 'a' and 'b'
+        with self.assertNumQueries(3):
+            page, after = record_storage.column_page(self.dataset, ['equipment_name'], limit=2)
+        self.assertEqual(page['equipment_name'], ['a', 'a'])
+        self.assertEqual(after, ('a', 9))
+    
+    def test_cursor_skips_finished_segments(self):
+        with self.assertNumQueries(2):
+            page, after = record_storage.column_page(
+                self.dataset, ['equipment_name'], limit=2, after=('w', 0)
+            )
+        self.assertEqual(page['equipment_name'], ['x', 'y'])
+        self.assertEqual(after, ('y', 5))
+
+
+class ReportStoreTests(TestCase):
+    """Cleaning up after a render must never delete a newer report"""
+    
+    def setUp(self):
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        settings_override = override_settings(MEDIA_ROOT=media_root.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        
+        user = User.objects.create_user(username='report-user')
+        self.dataset = Dataset.objects.create(
+            user=user,
+            filename='report.csv',
+            record_count=1,
+            avg_flowrate=1.0,
+            avg_pressure=1.0,
+            avg_temperature=1.0,
+            type_distribution={}
+        )
+        os.makedirs(report_store.dataset_report_dir(self.dataset.id))
+    
+    def store(self, version: int, full_listing: bool = False) -> str:
+        """Write an empty report file for a version of the dataset"""
+        self.dataset.version = version
+        path = report_store.report_path(self.dataset, full_listing)
+        open(path, 'wb').close()
+        return path
+    
+    def test_slow_render_keeps_newer_reports(self):
+        older = self.store(1)
+        newer = self.store(3, full_listing=True)
+        Dataset.objects.filter(id=self.dataset.id).update(version=3)
+        
+        # A render of version 2 finishing after the version 3 report
+        rendered = self.store(2)
+        report_store.remove_stale_reports(self.dataset)
+        
+        self.assertFalse(os.path.exists(older))
+        self.assertTrue(os.path.exists(rendered))
+        self.assertTrue(os.path.exists(newer))
+
+
+class RetentionTests(TestCase):
+    """stale_dataset_ids must select the datasets each rule rejects"""
+    
+    # Age in days and record count of each dataset, newest first
+    DATASETS = [(2, 100), (5, 200), (20, 300), (30, 400)]
+    
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='retention-user')
+        cls.now = timezone.now()
+        cls.ids = []
+        for age, record_count in cls.DATASETS:
+            dataset = Dataset.objects.create(
+                user=cls.user,
+                filename=f'{age}.csv',
+                record_count=record_count,
+                avg_flowrate=1.0,
+                avg_pressure=1.0,
+                avg_temperature=1.0,
+                type_distribution={}
+            )
+            # upload_timestamp is set on insert, so backdate it afterwards
+            Dataset.objects.filter(id=dataset.id).update(upload_timestamp=cls.now - timedelta(days=age))
+            cls.ids.append(dataset.id)
+    
+    def stale(self, **rules):
+        policy = dict({rule: None for rule in retention.RULES}, **rules)
+        return retention.stale_dataset_ids(self.user.id, policy, self.now)
+    
+    def test_no_rules_keep_everything(self):
+        self.assertEqual(self.stale(), [])
+    
+    def test_count_rule_removes_oldest(self):
+        self.assertEqual(self.stale(max_datasets=2), self.ids[2:])
+    
+    def test_age_rule_removes_older_datasets(self):
+        self.assertEqual(self.stale(max_age_days=10), self.ids[2:])
+    
+    def test_age_rule_keeps_newest_dataset(self):
+        self.assertEqual(self.stale(max_age_days=1), self.ids[1:])
+    
+    def test_row_rule_removes_datasets_beyond_total(self):
+        self.assertEqual(self.stale(max_rows=300), self.ids[2:])
+    
+    def test_strictest_rule_wins(self):
+        self.assertEqual(self.stale(max_datasets=3, max_age_days=3), self.ids[1:])
+
+
+class JobLeaseTests(TransactionTestCase):
+    """A running job that keeps reporting progress must not be recovered"""
+    
+    def setUp(self):
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        settings_override = override_settings(MEDIA_ROOT=media_root.name, JOB_PROGRESS_INTERVAL=0)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        
+        user = User.objects.create_user(username='lease-user')
+        self.job = ProcessingJob.objects.create(user=user, filename='long.csv', file_path=__file__)
+        self.job = jobs.claim_job(self.job.id)
+    
+    def start_long_ago(self):
+        """Pretend the job was claimed more than a lease timeout ago"""
+        long_ago = timezone.now() - timedelta(seconds=2 * settings.JOB_LEASE_TIMEOUT)
+        ProcessingJob.objects.filter(id=self.job.id).update(started_at=long_ago, heartbeat_at=long_ago)
+    
+    def test_long_running_job_keeps_its_lease(self):
+        recorder = jobs.ProgressRecorder(self.job)
+        self.addCleanup(recorder.close)
+        self.start_long_ago()
+        recorder.update(50.0, 1000)
+        
+        self.assertEqual(jobs.recover_stale_jobs(), 0)
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.status, ProcessingJob.STATUS_RUNNING)
+    
+    def test_abandoned_job_is_requeued(self):
+        recorder = jobs.ProgressRecorder(self.job)
+        recorder.close()
+        self.start_long_ago()
+        
+        self.assertEqual(jobs.recover_stale_jobs(), 1)
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.status, ProcessingJob.STATUS_QUEUED)
@@ -3,12 +3,22 @@ from . import views
 
 urlpatterns = [
     path('upload/', views.upload_csv, name='upload_csv'),
+    path('uploads/', views.create_upload, name='create_upload'),
+    path('uploads/<uuid:upload_id>/', views.upload_status, name='upload_status'),
+    path('uploads/<uuid:upload_id>/parts/<int:part_number>/', views.upload_part, name='upload_part'),
+    path('uploads/<uuid:upload_id>/complete/', views.complete_upload, name='complete_upload'),
+    path('jobs/<uuid:job_id>/', views.get_job_status, name='get_job_status'),
     path('analytics/<int:dataset_id>/', views.get_analytics, name='get_analytics'),
+    path('analytics/<int:dataset_id>/types/', views.get_type_statistics, name='get_type_statistics'),
     path('datasets/', views.get_dataset_list, name='get_dataset_list'),
     path('history/', views.get_history, name='get_history'),
     path('datasets/<int:dataset_id>/', views.delete_dataset, name='delete_dataset'),
+    path('datasets/<int:dataset_id>/append/', views.append_csv, name='append_csv'),
+    path('datasets/<int:dataset_id>/export/', views.export_dataset, name='export_dataset'),
     path('reports/generate/', views.generate_report, name='generate_report'),
+    path('reports/bulk/', views.generate_reports_bulk, name='generate_reports_bulk'),
     path('reports/<int:dataset_id>/download/', views.download_report, name='download_report'),
     path('sample/load/', views.load_sample_data, name='load_sample_data'),
     path('sample/info/', views.get_sample_info, name='get_sample_info'),
+    path('cache/stats/', views.get_cache_stats, name='get_cache_stats'),
 ]
\ No newline at end of file
@@ -1,20 +1,237 @@
+import base64
+import binascii
+import csv
+import hashlib
+import io
+import json
 import os
-import pandas as pd
-from django.http import JsonResponse, HttpResponse
+from django.http import FileResponse, JsonResponse, HttpResponse, HttpResponseNotModified, StreamingHttpResponse
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import IsAuthenticated, AllowAny
+from rest_framework.permissions import IsAuthenticated, IsAdminUser, AllowAny
 from rest_framework.response import Response
 from django.views.decorators.csrf import csrf_exempt
-from django.core.files.storage import default_storage
-from django.core.files.base import ContentFile
 from django.conf import settings
-from analytics.models import Dataset, EquipmentRecord
-from analytics.analytics_engine import AnalyticsEngine
+from django.db import transaction
+from django.urls import reverse
+from analytics.models import Dataset, EquipmentRecord, ProcessingJob, UploadSession
+from analytics.jobs import (
+    enqueue_report, enqueue_upload, enqueue_upload_session, job_status, report_filename
+)
+from analytics import chunked_upload, columnar, record_storage, report_service, response_cache, retention
+from analytics.analytics_engine import AnalyticsEngine, DataValidationError
 from analytics.report_generator import ReportGenerator
 from .decorators import handle_api_errors
 
 
+def upload_source(uploaded_file):
+    """
+    Return something pandas can read an uploaded file from without copying it
+    
+    Large uploads are already spooled to a temporary file by Django, so the
+    parser reads that path directly; small ones are read from memory.
+    """
+    if hasattr(uploaded_file, 'temporary_file_path'):
+        return uploaded_file.temporary_file_path()
+    
+    uploaded_file.seek(0)
+    return uploaded_file.file
+
+
+def make_etag(*parts):
+    """Build a strong ETag from the values identifying a response"""
+    digest = hashlib.sha256(':'.join(str(part) for part in parts).encode('utf-8')).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def dataset_etag(dataset_id, meta, variant):
+    """ETag of a response built from one version of a dataset"""
+    return make_etag(
+        'dataset', dataset_id, meta['upload_timestamp'].isoformat(), meta['version'], variant
+    )
+
+
+def etag_matches(request, etag):
+    """Check an If-None-Match request header against an ETag"""
+    header = request.META.get('HTTP_IF_NONE_MATCH')
+    if not header:
+        return False
+    
+    # If-None-Match uses the weak comparison function
+    candidates = [tag[2:] if tag.startswith('W/') else tag for tag in parse_etags(header)]
+    return '*' in candidates or etag in candidates
+
+
+def with_validator(response, etag):
+    """Attach an ETag and ask clients to revalidate before reusing the response"""
+    response['ETag'] = etag
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def not_modified(etag):
+    """Empty 304 response confirming the client's copy is current"""
+    return with_validator(HttpResponseNotModified(), etag)
+
+
+def is_async_request(request):
+    """Check whether the client asked for background processing"""
+    flag = request.GET.get('async') or request.POST.get('async') or ''
+    if not flag and hasattr(request, 'data'):
+        # DRF requests may carry the flag in a JSON body
+        flag = str(request.data.get('async', ''))
+    return flag.lower() in ('1', 'true', 'yes')
+
+
+def is_full_listing_request(request):
+    """Check whether the client asked for a report listing every record"""
+    listing = request.GET.get('listing') or ''
+    if not listing and hasattr(request, 'data'):
+        listing = str(request.data.get('listing', ''))
+    return listing.lower() == 'full'
+
+
+# Equipment record fields that can be requested through ``fields=``
+RECORD_FIELDS = ('equipment_name', 'equipment_type', 'flowrate', 'pressure', 'temperature')
+
+# Largest page of equipment records served in one response
+MAX_RECORD_PAGE_SIZE = 10000
+
+# Shapes equipment records can be returned in: a list of objects, one list
+# per field, or the binary encoding of analytics.columnar
+RECORD_LAYOUTS = ('rows', 'columnar', 'binary')
+
+
+def encode_cursor(position):
+    """
+    Encode the ``(equipment_name, key)`` of the last record of a page as an
+    opaque ``next_cursor`` string
+    """
+    if position is None:
+        return None
+    packed = json.dumps(list(position), separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(packed).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """
+    Decode a cursor made by encode_cursor
+    
+    Returns:
+        Tuple of (equipment_name, key)
+    """
+    try:
+        name, key = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        if not isinstance(name, str) or not isinstance(key, int):
+            raise ValueError
+    except (ValueError, TypeError, binascii.Error):
+        raise ValueError('after must be a record cursor returned as next_cursor')
+    return name, key
+
+
+def parse_record_query(request):
+    """
+    Parse the record selection parameters of the analytics endpoint
+    
+    ``records=false`` omits equipment records, ``fields`` is a comma-separated
+    subset of RECORD_FIELDS, ``limit``/``after`` select a page of records
+    ordered by equipment name, starting after the record given as cursor,
+    and ``layout`` is one of RECORD_LAYOUTS.
+    
+    Returns:
+        Tuple of (include_records, fields, limit, after, layout); limit and
+        after are None when not given, after is a decoded cursor
+    """
+    layout = request.GET.get('layout', 'rows')
+    if layout not in RECORD_LAYOUTS:
+        raise ValueError(f"layout must be one of: {', '.join(RECORD_LAYOUTS)}")
+    
+    include_records = request.GET.get('records', 'true').lower() not in ('0', 'false', 'no')
+    
+    fields = RECORD_FIELDS
+    if request.GET.get('fields'):
+        fields = tuple(field.strip() for field in request.GET['fields'].split(',') if field.strip())
+        unknown = [field for field in fields if field not in RECORD_FIELDS]
+        if unknown or not fields:
+            raise ValueError(f"fields must be a subset of: {', '.join(RECORD_FIELDS)}")
+    
+    limit = None
+    if request.GET.get('limit'):
+        try:
+            limit = int(request.GET['limit'])
+        except ValueError:
+            raise ValueError('limit must be an integer')
+        if limit < 1 or limit > MAX_RECORD_PAGE_SIZE:
+            raise ValueError(f'limit must be between 1 and {MAX_RECORD_PAGE_SIZE}')
+    
+    after = None
+    if request.GET.get('after'):
+        after = decode_cursor(request.GET['after'])
+    
+    return include_records, fields, limit, after, layout
+
+
+def fetch_record_page(dataset, fields, limit=None, after=None):
+    """
+    Fetch one page of a dataset's equipment records using keyset pagination
+    
+    Records are ordered by equipment name, then id, as they always have
+    been, and the cursor is the ``(equipment_name, id)`` of the last record
+    of the previous page, so every page is a range scan of the
+    ``(dataset, equipment_name, id)`` index no matter how deep into the
+    dataset it is. Columnar datasets page in the same order, with record
+    positions in place of ids.
+    
+    Returns:
+        Tuple of (list of value tuples in ``fields`` order, next cursor or None)
+    """
+    if record_storage.is_columnar(dataset):
+        columns, next_position = record_storage.column_page(dataset, fields, limit, after)
+        return list(zip(*(columns[field] for field in fields))), encode_cursor(next_position)
+    
+    queryset = EquipmentRecord.objects.filter(dataset=dataset).order_by('equipment_name', 'id')
+    if after is not None:
+        name, record_id = after
+        # Written as a range plus an exclusion rather than an OR, so the
+        # database can start the index scan at the cursor
+        queryset = queryset.filter(equipment_name__gte=name).exclude(
+            equipment_name=name, id__lte=record_id
+        )
+    
+    rows = queryset.values_list('equipment_name', 'id', *fields)
+    if limit is not None:
+        # Fetch one extra row to learn whether another page follows
+        rows = list(rows[:limit + 1])
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+    else:
+        rows = list(rows)
+        has_more = False
+    
+    next_cursor = encode_cursor(rows[-1][:2]) if has_more else None
+    return [row[2:] for row in rows], next_cursor
+
+
+def fetch_record_columns(dataset, fields, limit=None, after=None):
+    """
+    Fetch one page of equipment records as one list per field
+    
+    Same pages and cursors as fetch_record_page; columnar datasets are
+    served from their stored columns without building rows.
+    
+    Returns:
+        Tuple of (dictionary of value lists keyed by field, next cursor or None)
+    """
+    if record_storage.is_columnar(dataset):
+        columns, next_position = record_storage.column_page(dataset, fields, limit, after)
+        return columns, encode_cursor(next_position)
+    
+    rows, next_cursor = fetch_record_page(dataset, fields, limit, after)
+    return columnar.rows_to_columns(rows, fields), next_cursor
+
+
 @csrf_exempt
 def upload_csv(request):
     """
@@ -46,30 +263,33 @@ def upload_csv(request):
     if not uploaded_file.name.endswith('.csv'):
         return JsonResponse({'error': 'File must be a CSV file'}, status=400)
     
-    # Validate file size (10MB limit)
+    # Validate file size (10MB limit); larger files use the chunked upload API
     if uploaded_file.size > 10 * 1024 * 1024:
-        return JsonResponse({'error': 'File size exceeds 10MB limit'}, status=400)
+        return JsonResponse({
+            'error': 'File size exceeds 10MB limit, use the chunked upload API (/api/uploads/) for larger files'
+        }, status=400)
     
-    try:
-        # Save file temporarily
-        file_path = default_storage.save(
-            f'temp/{uploaded_file.name}', 
-            ContentFile(uploaded_file.read())
-        )
-        full_path = default_storage.path(file_path)
+    # Queue the file for a background worker when asked to
+    if is_async_request(request):
+        job = enqueue_upload(request.user, uploaded_file)
         
-        # Process CSV using analytics engine
+        return JsonResponse({
+            'message': 'File accepted for background processing',
+            'job_id': str(job.id),
+            'status': job.status,
+            'status_url': reverse('get_job_status', args=[job.id])
+        }, status=202)
+    
+    try:
+        # Process CSV using analytics engine, reading the upload in place
         dataset, summary = AnalyticsEngine.process_csv(
-            full_path, 
+            upload_source(uploaded_file), 
             request.user, 
             uploaded_file.name
         )
         
-        # Clean up old datasets (keep only last 5)
-        AnalyticsEngine.cleanup_old_datasets(request.user, limit=5)
-        
-        # Clean up temporary file
-        default_storage.delete(file_path)
+        # Old datasets are removed by the retention sweeper, off the request path
+        retention.request_sweep(request.user.id)
         
         return JsonResponse({
             'message': 'File uploaded and processed successfully',
@@ -84,42 +304,406 @@ def upload_csv(request):
         }, status=201)
         
     except ValueError as e:
-        # Clean up temporary file if it exists
-        try:
-            if 'file_path' in locals():
-                default_storage.delete(file_path)
-        except:
-            pass
+        error_data = {'error': str(e)}
+        if isinstance(e, DataValidationError):
+            error_data['validation'] = e.report
         
-        return JsonResponse({'error': str(e)}, status=400)
+        return JsonResponse(error_data, status=400)
     except Exception as e:
-        # Clean up temporary file if it exists
-        try:
-            if 'file_path' in locals():
-                default_storage.delete(file_path)
-        except:
-            pass
+        return JsonResponse({'error': f'File processing error: {str(e)}'}, status=500)
+
+
+@csrf_exempt
+def append_csv(request, dataset_id):
+    """
+    Append rows from a CSV file to an existing dataset - using plain Django view
+    """
+    if request.method != 'POST':
+        return JsonResponse({'error': 'Method not allowed'}, status=405)
+    
+    # Check if user is authenticated
+    if not request.user.is_authenticated:
+        return JsonResponse({'error': 'Authentication required'}, status=401)
+    
+    try:
+        dataset = Dataset.objects.get(id=dataset_id, user=request.user)
+    except Dataset.DoesNotExist:
+        return JsonResponse({'error': 'Dataset not found'}, status=404)
+    
+    if 'file' not in request.FILES:
+        return JsonResponse({'error': 'No file provided'}, status=400)
+    
+    uploaded_file = request.FILES['file']
+    
+    # Validate file extension
+    if not uploaded_file.name.endswith('.csv'):
+        return JsonResponse({'error': 'File must be a CSV file'}, status=400)
+    
+    # Validate file size (10MB limit)
+    if uploaded_file.size > 10 * 1024 * 1024:
+        return JsonResponse({'error': 'File size exceeds 10MB limit'}, status=400)
+    
+    try:
+        previous_count = dataset.record_count
+        
+        # Append rows and update the summary incrementally
+        dataset, summary = AnalyticsEngine.append_csv(dataset, upload_source(uploaded_file))
         
+        return JsonResponse({
+            'message': 'Rows appended successfully',
+            'dataset_id': dataset.id,
+            'filename': dataset.filename,
+            'appended_count': dataset.record_count - previous_count,
+            'record_count': dataset.record_count,
+            'summary': {
+                'total_count': summary['total_count'],
+                'averages': summary['averages'],
+                'type_distribution': summary['type_distribution']
+            }
+        }, status=200)
+        
+    except ValueError as e:
+        error_data = {'error': str(e)}
+        if isinstance(e, DataValidationError):
+            error_data['validation'] = e.report
+        
+        return JsonResponse(error_data, status=400)
+    except Exception as e:
         return JsonResponse({'error': f'File processing error: {str(e)}'}, status=500)
 
 
+# Rows fetched per database round trip while streaming an export
+EXPORT_CHUNK_SIZE = 2000
+
+# Export formats and their content types
+EXPORT_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'json': 'application/json',
+    'csv': 'text/csv'
+}
+
+# CSV export header, matching the upload format so exports can be re-imported
+EXPORT_CSV_HEADER = ['Equipment Name', 'Type', 'Flowrate', 'Pressure', 'Temperature']
+
+
+def iter_record_batches(dataset, batch_size=EXPORT_CHUNK_SIZE):
+    """
+    Yield lists of equipment record value tuples, ``batch_size`` at a time
+    
+    Row datasets are read from a database cursor via ``iterator()``, so
+    neither model instances nor the full result set are ever held in
+    memory; columnar datasets decode one slice of each segment at a time.
+    """
+    return record_storage.iter_record_batches(dataset, RECORD_FIELDS, batch_size)
+
+
+def iter_export_chunks(dataset, export_format):
+    """
+    Yield a dataset's equipment records encoded in ``export_format``
+    
+    Each batch of rows is encoded into a single string so the response is
+    written in a few large pieces rather than one per record.
+    """
+    if export_format == 'csv':
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(EXPORT_CSV_HEADER)
+        for batch in iter_record_batches(dataset):
+            writer.writerows(batch)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        # Header only, for an empty dataset
+        if buffer.tell():
+            yield buffer.getvalue()
+        return
+    
+    separator = ',' if export_format == 'json' else '\n'
+    if export_format == 'json':
+        yield '['
+    
+    first = True
+    for batch in iter_record_batches(dataset):
+        chunk = separator.join(json.dumps(dict(zip(RECORD_FIELDS, row))) for row in batch)
+        if export_format == 'json':
+            yield chunk if first else separator + chunk
+        else:
+            yield chunk + '\n'
+        first = False
+    
+    if export_format == 'json':
+        yield ']'
+
+
+def export_dataset(request, dataset_id):
+    """
+    Stream all equipment records of a dataset - using plain Django view
+    
+    ``?format=`` selects ``ndjson`` (default), ``json`` or ``csv``. The
+    response is streamed, so the first bytes are sent straight away and
+    memory use stays flat regardless of dataset size.
+    """
+    if request.method != 'GET':
+        return JsonResponse({'error': 'Method not allowed'}, status=405)
+    
+    # Check if user is authenticated
+    if not request.user.is_authenticated:
+        return JsonResponse({'error': 'Authentication required'}, status=401)
+    
+    export_format = request.GET.get('format', 'ndjson')
+    if export_format not in EXPORT_FORMATS:
+        return JsonResponse({
+            'error': f"format must be one of: {', '.join(EXPORT_FORMATS)}"
+        }, status=400)
+    
+    try:
+        dataset = Dataset.objects.get(id=dataset_id, user=request.user)
+    except Dataset.DoesNotExist:
+        return JsonResponse({'error': 'Dataset not found'}, status=404)
+    
+    response = StreamingHttpResponse(
+        iter_export_chunks(dataset, export_format),
+        content_type=EXPORT_FORMATS[export_format]
+    )
+    name = os.path.splitext(dataset.filename)[0]
+    response['Content-Disposition'] = f'attachment; filename="{name}_{dataset.id}.{export_format}"'
+    return response
+
+
+def get_upload_session(request, upload_id):
+    """Return the caller's upload session, or None if it does not exist"""
+    try:
+        return UploadSession.objects.get(id=upload_id, user=request.user)
+    except UploadSession.DoesNotExist:
+        return None
+
+
+@csrf_exempt
+def create_upload(request):
+    """
+    Start a resumable chunked upload - using plain Django view
+    
+    Expects JSON with ``filename``, ``size`` and optionally ``part_size``.
+    """
+    if request.method != 'POST':
+        return JsonResponse({'error': 'Method not allowed'}, status=405)
+    
+    # Check if user is authenticated
+    if not request.user.is_authenticated:
+        return JsonResponse({'error': 'Authentication required'}, status=401)
+    
+    try:
+        data = json.loads(request.body or b'{}')
+        upload_session = chunked_upload.create_session(
+            request.user,
+            str(data.get('filename', '')),
+            int(data.get('size', -1)),
+            int(data['part_size']) if data.get('part_size') else None
+        )
+    except (TypeError, ValueError) as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    
+    return JsonResponse(chunked_upload.session_status(upload_session), status=201)
+
+
+@csrf_exempt
+def upload_status(request, upload_id):
+    """
+    Report received parts of an upload so the client can resume it, or abort it
+    """
+    if request.method not in ('GET', 'DELETE'):
+        return JsonResponse({'error': 'Method not allowed'}, status=405)
+    
+    # Check if user is authenticated
+    if not request.user.is_authenticated:
+        return JsonResponse({'error': 'Authentication required'}, status=401)
+    
+    upload_session = get_upload_session(request, upload_id)
+    if upload_session is None:
+        return JsonResponse({'error': 'Upload not found'}, status=404)
+    
+    if request.method == 'DELETE':
+        if upload_session.status != UploadSession.STATUS_RECEIVING:
+            return JsonResponse({'error': 'Upload is already being processed'}, status=409)
+        chunked_upload.discard_session(upload_session)
+        return JsonResponse({'message': 'Upload cancelled'}, status=200)
+    
+    return JsonResponse(chunked_upload.session_status(upload_session), status=200)
+
+
+@csrf_exempt
+def upload_part(request, upload_id, part_number):
+    """
+    Store one part of a chunked upload from the raw request body
+    
+    An ``X-Content-SHA256`` header, when present, must match the body.
+    """
+    if request.method != 'PUT':
+        return JsonResponse({'error': 'Method not allowed'}, status=405)
+    
+    # Check if user is authenticated
+    if not request.user.is_authenticated:
+        return JsonResponse({'error': 'Authentication required'}, status=401)
+    
+    upload_session = get_upload_session(request, upload_id)
+    if upload_session is None:
+        return JsonResponse({'error': 'Upload not found'}, status=404)
+    
+    try:
+        # Read the body as a stream; request.body would buffer it in memory
+        part = chunked_upload.store_part(
+            upload_session,
+            part_number,
+            request,
+            request.headers.get('X-Content-SHA256')
+        )
+    except chunked_upload.UploadError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    
+    return JsonResponse({
+        'number': part.number,
+        'size': part.size,
+        'checksum': part.checksum
+    }, status=200)
+
+
+@csrf_exempt
+def complete_upload(request, upload_id):
+    """
+    Finish a chunked upload and queue its parts for ingestion
+    
+    The parts are streamed by a background worker rather than copied inside
+    the request; clients poll the returned ``status_url`` until the job
+    ends. Completing an upload again returns the job already queued for it.
+    """
+    if request.method != 'POST':
+        return JsonResponse({'error': 'Method not allowed'}, status=405)
+    
+    # Check if user is authenticated
+    if not request.user.is_authenticated:
+        return JsonResponse({'error': 'Authentication required'}, status=401)
+    
+    upload_session = get_upload_session(request, upload_id)
+    if upload_session is None:
+        return JsonResponse({'error': 'Upload not found'}, status=404)
+    
+    try:
+        chunked_upload.check_complete(upload_session)
+    except chunked_upload.UploadError as e:
+        return JsonResponse({'error': str(e)}, status=409)
+    
+    # The session is flipped and its job created together, so a concurrent
+    # completion either wins the flip or finds the job
+    with transaction.atomic():
+        if chunked_upload.mark_completed(upload_session):
+            job = enqueue_upload_session(request.user, upload_session)
+        else:
+            job = ProcessingJob.objects.filter(upload=upload_session).first()
+            if job is None:
+                return JsonResponse({'error': 'Upload is already being processed'}, status=409)
+    
+    return JsonResponse({
+        'message': 'File accepted for background processing',
+        'job_id': str(job.id),
+        'status': job.status,
+        'status_url': reverse('get_job_status', args=[job.id])
+    }, status=202)
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 @handle_api_errors
 def get_analytics(request, dataset_id):
     """
     Get analytics summary for a specific dataset
+    
+    Query parameters:
+        records: ``false`` to return the summary without equipment records
+        fields: Comma-separated equipment record fields to include
+        limit: Maximum number of equipment records to return
+        after: Cursor (``next_cursor`` of the previous page) to continue from
+        layout: ``rows`` (default), ``columnar`` for one array per field, or
+            ``binary`` for the records alone in the analytics.columnar encoding
     """
     try:
-        dataset = Dataset.objects.get(id=dataset_id, user=request.user)
-    except Dataset.DoesNotExist:
+        include_records, fields, limit, after, layout = parse_record_query(request)
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    
+    meta = response_cache.dataset_meta(dataset_id)
+    if meta is None or meta['user_id'] != request.user.id:
+        return Response(
+            {'error': 'Dataset not found'}, 
+            status=status.HTTP_404_NOT_FOUND
+        )
+    
+    variant = f"analytics:{layout}:{int(include_records)}:{','.join(fields)}:{limit}:{encode_cursor(after)}"
+    etag = dataset_etag(dataset_id, meta, variant)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    
+    content, cached = response_cache.get_or_build(
+        response_cache.dataset_key(dataset_id, meta['version'], variant),
+        lambda: build_analytics(dataset_id, include_records, fields, limit, after, layout)
+    )
+    
+    if layout == 'binary':
+        response = HttpResponse(content, content_type=columnar.CONTENT_TYPE)
+    else:
+        response = Response(content, status=status.HTTP_200_OK)
+    response['X-Cache'] = 'HIT' if cached else 'MISS'
+    return with_validator(response, etag)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+@handle_api_errors
+def get_type_statistics(request, dataset_id):
+    """
+    Get per equipment type count, mean, min, max and std of each parameter
+    
+    Aggregated in the database and cached per dataset version.
+    """
+    meta = response_cache.dataset_meta(dataset_id)
+    if meta is None or meta['user_id'] != request.user.id:
         return Response(
             {'error': 'Dataset not found'}, 
             status=status.HTTP_404_NOT_FOUND
         )
     
-    # Get equipment records for this dataset
-    equipment_records = EquipmentRecord.objects.filter(dataset=dataset)
+    etag = dataset_etag(dataset_id, meta, 'types')
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    
+    content, cached = response_cache.get_or_build(
+        response_cache.dataset_key(dataset_id, meta['version'], 'types'),
+        lambda: {
+            'dataset_id': dataset_id,
+            'types': AnalyticsEngine.type_statistics(Dataset.objects.get(id=dataset_id))
+        }
+    )
+    
+    response = Response(content, status=status.HTTP_200_OK)
+    response['X-Cache'] = 'HIT' if cached else 'MISS'
+    return with_validator(response, etag)
+
+
+def build_analytics(dataset_id, include_records, fields, limit, after, layout):
+    """
+    Build the get_analytics response content
+    
+    Returns:
+        Response data, or the encoded payload for the binary layout
+    """
+    dataset = Dataset.objects.get(id=dataset_id)
+    
+    # The binary layout carries only the records; the summary stays JSON
+    if layout == 'binary':
+        columns, next_cursor = fetch_record_columns(dataset, fields, limit, after)
+        return columnar.encode_columns(
+            columns,
+            {'dataset_id': dataset.id, 'next_cursor': next_cursor}
+        )
     
     # Prepare response data
     response_data = {
@@ -137,20 +721,52 @@ def get_analytics(request, dataset_id):
             'filename': dataset.filename,
             'upload_time': dataset.upload_timestamp.isoformat(),
             'record_count': dataset.record_count
-        },
-        'equipment_records': [
-            {
-                'equipment_name': record.equipment_name,
-                'equipment_type': record.equipment_type,
-                'flowrate': record.flowrate,
-                'pressure': record.pressure,
-                'temperature': record.temperature
-            }
-            for record in equipment_records
-        ]
+        }
     }
     
-    return Response(response_data, status=status.HTTP_200_OK)
+    if include_records:
+        if layout == 'columnar':
+            columns, next_cursor = fetch_record_columns(dataset, fields, limit, after)
+            response_data['equipment_records'] = columns
+        else:
+            rows, next_cursor = fetch_record_page(dataset, fields, limit, after)
+            response_data['equipment_records'] = [dict(zip(fields, row)) for row in rows]
+        response_data['pagination'] = {
+            'limit': limit,
+            'after': encode_cursor(after),
+            'next_cursor': next_cursor,
+            'has_more': next_cursor is not None
+        }
+    
+    return response_data
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+@handle_api_errors
+def get_job_status(request, job_id):
+    """
+    Get state, progress and result of a background processing job
+    """
+    try:
+        job = ProcessingJob.objects.select_related('dataset').get(id=job_id, user=request.user)
+    except ProcessingJob.DoesNotExist:
+        return Response(
+            {'error': 'Job not found'}, 
+            status=status.HTTP_404_NOT_FOUND
+        )
+    
+    return Response(job_status(job), status=status.HTTP_200_OK)
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+@handle_api_errors
+def get_cache_stats(request):
+    """
+    Get hit and miss counters of the response cache in this server process
+    """
+    return Response(response_cache.stats(), status=status.HTTP_200_OK)
 
 
 @api_view(['GET'])
@@ -160,29 +776,57 @@ def get_dataset_list(request):
     """
     Get list of all datasets for the current user
     """
-    datasets = Dataset.objects.filter(user=request.user).order_by('-upload_timestamp')
+    (content, etag), cached = response_cache.get_or_build(
+        response_cache.user_key(request.user.id, 'datasets'),
+        lambda: build_dataset_list(request.user)
+    )
+    if etag_matches(request, etag):
+        return not_modified(etag)
     
-    dataset_list = [
-        {
-            'id': dataset.id,
-            'filename': dataset.filename,
-            'upload_time': dataset.upload_timestamp.isoformat(),
-            'record_count': dataset.record_count,
-            'summary': {
-                'total_count': dataset.record_count,
-                'avg_flowrate': dataset.avg_flowrate,
-                'avg_pressure': dataset.avg_pressure,
-                'avg_temperature': dataset.avg_temperature,
-                'type_distribution': dataset.type_distribution
-            }
+    response = Response(content, status=status.HTTP_200_OK)
+    response['X-Cache'] = 'HIT' if cached else 'MISS'
+    return with_validator(response, etag)
+
+
+def serialize_dataset(dataset):
+    """Dataset entry of the dataset list and history responses"""
+    return {
+        'id': dataset.id,
+        'filename': dataset.filename,
+        'upload_time': dataset.upload_timestamp.isoformat(),
+        'record_count': dataset.record_count,
+        'summary': {
+            'total_count': dataset.record_count,
+            'avg_flowrate': dataset.avg_flowrate,
+            'avg_pressure': dataset.avg_pressure,
+            'avg_temperature': dataset.avg_temperature,
+            'type_distribution': dataset.type_distribution
         }
+    }
+
+
+def datasets_etag(name, datasets):
+    """ETag of a response listing the given datasets"""
+    return make_etag(name, *(
+        f'{dataset.id}@{dataset.upload_timestamp.isoformat()}v{dataset.version}'
         for dataset in datasets
-    ]
+    ))
+
+
+def build_dataset_list(user):
+    """
+    Build the get_dataset_list response data
     
-    return Response({
+    Returns:
+        Tuple of (response data, ETag)
+    """
+    datasets = list(Dataset.objects.filter(user=user).order_by('-upload_timestamp'))
+    dataset_list = [serialize_dataset(dataset) for dataset in datasets]
+    
+    return {
         'datasets': dataset_list,
         'total_datasets': len(dataset_list)
-    }, status=status.HTTP_200_OK)
+    }, datasets_etag('datasets', datasets)
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
@@ -191,29 +835,32 @@ def get_history(request):
     """
     Get history of last 5 uploaded datasets with summaries
     """
-    datasets = Dataset.objects.filter(user=request.user).order_by('-upload_timestamp')[:5]
+    (content, etag), cached = response_cache.get_or_build(
+        response_cache.user_key(request.user.id, 'history'),
+        lambda: build_history(request.user)
+    )
+    if etag_matches(request, etag):
+        return not_modified(etag)
     
-    history_data = [
-        {
-            'id': dataset.id,
-            'filename': dataset.filename,
-            'upload_time': dataset.upload_timestamp.isoformat(),
-            'record_count': dataset.record_count,
-            'summary': {
-                'total_count': dataset.record_count,
-                'avg_flowrate': dataset.avg_flowrate,
-                'avg_pressure': dataset.avg_pressure,
-                'avg_temperature': dataset.avg_temperature,
-                'type_distribution': dataset.type_distribution
-            }
-        }
-        for dataset in datasets
-    ]
+    response = Response(content, status=status.HTTP_200_OK)
+    response['X-Cache'] = 'HIT' if cached else 'MISS'
+    return with_validator(response, etag)
+
+
+def build_history(user):
+    """
+    Build the get_history response data
     
-    return Response({
+    Returns:
+        Tuple of (response data, ETag)
+    """
+    datasets = list(Dataset.objects.filter(user=user).order_by('-upload_timestamp')[:5])
+    history_data = [serialize_dataset(dataset) for dataset in datasets]
+    
+    return {
         'datasets': history_data,
         'total_in_history': len(history_data)
-    }, status=status.HTTP_200_OK)
+    }, datasets_etag('history', datasets)
 
 
 @api_view(['DELETE'])
@@ -241,14 +888,28 @@ from django.http import HttpResponse
 from analytics.report_generator import ReportGenerator
 
 
+def report_response(dataset, full_listing=False):
+    """Stream the dataset's stored PDF report from disk, rendering it in the report pool if needed"""
+    return FileResponse(
+        open(report_service.get_report(dataset, full_listing), 'rb'),
+        as_attachment=True,
+        filename=report_filename(dataset, full_listing),
+        content_type='application/pdf'
+    )
+
+
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 @handle_api_errors
 def generate_report(request):
     """
     Generate PDF report for a dataset
+    
+    ``listing=full`` asks for the detailed report listing every equipment
+    record instead of the summary.
     """
     dataset_id = request.data.get('dataset_id')
+    full_listing = is_full_listing_request(request)
     
     if not dataset_id:
         return Response(
@@ -260,16 +921,13 @@ def generate_report(request):
         # Check if dataset exists and belongs to user
         dataset = Dataset.objects.get(id=dataset_id, user=request.user)
         
-        # Generate report
-        report_generator = ReportGenerator()
-        report_buffer = report_generator.generate_report_buffer(dataset_id)
+        # Render in the background when asked to and poll the job instead
+        if is_async_request(request):
+            job = enqueue_report(request.user, dataset, full_listing)
+            return Response(report_job_data(job), status=status.HTTP_202_ACCEPTED)
         
-        # Create HTTP response with PDF
-        response = HttpResponse(
-            report_buffer.getvalue(),
-            content_type='application/pdf'
-        )
-        response['Content-Disposition'] = f'attachment; filename="equipment_report_{dataset.filename}_{dataset.id}.pdf"'
+        # Serve the stored report, rendering it on first request
+        response = report_response(dataset, full_listing)
         
         return response
         
@@ -285,29 +943,107 @@ def generate_report(request):
         )
 
 
+# Most datasets a single bulk report request may name
+MAX_BULK_REPORTS = 50
+
+
+def report_job_data(job):
+    """Response entry describing a queued report job"""
+    return {
+        'dataset_id': job.dataset_id,
+        'job_id': str(job.id),
+        'status': job.status,
+        'status_url': reverse('get_job_status', args=[job.id])
+    }
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+@handle_api_errors
+def generate_reports_bulk(request):
+    """
+    Queue PDF report rendering for several datasets at once
+    
+    Expects ``dataset_ids``, a list of the user's dataset ids, and optionally
+    ``listing=full`` for reports listing every record. The reports are
+    rendered in parallel by the report process pool; each job can be polled
+    at its status URL, which links to the report once it is ready.
+    """
+    dataset_ids = request.data.get('dataset_ids')
+    
+    if not isinstance(dataset_ids, list) or not dataset_ids:
+        return Response(
+            {'error': 'dataset_ids must be a non-empty list'}, 
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    if len(dataset_ids) > MAX_BULK_REPORTS:
+        return Response(
+            {'error': f'At most {MAX_BULK_REPORTS} datasets can be requested at once'}, 
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    try:
+        dataset_ids = list(dict.fromkeys(int(dataset_id) for dataset_id in dataset_ids))
+    except (TypeError, ValueError):
+        return Response(
+            {'error': 'dataset_ids must contain integers'}, 
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    datasets = Dataset.objects.filter(id__in=dataset_ids, user=request.user).in_bulk()
+    missing = [dataset_id for dataset_id in dataset_ids if dataset_id not in datasets]
+    if missing:
+        return Response(
+            {'error': 'Dataset not found', 'missing_dataset_ids': missing}, 
+            status=status.HTTP_404_NOT_FOUND
+        )
+    
+    full_listing = is_full_listing_request(request)
+    
+    # Submit to the pool only once every job row is committed
+    with transaction.atomic():
+        jobs = [
+            enqueue_report(request.user, datasets[dataset_id], full_listing)
+            for dataset_id in dataset_ids
+        ]
+    
+    return Response({
+        'message': f'{len(jobs)} report(s) queued for rendering',
+        'jobs': [report_job_data(job) for job in jobs]
+    }, status=status.HTTP_202_ACCEPTED)
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 @handle_api_errors
 def download_report(request, dataset_id):
     """
     Download PDF report for a dataset
+    
+    ``?listing=full`` downloads the detailed report listing every record.
     """
+    full_listing = is_full_listing_request(request)
+    meta = response_cache.dataset_meta(dataset_id)
+    if meta is None or meta['user_id'] != request.user.id:
+        return Response(
+            {'error': 'Dataset not found'}, 
+            status=status.HTTP_404_NOT_FOUND
+        )
+    
+    variant = 'report-full' if full_listing else 'report'
+    etag = dataset_etag(dataset_id, meta, f'{variant}:t{ReportGenerator.TEMPLATE_VERSION}')
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    
     try:
         # Check if dataset exists and belongs to user
         dataset = Dataset.objects.get(id=dataset_id, user=request.user)
         
-        # Generate report
-        report_generator = ReportGenerator()
-        report_buffer = report_generator.generate_report_buffer(dataset_id)
+        # Serve the stored report, rendering it on first request
+        response = report_response(dataset, full_listing)
         
-        # Create HTTP response with PDF
-        response = HttpResponse(
-            report_buffer.getvalue(),
-            content_type='application/pdf'
-        )
-        response['Content-Disposition'] = f'attachment; filename="equipment_report_{dataset.filename}_{dataset.id}.pdf"'
-        
-        return response
+        return with_validator(response, etag)
         
     except Dataset.DoesNotExist:
         return Response(
@@ -351,8 +1087,8 @@ def load_sample_data(request):
             'sample_equipment_data.csv'
         )
         
-        # Clean up old datasets (keep only last 5)
-        AnalyticsEngine.cleanup_old_datasets(request.user, limit=5)
+        # Old datasets are removed by the retention sweeper, off the request path
+        retention.request_sweep(request.user.id)
         
         return JsonResponse({
             'message': 'Sample data loaded successfully',
@@ -386,8 +1122,7 @@ def get_sample_info(request):
             )
         
         # Read sample data to get basic info
-        import pandas as pd
-        df = pd.read_csv(sample_file_path)
+        df = AnalyticsEngine.read_csv(sample_file_path)
         
         # Basic statistics
         equipment_types = df['Type'].value_counts().to_dict()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+"""
+Benchmark CSV ingestion paths of the analytics engine
+
+Compares the original iterrows() record construction with the columnar
+record builder used by AnalyticsEngine.process_csv, and an untyped
+pd.read_csv() call with the declared ingestion schema.
+
+Usage:
+    python benchmark_ingestion.py [rows ...]
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import django
+
+# Setup Django environment
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'chemical_equipment_visualizer.settings')
+django.setup()
+
+import numpy as np
+import pandas as pd
+from analytics.models import Dataset, EquipmentRecord
+from analytics.analytics_engine import AnalyticsEngine
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+EQUIPMENT_TYPES = ['Pump', 'Valve', 'Reactor', 'Heat Exchanger', 'Compressor', 'Tank']
+
+
+def make_frame(rows):
+    """Build a cleaned equipment DataFrame with the given number of rows"""
+    rng = np.random.default_rng(42)
+    return pd.DataFrame({
+        'Equipment Name': [f'EQ-{i:07d}' for i in range(rows)],
+        'Type': rng.choice(EQUIPMENT_TYPES, size=rows),
+        'Flowrate': rng.uniform(0, 200, size=rows),
+        'Pressure': rng.uniform(0, 50, size=rows),
+        'Temperature': rng.uniform(250, 450, size=rows),
+    })
+
+
+def write_csv(rows, path):
+    """Write an equipment CSV with a few extra columns a real export carries"""
+    df = make_frame(rows)
+    df['Location'] = 'Unit 4 / Bay 12'
+    df['Notes'] = 'Inspected during last turnaround'
+    df['Tag'] = df['Equipment Name'].str.replace('EQ', 'TAG')
+    df.to_csv(path, index=False)
+
+
+def build_records_iterrows(dataset, df):
+    """Original per-row record construction, kept for comparison"""
+    equipment_records = []
+    for _, row in df.iterrows():
+        equipment_records.append(
+            EquipmentRecord(
+                dataset=dataset,
+                equipment_name=str(row['Equipment Name']),
+                equipment_type=str(row['Type']),
+                flowrate=float(row['Flowrate']),
+                pressure=float(row['Pressure']),
+                temperature=float(row['Temperature'])
+            )
+        )
+    return equipment_records
+
+
+def time_call(func, *args):
+    """Return wall time in seconds for a single call"""
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def measure_call(func, *args):
+    """Return wall time in seconds and peak traced memory in MB for one call"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return elapsed, peak / (1024 * 1024)
+
+
+def run_parse_benchmark(sizes):
+    """Time and measure the untyped and schema-driven CSV reads"""
+    print(f"{'rows':>10} {'read_csv (s)':>13} {'peak MB':>9} {'schema (s)':>11} {'peak MB':>9}")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for rows in sizes:
+            path = os.path.join(tmp_dir, f'equipment_{rows}.csv')
+            write_csv(rows, path)
+            plain_time, plain_peak = measure_call(pd.read_csv, path)
+            schema_time, schema_peak = measure_call(AnalyticsEngine.read_csv, path)
+            print(f"{rows:>10} {plain_time:>13.3f} {plain_peak:>9.1f} "
+                  f"{schema_time:>11.3f} {schema_peak:>9.1f}")
+
+
+def run_benchmark(sizes):
+    """Time both record builders for each dataset size"""
+    # Unsaved dataset; records are only built, never inserted
+    dataset = Dataset(id=1, filename='benchmark.csv', record_count=0)
+    
+    print(f"{'rows':>10} {'iterrows (s)':>14} {'columnar (s)':>14} {'speedup':>9}")
+    for rows in sizes:
+        df = make_frame(rows)
+        legacy = time_call(build_records_iterrows, dataset, df)
+        columnar = time_call(AnalyticsEngine.build_records, dataset, df)
+        print(f"{rows:>10} {legacy:>14.3f} {columnar:>14.3f} {legacy / columnar:>8.1f}x")
+
+
+if __name__ == '__main__':
+    sizes = [int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES
+    run_benchmark(sizes)
+    print()
+    run_parse_benchmark(sizes)
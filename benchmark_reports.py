@@ -0,0 +1,284 @@
+#!/usr/bin/env python
+"""
+Benchmark PDF report rendering
+
+Compares the baseline generator, which built its styles and pie chart for
+every report, rendered into a BytesIO buffer and copied it out with
+getvalue(), with the current shared builder writing straight into a file.
+The current path is measured in its steady state: styles and charts are
+cached after the warm-up render, as they are in a running server.
+
+Runs against a throwaway dataset created inside a transaction that is
+rolled back afterwards.
+
+Usage:
+    python benchmark_reports.py [renders]
+"""
+import io
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+import django
+from reportlab.lib import colors
+from reportlab.lib.colors import HexColor
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import inch
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+from reportlab.graphics.shapes import Drawing
+from reportlab.graphics.charts.piecharts import Pie
+
+# Setup Django environment
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'chemical_equipment_visualizer.settings')
+django.setup()
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from analytics.models import Dataset, EquipmentRecord
+from analytics.report_generator import ReportGenerator
+
+DEFAULT_RENDERS = 20
+EQUIPMENT_TYPES = ['Pump', 'Valve', 'Reactor', 'Heat Exchanger', 'Compressor', 'Tank']
+
+
+def create_dataset(rows=100):
+    """Create a dataset with the given number of records"""
+    user = User.objects.create_user(username='report-benchmark')
+    dataset = Dataset.objects.create(
+        user=user,
+        filename='benchmark.csv',
+        record_count=rows,
+        avg_flowrate=120.5,
+        avg_pressure=6.2,
+        avg_temperature=110.4,
+        type_distribution={
+            equipment_type: rows // len(EQUIPMENT_TYPES) for equipment_type in EQUIPMENT_TYPES
+        }
+    )
+    EquipmentRecord.objects.bulk_create([
+        EquipmentRecord(
+            dataset=dataset,
+            equipment_name=f'EQ-{i:05d}',
+            equipment_type=EQUIPMENT_TYPES[i % len(EQUIPMENT_TYPES)],
+            flowrate=100 + i % 50,
+            pressure=5 + i % 3,
+            temperature=100 + i % 20
+        )
+        for i in range(rows)
+    ])
+    return dataset
+
+
+class BaselineReportGenerator:
+    """
+    Report generator as it was before the shared builder, kept for comparison
+    
+    Only the in-memory path is kept: styles built per instance, the pie
+    chart drawn per report, and the PDF rendered into a BytesIO buffer.
+    """
+    
+    def __init__(self):
+        self.styles = getSampleStyleSheet()
+        self.title_style = ParagraphStyle(
+            'CustomTitle',
+            parent=self.styles['Heading1'],
+            fontSize=18,
+            spaceAfter=30,
+            textColor=colors.darkblue,
+            alignment=1  # Center alignment
+        )
+        self.heading_style = ParagraphStyle(
+            'CustomHeading',
+            parent=self.styles['Heading2'],
+            fontSize=14,
+            spaceAfter=12,
+            textColor=colors.darkblue
+        )
+    
+    def create_pie_chart(self, data_dict, title, width=400, height=300):
+        """Create a pie chart for equipment type distribution"""
+        drawing = Drawing(width, height)
+        
+        pie = Pie()
+        pie.x = 50
+        pie.y = 50
+        pie.width = width - 100
+        pie.height = height - 100
+        
+        # Prepare data
+        labels = list(data_dict.keys())
+        values = list(data_dict.values())
+        
+        pie.data = values
+        pie.labels = labels
+        
+        # Color scheme
+        colors_list = [
+            HexColor('#FF6B6B'), HexColor('#4ECDC4'), HexColor('#45B7D1'),
+            HexColor('#96CEB4'), HexColor('#FFEAA7'), HexColor('#DDA0DD'),
+            HexColor('#98D8C8'), HexColor('#F7DC6F')
+        ]
+        
+        for i, color in enumerate(colors_list[:len(values)]):
+            pie.slices[i].fillColor = color
+        
+        drawing.add(pie)
+        return drawing
+    
+    def generate_report_buffer(self, dataset_id):
+        """
+        Generate PDF report and return as BytesIO buffer for HTTP response
+        
+        Args:
+            dataset_id: ID of the dataset to generate report for
+            
+        Returns:
+            BytesIO buffer containing the PDF data
+        """
+        buffer = io.BytesIO()
+        
+        try:
+            dataset = Dataset.objects.get(id=dataset_id)
+            equipment_records = EquipmentRecord.objects.filter(dataset=dataset)
+            
+            # Create PDF document in memory
+            doc = SimpleDocTemplate(buffer, pagesize=A4)
+            story = []
+            
+            # Title
+            title = Paragraph(
+                f"Chemical Equipment Analysis Report<br/>{dataset.filename}",
+                self.title_style
+            )
+            story.append(title)
+            story.append(Spacer(1, 20))
+            
+            # Report metadata
+            metadata_data = [
+                ['Report Generated:', datetime.now().strftime("%Y-%m-%d %H:%M:%S")],
+                ['Dataset File:', dataset.filename],
+                ['Upload Date:', dataset.upload_timestamp.strftime("%Y-%m-%d %H:%M:%S")],
+                ['Total Equipment Count:', str(dataset.record_count)],
+                ['User:', dataset.user.username]
+            ]
+            
+            metadata_table = Table(metadata_data, colWidths=[2*inch, 3*inch])
+            metadata_table.setStyle(TableStyle([
+                ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
+                ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
+                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+                ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
+                ('FONTSIZE', (0, 0), (-1, -1), 10),
+                ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
+                ('BACKGROUND', (1, 0), (1, -1), colors.beige),
+                ('GRID', (0, 0), (-1, -1), 1, colors.black)
+            ]))
+            
+            story.append(metadata_table)
+            story.append(Spacer(1, 30))
+            
+            # Summary Statistics
+            story.append(Paragraph("Summary Statistics", self.heading_style))
+            
+            summary_data = [
+                ['Parameter', 'Average Value', 'Unit'],
+                ['Flowrate', f"{dataset.avg_flowrate:.2f}", 'L/min'],
+                ['Pressure', f"{dataset.avg_pressure:.2f}", 'bar'],
+                ['Temperature', f"{dataset.avg_temperature:.2f}", 'K']
+            ]
+            
+            summary_table = Table(summary_data, colWidths=[2*inch, 1.5*inch, 1*inch])
+            summary_table.setStyle(TableStyle([
+                ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+                ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+                ('FONTSIZE', (0, 0), (-1, -1), 10),
+                ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
+                ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+                ('GRID', (0, 0), (-1, -1), 1, colors.black)
+            ]))
+            
+            story.append(summary_table)
+            story.append(Spacer(1, 30))
+            
+            # Equipment Type Distribution
+            story.append(Paragraph("Equipment Type Distribution", self.heading_style))
+            
+            # Create pie chart
+            pie_chart = self.create_pie_chart(
+                dataset.type_distribution,
+                "Equipment Type Distribution"
+            )
+            story.append(pie_chart)
+            story.append(Spacer(1, 20))
+            
+            # Build PDF
+            doc.build(story)
+            
+            # Reset buffer position
+            buffer.seek(0)
+            return buffer
+            
+        except Dataset.DoesNotExist:
+            raise ValueError(f"Dataset with ID {dataset_id} not found")
+        except Exception as e:
+            raise Exception(f"Error generating PDF report: {str(e)}")
+
+
+def render_baseline(dataset_id, renders):
+    """Baseline path: fresh styles and chart, memory buffer, then a copy of its bytes"""
+    for _ in range(renders):
+        report_bytes = BaselineReportGenerator().generate_report_buffer(dataset_id).getvalue()
+        del report_bytes
+
+
+def render_current(dataset_id, renders, path):
+    """Current shared builder writing straight into a file"""
+    for _ in range(renders):
+        with open(path, 'wb') as sink:
+            ReportGenerator().write_report(dataset_id, sink)
+
+
+def measure_call(func, *args):
+    """Return wall time in seconds and peak traced memory in MB for one call"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    func(*args)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / (1024 * 1024)
+
+
+def run_benchmark(renders):
+    """Time and measure both rendering paths"""
+    with transaction.atomic():
+        dataset = create_dataset()
+        
+        # Warm up imports and fonts so neither path pays for them, and the
+        # current path's style and chart caches
+        BaselineReportGenerator().generate_report_buffer(dataset.id)
+        ReportGenerator().generate_report_buffer(dataset.id)
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'report.pdf')
+            baseline_time, baseline_peak = measure_call(render_baseline, dataset.id, renders)
+            current_time, current_peak = measure_call(render_current, dataset.id, renders, path)
+            report_size = os.path.getsize(path) / 1024
+        
+        transaction.set_rollback(True)
+    
+    print(f"{renders} renders, {report_size:.1f} KB report")
+    print(f"{'path':>10} {'total (s)':>10} {'per report (ms)':>16} {'peak MB':>9}")
+    for name, elapsed, peak in [('baseline', baseline_time, baseline_peak), ('current', current_time, current_peak)]:
+        print(f"{name:>10} {elapsed:>10.3f} {elapsed / renders * 1000:>16.1f} {peak:>9.2f}")
+
+
+if __name__ == '__main__':
+    renders = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_RENDERS
+    run_benchmark(renders)
@@ -210,7 +210,7 @@ CORS_ALLOW_ALL_ORIGINS = os.environ.get('CORS_ALLOW_ALL_ORIGINS', 'False').lower
 
 CORS_ALLOW_CREDENTIALS = True
 
-CORS_ALLOWED_HEADERS = [
+CORS_ALLOW_HEADERS = [
     'accept',
     'accept-encoding',
     'authorization',
@@ -220,6 +220,14 @@ CORS_ALLOWED_HEADERS = [
     'user-agent',
     'x-csrftoken',
     'x-requested-with',
+    'x-content-sha256',
+    'if-none-match',
+]
+
+# Response headers readable by browser clients
+CORS_EXPOSE_HEADERS = [
+    'etag',
+    'x-cache',
 ]
 
 CORS_ALLOW_METHODS = [
@@ -237,6 +245,84 @@ CORS_ALLOW_CREDENTIALS = True
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Background processing jobs
+# Whether this process starts the report pool, job workers and retention
+# sweeper at startup: 'auto' (web server processes only), 'on' or 'off'
+BACKGROUND_SERVICES = os.environ.get('BACKGROUND_SERVICES', 'auto')
+# Number of worker threads draining the database-backed job queue
+JOB_WORKERS = int(os.environ.get('JOB_WORKERS', '2'))
+# Seconds a running job may go without a heartbeat before it is considered
+# abandoned by a crashed worker and re-queued. Ingestion jobs send heartbeats
+# with their progress; on SQLite they touch a lease file instead
+JOB_LEASE_TIMEOUT = int(os.environ.get('JOB_LEASE_TIMEOUT', '900'))
+# Claims of a job before it is failed instead of re-queued
+JOB_MAX_ATTEMPTS = int(os.environ.get('JOB_MAX_ATTEMPTS', '3'))
+# Minimum seconds between progress writes of a running ingestion job
+JOB_PROGRESS_INTERVAL = float(os.environ.get('JOB_PROGRESS_INTERVAL', '1.0'))
+# Worker processes rendering PDF reports (analytics/report_service.py), one
+# per core by default so bulk reports render in parallel. Each server process
+# starts its own pool, and every pool process loads Django, ReportLab and
+# matplotlib, so REPORT_WORKERS_MAX caps the default on large hosts (unset:
+# no cap); REPORT_WORKERS sets the count outright
+REPORT_WORKERS_MAX = int(os.environ.get('REPORT_WORKERS_MAX', '0')) or None
+REPORT_WORKERS = int(os.environ.get('REPORT_WORKERS', '0')) or os.cpu_count() or 1
+if REPORT_WORKERS_MAX and 'REPORT_WORKERS' not in os.environ:
+    REPORT_WORKERS = min(REPORT_WORKERS, REPORT_WORKERS_MAX)
+# Memory budget of rendered report charts kept per process (desktop_app/shared/chart_cache.py)
+CHART_CACHE_MAX_BYTES = int(os.environ.get('CHART_CACHE_MAX_BYTES', 16 * 1024 * 1024))
+
+# How new datasets store their equipment records (analytics/record_storage.py):
+# 'rows' keeps one EquipmentRecord row per record, 'columnar' keeps packed
+# column segments, one per ingested chunk or appended file, that readers load
+# in a single query
+RECORD_STORAGE = os.environ.get('RECORD_STORAGE', 'rows')
+
+# Dataset retention (analytics/retention.py), enforced off the request path by
+# an in-process sweeper and the sweep_datasets management command. A user's
+# RetentionPolicy replaces these rules; unset rules do not apply.
+RETENTION_MAX_DATASETS = int(os.environ.get('RETENTION_MAX_DATASETS', '5')) or None
+RETENTION_MAX_AGE_DAYS = int(os.environ.get('RETENTION_MAX_AGE_DAYS', '0')) or None
+RETENTION_MAX_ROWS = int(os.environ.get('RETENTION_MAX_ROWS', '0')) or None
+# Datasets deleted per transaction by a sweep
+RETENTION_BATCH_SIZE = int(os.environ.get('RETENTION_BATCH_SIZE', '20'))
+# Seconds between full sweeps of the in-process sweeper (age rules); 0 only
+# sweeps the users who uploaded
+RETENTION_SWEEP_INTERVAL = int(os.environ.get('RETENTION_SWEEP_INTERVAL', '3600'))
+
+# Resumable chunked uploads (api/uploads/)
+CHUNKED_UPLOAD_PART_SIZE = 5 * 1024 * 1024  # 5MB default part size
+CHUNKED_UPLOAD_MAX_PART_SIZE = 8 * 1024 * 1024  # 8MB
+# Smallest part size a client may ask for (only the last part may be smaller),
+# which bounds the number of parts a session tracks
+CHUNKED_UPLOAD_MIN_PART_SIZE = 256 * 1024  # 256KB
+CHUNKED_UPLOAD_MAX_SIZE = int(os.environ.get('CHUNKED_UPLOAD_MAX_SIZE', 2 * 1024 * 1024 * 1024))  # 2GB
+# Seconds an upload session is kept after its last activity; expired sessions
+# and their parts are removed by the retention sweeper and process_jobs
+CHUNKED_UPLOAD_EXPIRY = int(os.environ.get('CHUNKED_UPLOAD_EXPIRY', 24 * 3600))
+
+# Response cache for dataset summaries, lists and history
+# (analytics/response_cache.py). The local-memory cache is private to each
+# server process; set RESPONSE_CACHE_DIR to share a file-based cache when
+# running several processes so invalidations reach all of them.
+if os.environ.get('RESPONSE_CACHE_DIR'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.environ['RESPONSE_CACHE_DIR'],
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'chemical-equipment-visualizer',
+            'OPTIONS': {'MAX_ENTRIES': 1000},
+        }
+    }
+RESPONSE_CACHE_TIMEOUT = int(os.environ.get('RESPONSE_CACHE_TIMEOUT', '600'))  # seconds
+
 # File upload settings
-FILE_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024  # 10MB
+# Uploads above this size are spooled to a temporary file that the CSV
+# parser reads in place, instead of being held in memory
+FILE_UPLOAD_MAX_MEMORY_SIZE = 2621440  # 2.5MB
 DATA_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024  # 10MB
\ No newline at end of file
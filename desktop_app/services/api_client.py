@@ -3,17 +3,70 @@ API Client for desktop application
 Handles communication with Django REST API backend
 """
 
+import hashlib
 import requests
 import json
 import os
-from typing import Dict, Any, Optional
+import struct
+import time
+from collections import OrderedDict
+import numpy as np
+from typing import Callable, Dict, Any, Optional, Tuple
+
+
+def decode_record_columns(payload: bytes) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Decode the binary equipment record layout served by the analytics endpoint
+    
+    See analytics/columnar.py on the server for the format description.
+    """
+    if payload[:6] != b'EQCOLS' or payload[6] != 1:
+        raise ValueError('Unexpected equipment record payload')
+    
+    (header_length,) = struct.unpack_from('<I', payload, 8)
+    header = json.loads(payload[12:12 + header_length])
+    row_count = header['row_count']
+    position = 12 + header_length
+    columns = {}
+    
+    for entry in header['columns']:
+        buffer = memoryview(payload)[position:position + entry['byte_length']]
+        position += entry['byte_length'] + (-entry['byte_length'] % 8)
+        
+        if entry['type'] == 'float64':
+            columns[entry['name']] = np.frombuffer(buffer, dtype='<f8', count=row_count)
+        elif entry['type'] == 'dictionary':
+            codes = np.frombuffer(buffer, dtype='<i4', count=row_count)
+            columns[entry['name']] = [entry['categories'][code] for code in codes]
+        else:
+            offsets = np.frombuffer(buffer, dtype='<i4', count=row_count + 1)
+            data = bytes(buffer[offsets.nbytes + (-offsets.nbytes % 8):])
+            columns[entry['name']] = [
+                data[start:end].decode('utf-8') for start, end in zip(offsets[:-1], offsets[1:])
+            ]
+    
+    return header, columns
 
 
 class APIClient:
     """Client for communicating with the Django REST API"""
     
+    # Attempts per upload part before giving up
+    PART_RETRIES = 3
+    
+    # GET responses kept for revalidation with If-None-Match
+    VALIDATED_RESPONSES = 64
+    
+    # Seconds between status requests while waiting for a background job
+    JOB_POLL_INTERVAL = 1.0
+    
     def __init__(self, base_url: str = "http://localhost:8000/api"):
         self.base_url = base_url
+        # Upload ids of unfinished chunked uploads, by file path, size and mtime
+        self._uploads: Dict[tuple, str] = {}
+        # ETag and body of recent GET responses, by URL and query, for
+        # conditional requests
+        self._validated: "OrderedDict[tuple, Tuple[str, bytes]]" = OrderedDict()
         self.session = requests.Session()
         self.session.headers.update({
             'Content-Type': 'application/json',
@@ -45,41 +98,204 @@ class APIClient:
         response.raise_for_status()
         return response.json()
     
-    def upload_csv(self, file_path: str) -> Dict[str, Any]:
-        """Upload CSV file"""
-        url = f"{self.base_url}/upload/"
+    def upload_csv(self, file_path: str,
+                   progress_callback: Optional[Callable[[int, int], None]] = None) -> Dict[str, Any]:
+        """
+        Upload CSV file using the resumable chunked upload API
+        
+        Parts already received by the server are skipped, so calling this
+        again after a dropped connection continues where it stopped. The
+        server ingests the assembled file in a background job, which is
+        polled until it finishes.
+        
+        Returns:
+            Status of the finished ingestion job, with the new dataset's
+            id, record count and summary
+        """
+        file_size = os.path.getsize(file_path)
+        upload = self._resume_upload(file_path, file_size)
+        
+        sent = sum(part['size'] for part in upload['received_parts'])
+        if progress_callback:
+            progress_callback(sent, file_size)
         
-        # Open file and upload using multipart/form-data
+        part_size = upload['part_size']
         with open(file_path, 'rb') as file_obj:
-            files = {'file': (os.path.basename(file_path), file_obj, 'text/csv')}
+            for first, last in upload['missing_ranges']:
+                for number in range(first, last + 1):
+                    file_obj.seek((number - 1) * part_size)
+                    body = file_obj.read(part_size)
+                    self._put_part(upload['upload_id'], number, body)
+                    
+                    sent += len(body)
+                    if progress_callback:
+                        progress_callback(sent, file_size)
+        
+        url = f"{self.base_url}/uploads/{upload['upload_id']}/complete/"
+        response = self.session.post(url)
+        if response.status_code != 500:
+            # Anything but a server error ends the session on the server side
+            self._uploads.pop(self._upload_key(file_path, file_size), None)
+        response.raise_for_status()
+        return self.wait_for_job(response.json()['job_id'])
+    
+    def get_job_status(self, job_id: str) -> Dict[str, Any]:
+        """Get state, progress and result of a background job"""
+        url = f"{self.base_url}/jobs/{job_id}/"
+        response = self.session.get(url)
+        response.raise_for_status()
+        return response.json()
+    
+    def wait_for_job(self, job_id: str) -> Dict[str, Any]:
+        """
+        Poll a background job until it succeeds or fails
+        
+        Returns:
+            Final job status
+        
+        Raises:
+            RuntimeError: If the job failed
+        """
+        while True:
+            job = self.get_job_status(job_id)
+            if job['status'] == 'succeeded':
+                return job
+            if job['status'] == 'failed':
+                raise RuntimeError(job.get('error') or 'Processing failed')
+            time.sleep(self.JOB_POLL_INTERVAL)
+    
+    def _upload_key(self, file_path: str, file_size: int) -> tuple:
+        """Identify a file version for resuming its upload"""
+        return (os.path.abspath(file_path), file_size, os.path.getmtime(file_path))
+    
+    def _resume_upload(self, file_path: str, file_size: int) -> Dict[str, Any]:
+        """Fetch the state of an earlier upload of this file, or start a new one"""
+        key = self._upload_key(file_path, file_size)
+        upload_id = self._uploads.get(key)
+        
+        if upload_id:
+            response = self.session.get(f"{self.base_url}/uploads/{upload_id}/")
+            if response.status_code == 200:
+                return response.json()
+        
+        url = f"{self.base_url}/uploads/"
+        data = {
+            'filename': os.path.basename(file_path),
+            'size': file_size
+        }
+        response = self.session.post(url, json=data)
+        response.raise_for_status()
+        upload = response.json()
+        
+        self._uploads[key] = upload['upload_id']
+        return upload
+    
+    def _put_part(self, upload_id: str, number: int, body: bytes):
+        """Send one part, retrying transient failures"""
+        url = f"{self.base_url}/uploads/{upload_id}/parts/{number}/"
+        headers = {
+            'Content-Type': 'application/octet-stream',
+            'X-Content-SHA256': hashlib.sha256(body).hexdigest()
+        }
+        
+        for attempt in range(self.PART_RETRIES):
+            try:
+                response = self.session.put(url, data=body, headers=headers)
+            except requests.ConnectionError:
+                if attempt == self.PART_RETRIES - 1:
+                    raise
+                continue
             
-            # Create a new session without JSON headers for file upload
-            # Don't use self.session for file uploads as it has JSON headers
+            # A corrupted part is rejected with 400 and can simply be resent
+            if response.status_code < 500 and response.status_code != 400:
+                break
+            if attempt == self.PART_RETRIES - 1:
+                break
+        
+        response.raise_for_status()
+    
+    def append_csv(self, dataset_id: int, file_path: str) -> Dict[str, Any]:
+        """Append rows from a CSV file to an existing dataset"""
+        url = f"{self.base_url}/datasets/{dataset_id}/append/"
+        
+        with open(file_path, 'rb') as file_obj:
+            files = {'file': (os.path.basename(file_path), file_obj, 'text/csv')}
             response = requests.post(url, files=files, cookies=self.session.cookies)
         
         response.raise_for_status()
         return response.json()
     
-    def get_analytics(self, dataset_id: int) -> Dict[str, Any]:
-        """Get analytics for a specific dataset"""
+    def export_dataset(self, dataset_id: int, file_path: str, export_format: str = 'csv') -> str:
+        """Stream all records of a dataset to a local file (csv, ndjson or json)"""
+        url = f"{self.base_url}/datasets/{dataset_id}/export/"
+        
+        with self.session.get(url, params={'format': export_format}, stream=True) as response:
+            response.raise_for_status()
+            with open(file_path, 'wb') as file_obj:
+                for block in response.iter_content(chunk_size=64 * 1024):
+                    file_obj.write(block)
+        
+        return file_path
+    
+    def get_analytics(self, dataset_id: int, limit: Optional[int] = None,
+                      after: Optional[str] = None, fields: Optional[list] = None,
+                      include_records: bool = True) -> Dict[str, Any]:
+        """
+        Get analytics for a specific dataset
+        
+        Pass ``limit`` to page through equipment records, continuing with
+        ``after`` set to the ``next_cursor`` of the previous page.
+        """
         url = f"{self.base_url}/analytics/{dataset_id}/"
-        response = self.session.get(url)
-        response.raise_for_status()
-        return response.json()
+        params = {}
+        if not include_records:
+            params['records'] = 'false'
+        if limit is not None:
+            params['limit'] = limit
+        if after is not None:
+            params['after'] = after
+        if fields:
+            params['fields'] = ','.join(fields)
+        
+        return self._conditional_get(url, params)
+    
+    def get_type_statistics(self, dataset_id: int) -> Dict[str, Any]:
+        """Get count, mean, min, max and std of each parameter per equipment type"""
+        url = f"{self.base_url}/analytics/{dataset_id}/types/"
+        return self._conditional_get(url)
+    
+    def get_record_columns(self, dataset_id: int, fields: Optional[list] = None,
+                           limit: Optional[int] = None,
+                           after: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Get equipment records as one array per field using the binary layout
+        
+        Numeric fields come back as numpy float64 arrays that can be handed
+        to matplotlib directly. The result also holds ``next_cursor``.
+        """
+        url = f"{self.base_url}/analytics/{dataset_id}/"
+        params = {'layout': 'binary'}
+        if limit is not None:
+            params['limit'] = limit
+        if after is not None:
+            params['after'] = after
+        if fields:
+            params['fields'] = ','.join(fields)
+        
+        payload = self._conditional_get(url, params, binary=True)
+        header, columns = decode_record_columns(payload)
+        columns['next_cursor'] = header.get('next_cursor')
+        return columns
     
     def get_datasets(self) -> Dict[str, Any]:
         """Get all datasets for current user"""
         url = f"{self.base_url}/datasets/"
-        response = self.session.get(url)
-        response.raise_for_status()
-        return response.json()
+        return self._conditional_get(url)
     
     def get_history(self) -> Dict[str, Any]:
         """Get dataset history (last 5 datasets)"""
         url = f"{self.base_url}/history/"
-        response = self.session.get(url)
-        response.raise_for_status()
-        return response.json()
+        return self._conditional_get(url)
     
     def delete_dataset(self, dataset_id: int) -> Dict[str, Any]:
         """Delete a specific dataset"""
@@ -88,6 +304,37 @@ class APIClient:
         response.raise_for_status()
         return response.json()
     
+    def _conditional_get(self, url: str, params: Optional[Dict[str, Any]] = None,
+                         binary: bool = False) -> Any:
+        """
+        GET a response, revalidating a previously fetched copy with its ETag
+        
+        A 304 Not Modified answer reuses the stored body, so repeat views
+        of unchanged data transfer no content. Bodies are stored as the raw
+        bytes and parsed on every call, so callers get their own objects and
+        may modify them.
+        """
+        key = (url, tuple(sorted((params or {}).items())))
+        stored = self._validated.get(key)
+        headers = {'If-None-Match': stored[0]} if stored else {}
+        
+        response = self.session.get(url, params=params, headers=headers)
+        if response.status_code == 304 and stored:
+            self._validated.move_to_end(key)
+            content = stored[1]
+        else:
+            response.raise_for_status()
+            content = response.content
+            
+            etag = response.headers.get('ETag')
+            if etag:
+                self._validated[key] = (etag, content)
+                self._validated.move_to_end(key)
+                while len(self._validated) > self.VALIDATED_RESPONSES:
+                    self._validated.popitem(last=False)
+        
+        return content if binary else json.loads(content)
+    
     def handle_request_error(self, error: requests.RequestException) -> str:
         """Handle and format request errors"""
         if hasattr(error, 'response') and error.response is not None:
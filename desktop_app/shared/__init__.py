@@ -0,0 +1 @@
+# Dependency-free modules shared with the server
\ No newline at end of file
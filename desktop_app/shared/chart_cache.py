@@ -0,0 +1,161 @@
+import hashlib
+import json
+import sys
+import threading
+import types
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+
+# Default budget of rendered charts kept per process
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+
+# Only the standard library is used here: the server imports this module as
+# desktop_app.shared.chart_cache and the desktop app as shared.chart_cache.
+
+_SKIPPED_TYPES = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType, types.MethodType)
+
+
+def chart_key(kind: str, type_distribution: Dict[str, int] = None,
+              averages: Dict[str, float] = None, **options) -> str:
+    """
+    Content hash identifying a rendered chart
+    
+    Charts drawn from the same type distribution and averages with the same
+    options look the same whichever dataset they belong to, so they share a
+    cache entry.
+    
+    Args:
+        kind: Name of the chart, e.g. 'pie' or 'averages_bar'
+        type_distribution: Equipment count per type
+        averages: Average parameter values
+        **options: Anything else the rendering depends on, e.g. size
+    
+    Returns:
+        Hex SHA-256 digest
+    """
+    content = {
+        'kind': kind,
+        # Kept as pairs: slice order and colors follow the distribution order
+        'type_distribution': list((type_distribution or {}).items()),
+        'averages': averages,
+        'options': options
+    }
+    encoded = json.dumps(content, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+def approximate_size(value: Any) -> int:
+    """
+    Approximate memory held by a cached chart, in bytes
+    
+    Image bytes count their length; other objects, such as ReportLab
+    drawings, count every object reachable through their attributes and
+    containers.
+    """
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    
+    seen = set()
+    stack = [value]
+    total = 0
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen or isinstance(obj, _SKIPPED_TYPES):
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj)
+        
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+        if hasattr(obj, '__dict__'):
+            stack.append(obj.__dict__)
+    return total
+
+
+class ChartCache:
+    """
+    Least recently used cache of rendered charts, bounded by total size
+    
+    Values are whatever the renderer returns (PNG bytes, ReportLab drawings)
+    and must not be modified by callers, as every hit returns the same
+    object.
+    """
+    
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries: 'OrderedDict[str, tuple]' = OrderedDict()
+        self._size = 0
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+    
+    def __len__(self):
+        return len(self._entries)
+    
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached chart for ``key``, or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[0]
+    
+    def put(self, key: str, value: Any, size: int = None):
+        """
+        Store a rendered chart, evicting the least recently used ones
+        
+        Charts larger than the whole budget are not stored.
+        """
+        if size is None:
+            size = approximate_size(value)
+        if size > self.max_bytes:
+            return
+        
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= previous[1]
+            
+            self._entries[key] = (value, size)
+            self._size += size
+            
+            while self._size > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._size -= evicted_size
+    
+    def get_or_render(self, key: str, render: Callable[[], Any]) -> Any:
+        """
+        Return the cached chart for ``key``, rendering and storing it on a miss
+        
+        Rendering happens outside the lock, so two threads missing on the
+        same key at once may both render it.
+        """
+        value = self.get(key)
+        if value is None:
+            value = render()
+            self.put(key, value)
+        return value
+    
+    def clear(self):
+        """Drop every cached chart"""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+    
+    def stats(self) -> Dict[str, Any]:
+        """Entry count, size and hit counters of the cache"""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._size,
+                'max_bytes': self.max_bytes,
+                'hits': self._hits,
+                'misses': self._misses
+            }
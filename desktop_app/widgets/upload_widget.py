@@ -16,6 +16,7 @@ class FileUploadThread(QThread):
     
     upload_finished = pyqtSignal(dict)  # Success signal
     upload_error = pyqtSignal(str)      # Error signal
+    upload_progress = pyqtSignal(int)   # Percentage of bytes sent
     
     def __init__(self, api_client, file_path):
         super().__init__()
@@ -25,13 +26,17 @@ class FileUploadThread(QThread):
     def run(self):
         """Run the upload in background thread"""
         try:
-            response = self.api_client.upload_csv(self.file_path)
+            response = self.api_client.upload_csv(self.file_path, self.report_progress)
             self.upload_finished.emit(response)
         except requests.RequestException as e:
             error_msg = self.api_client.handle_request_error(e)
             self.upload_error.emit(error_msg)
         except Exception as e:
             self.upload_error.emit(str(e))
+    
+    def report_progress(self, sent, total):
+        """Forward chunked upload progress to the UI thread"""
+        self.upload_progress.emit(int(sent * 100 / total) if total else 100)
 
 
 class UploadWidget(QWidget):
@@ -126,7 +131,7 @@ class UploadWidget(QWidget):
         drop_text.setStyleSheet("color: #666; font-size: 14px;")
         drop_layout.addWidget(drop_text)
         
-        requirements_text = QLabel("Max file size: 10MB | Format: CSV")
+        requirements_text = QLabel("Large files are uploaded in resumable parts | Format: CSV")
         requirements_text.setAlignment(Qt.AlignCenter)
         requirements_text.setStyleSheet("color: #999; font-size: 12px; margin-top: 5px;")
         drop_layout.addWidget(requirements_text)
@@ -274,9 +279,6 @@ class UploadWidget(QWidget):
             return
         
         file_size = os.path.getsize(file_path)
-        if file_size > 10 * 1024 * 1024:  # 10MB limit
-            QMessageBox.warning(self, "File Too Large", "File size must be less than 10MB.")
-            return
         
         self.selected_file = file_path
         
@@ -309,7 +311,8 @@ class UploadWidget(QWidget):
         
         # Show progress and disable controls
         self.progress_bar.show()
-        self.progress_bar.setRange(0, 0)  # Indeterminate progress
+        self.progress_bar.setRange(0, 100)
+        self.progress_bar.setValue(0)
         self.upload_btn.setEnabled(False)
         self.upload_btn.setText("Uploading...")
         
@@ -317,8 +320,18 @@ class UploadWidget(QWidget):
         self.upload_thread = FileUploadThread(self.api_client, self.selected_file)
         self.upload_thread.upload_finished.connect(self.on_upload_success)
         self.upload_thread.upload_error.connect(self.on_upload_error)
+        self.upload_thread.upload_progress.connect(self.on_upload_progress)
         self.upload_thread.start()
     
+    @pyqtSlot(int)
+    def on_upload_progress(self, percent):
+        """Update progress bar; switch to indeterminate while the server processes"""
+        if percent >= 100:
+            self.progress_bar.setRange(0, 0)
+            self.upload_btn.setText("Processing...")
+        else:
+            self.progress_bar.setValue(percent)
+    
     @pyqtSlot(dict)
     def on_upload_success(self, response):
         """Handle successful upload"""
@@ -14,6 +14,8 @@ from PyQt5.QtCore import Qt, pyqtSignal, QThread, pyqtSlot
 from PyQt5.QtGui import QFont
 import requests
 
+from shared.chart_cache import chart_key
+
 
 class AnalyticsLoadThread(QThread):
     """Thread for loading analytics data"""
@@ -21,15 +23,20 @@ class AnalyticsLoadThread(QThread):
     data_loaded = pyqtSignal(dict)  # Success signal
     load_error = pyqtSignal(str)    # Error signal
     
-    def __init__(self, api_client, dataset_id):
+    def __init__(self, api_client, dataset_id, after=None):
         super().__init__()
         self.api_client = api_client
         self.dataset_id = dataset_id
+        self.after = after
     
     def run(self):
         """Load analytics data in background"""
         try:
-            response = self.api_client.get_analytics(self.dataset_id)
+            response = self.api_client.get_analytics(
+                self.dataset_id,
+                limit=VisualizationWidget.RECORD_PAGE_SIZE,
+                after=self.after
+            )
             self.data_loaded.emit(response)
         except requests.RequestException as e:
             error_msg = self.api_client.handle_request_error(e)
@@ -54,11 +61,17 @@ class MatplotlibCanvas(FigureCanvas):
 class VisualizationWidget(QWidget):
     """Widget for data visualization using matplotlib"""
     
+    # Equipment records fetched per request; more are loaded on demand
+    RECORD_PAGE_SIZE = 500
+    
     def __init__(self, api_client):
         super().__init__()
         self.api_client = api_client
         self.analytics_data = None
+        self.dataset_id = None
         self.current_chart = 'averages'
+        # chart_key of what the canvas shows, or None
+        self.drawn_chart = None
         self.load_thread = None
         self.init_ui()
     
@@ -266,6 +279,12 @@ class VisualizationWidget(QWidget):
         """)
         
         table_layout.addWidget(self.equipment_table)
+        
+        self.load_more_btn = QPushButton("Load More Records")
+        self.load_more_btn.clicked.connect(self.load_more_records)
+        self.load_more_btn.hide()
+        table_layout.addWidget(self.load_more_btn)
+        
         layout.addWidget(table_frame)
     
     def show_empty_state(self):
@@ -286,9 +305,11 @@ class VisualizationWidget(QWidget):
         ax.set_xticks([])
         ax.set_yticks([])
         self.canvas.draw()
+        self.drawn_chart = None
         
         # Clear table
         self.equipment_table.setRowCount(0)
+        self.load_more_btn.hide()
     
     def load_dataset(self, dataset_id):
         """Load dataset analytics"""
@@ -296,6 +317,7 @@ class VisualizationWidget(QWidget):
             self.load_thread.quit()
             self.load_thread.wait()
         
+        self.dataset_id = dataset_id
         self.load_thread = AnalyticsLoadThread(self.api_client, dataset_id)
         self.load_thread.data_loaded.connect(self.on_data_loaded)
         self.load_thread.load_error.connect(self.on_load_error)
@@ -305,12 +327,40 @@ class VisualizationWidget(QWidget):
         self.dataset_title.setText("Loading dataset...")
         self.dataset_metadata.setText("Please wait while we load the analytics data")
     
+    def load_more_records(self):
+        """Load the next page of equipment records"""
+        pagination = (self.analytics_data or {}).get('pagination') or {}
+        if not pagination.get('next_cursor') or (self.load_thread and self.load_thread.isRunning()):
+            return
+        
+        self.load_more_btn.setEnabled(False)
+        self.load_thread = AnalyticsLoadThread(
+            self.api_client, self.dataset_id, after=pagination['next_cursor']
+        )
+        self.load_thread.data_loaded.connect(self.on_records_loaded)
+        self.load_thread.load_error.connect(self.on_records_error)
+        self.load_thread.start()
+    
     @pyqtSlot(dict)
     def on_data_loaded(self, data):
         """Handle successful data loading"""
         self.analytics_data = data
         self.update_display()
     
+    @pyqtSlot(dict)
+    def on_records_loaded(self, data):
+        """Append a further page of equipment records to the table"""
+        self.analytics_data['equipment_records'].extend(data['equipment_records'])
+        self.analytics_data['pagination'] = data.get('pagination')
+        self.append_equipment_rows(data['equipment_records'])
+        self.update_load_more_button()
+    
+    @pyqtSlot(str)
+    def on_records_error(self, error_message):
+        """Handle failure to load a further page, keeping what is shown"""
+        QMessageBox.warning(self, "Load Error", f"Failed to load more records: {error_message}")
+        self.load_more_btn.setEnabled(True)
+    
     @pyqtSlot(str)
     def on_load_error(self, error_message):
         """Handle data loading error"""
@@ -344,6 +394,7 @@ class VisualizationWidget(QWidget):
         
         # Update table
         self.update_equipment_table(equipment_records)
+        self.update_load_more_button()
     
     def update_chart(self):
         """Update the matplotlib chart"""
@@ -352,6 +403,15 @@ class VisualizationWidget(QWidget):
         
         summary = self.analytics_data['summary']
         
+        # Reloading a dataset, or opening one with the same summary, leaves
+        # the chart already drawn in place
+        if self.current_chart == 'averages':
+            key = chart_key('averages_bar', averages=summary['averages'])
+        else:
+            key = chart_key('distribution_pie', summary['type_distribution'])
+        if key == self.drawn_chart:
+            return
+        
         # Clear previous plot
         self.canvas.fig.clear()
         
@@ -361,6 +421,7 @@ class VisualizationWidget(QWidget):
             self.plot_distribution_chart(summary)
         
         self.canvas.draw()
+        self.drawn_chart = key
     
     def plot_averages_chart(self, summary):
         """Plot parameter averages bar chart"""
@@ -415,9 +476,15 @@ class VisualizationWidget(QWidget):
     
     def update_equipment_table(self, equipment_records):
         """Update equipment records table"""
-        self.equipment_table.setRowCount(len(equipment_records))
+        self.equipment_table.setRowCount(0)
+        self.append_equipment_rows(equipment_records)
+    
+    def append_equipment_rows(self, equipment_records):
+        """Add equipment records below the rows already in the table"""
+        first_row = self.equipment_table.rowCount()
+        self.equipment_table.setRowCount(first_row + len(equipment_records))
         
-        for row, record in enumerate(equipment_records):
+        for row, record in enumerate(equipment_records, start=first_row):
             items = [
                 record['equipment_name'],
                 record['equipment_type'],
@@ -434,6 +501,16 @@ class VisualizationWidget(QWidget):
         # Resize columns to content
         self.equipment_table.resizeColumnsToContents()
     
+    def update_load_more_button(self):
+        """Show the load more button while further record pages exist"""
+        pagination = self.analytics_data.get('pagination') or {}
+        loaded = len(self.analytics_data['equipment_records'])
+        total = self.analytics_data['metadata']['record_count']
+        
+        self.load_more_btn.setEnabled(True)
+        self.load_more_btn.setText(f"Load More Records ({loaded} of {total} shown)")
+        self.load_more_btn.setVisible(bool(pagination.get('has_more')))
+    
     def switch_chart(self, chart_type):
         """Switch between chart types"""
         self.current_chart = chart_type
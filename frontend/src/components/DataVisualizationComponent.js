@@ -23,11 +23,15 @@ ChartJS.register(
   ArcElement
 );
 
+// Equipment records fetched per request; more are loaded on demand
+const RECORD_PAGE_SIZE = 500;
+
 const DataVisualizationComponent = ({ dataset }) => {
   const [analyticsData, setAnalyticsData] = useState(null);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState('');
   const [activeChart, setActiveChart] = useState('averages');
+  const [loadingMore, setLoadingMore] = useState(false);
 
   useEffect(() => {
     const loadAnalyticsData = async () => {
@@ -36,7 +40,7 @@ const DataVisualizationComponent = ({ dataset }) => {
         setError('');
         
         try {
-          const response = await getAnalytics(dataset.id);
+          const response = await getAnalytics(dataset.id, { limit: RECORD_PAGE_SIZE });
           setAnalyticsData(response.data);
         } catch (error) {
           setError('Failed to load analytics data');
@@ -50,6 +54,27 @@ const DataVisualizationComponent = ({ dataset }) => {
     loadAnalyticsData();
   }, [dataset]);
 
+  const loadMoreRecords = async () => {
+    const cursor = analyticsData?.pagination?.next_cursor;
+    if (!cursor || loadingMore) {
+      return;
+    }
+
+    setLoadingMore(true);
+    try {
+      const response = await getAnalytics(dataset.id, { limit: RECORD_PAGE_SIZE, after: cursor });
+      setAnalyticsData((current) => ({
+        ...current,
+        equipment_records: [...current.equipment_records, ...response.data.equipment_records],
+        pagination: response.data.pagination,
+      }));
+    } catch (error) {
+      console.error('Analytics error:', error);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   if (loading) {
     return <div className="loading">Loading analytics...</div>;
   }
@@ -62,7 +87,7 @@ const DataVisualizationComponent = ({ dataset }) => {
     return <div className="error-message">No analytics data available</div>;
   }
 
-  const { summary, equipment_records, metadata } = analyticsData;
+  const { summary, equipment_records, metadata, pagination } = analyticsData;
 
   // Chart data for averages
   const averagesChartData = {
@@ -207,6 +232,13 @@ const DataVisualizationComponent = ({ dataset }) => {
             </tbody>
           </table>
         </div>
+        {pagination?.has_more && (
+          <button className="load-more-btn" onClick={loadMoreRecords} disabled={loadingMore}>
+            {loadingMore
+              ? 'Loading...'
+              : `Load More Records (${equipment_records.length} of ${metadata.record_count} shown)`}
+          </button>
+        )}
       </div>
     </div>
   );
@@ -5,6 +5,7 @@ import './FileUploadComponent.css';
 const FileUploadComponent = ({ onDatasetUploaded }) => {
   const [file, setFile] = useState(null);
   const [uploading, setUploading] = useState(false);
+  const [progress, setProgress] = useState(0);
   const [error, setError] = useState('');
   const [success, setSuccess] = useState('');
   const [dragOver, setDragOver] = useState(false);
@@ -19,11 +20,6 @@ const FileUploadComponent = ({ onDatasetUploaded }) => {
       return;
     }
     
-    if (selectedFile.size > 10 * 1024 * 1024) {
-      setError('File size must be less than 10MB');
-      return;
-    }
-    
     setFile(selectedFile);
   };
 
@@ -61,11 +57,14 @@ const FileUploadComponent = ({ onDatasetUploaded }) => {
     }
 
     setUploading(true);
+    setProgress(0);
     setError('');
     setSuccess('');
 
     try {
-      const response = await uploadCSV(file);
+      const response = await uploadCSV(file, (sent, total) => {
+        setProgress(total ? Math.round((sent * 100) / total) : 100);
+      });
       setSuccess(`File uploaded successfully! ${response.data.record_count} records processed.`);
       onDatasetUploaded({
         id: response.data.dataset_id,
@@ -78,7 +77,7 @@ const FileUploadComponent = ({ onDatasetUploaded }) => {
         fileInputRef.current.value = '';
       }
     } catch (error) {
-      setError(error.response?.data?.error || 'Upload failed');
+      setError(error.response?.data?.error || error.message || 'Upload failed');
     } finally {
       setUploading(false);
     }
@@ -103,7 +102,7 @@ const FileUploadComponent = ({ onDatasetUploaded }) => {
         <div className="drop-zone-content">
           <div className="upload-icon">📁</div>
           <p>Drag and drop your CSV file here, or click to browse</p>
-          <p className="file-requirements">Max file size: 10MB | Format: CSV</p>
+          <p className="file-requirements">Large files are uploaded in resumable parts | Format: CSV</p>
         </div>
       </div>
 
@@ -124,6 +123,13 @@ const FileUploadComponent = ({ onDatasetUploaded }) => {
         </div>
       )}
 
+      {uploading && (
+        <div className="upload-progress">
+          <progress value={progress} max="100" />
+          <span>{progress < 100 ? `Uploading... ${progress}%` : 'Processing...'}</span>
+        </div>
+      )}
+
       {error && <div className="error-message">{error}</div>}
       {success && <div className="success-message">{success}</div>}
 
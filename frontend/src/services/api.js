@@ -8,6 +8,45 @@ const api = axios.create({
   withCredentials: true,
 });
 
+// ETag and body of recent GET responses, by URL, for conditional requests.
+// A 304 Not Modified answer is turned back into the stored response.
+const MAX_VALIDATED_RESPONSES = 64;
+const validatedResponses = new Map();
+
+api.interceptors.request.use((config) => {
+  if ((config.method || 'get').toLowerCase() === 'get') {
+    const stored = validatedResponses.get(api.getUri(config));
+    if (stored) {
+      config.headers['If-None-Match'] = stored.etag;
+      config.validateStatus = (status) => (status >= 200 && status < 300) || status === 304;
+    }
+  }
+  return config;
+});
+
+api.interceptors.response.use((response) => {
+  if ((response.config.method || 'get').toLowerCase() !== 'get') {
+    return response;
+  }
+
+  const key = api.getUri(response.config);
+  const stored = validatedResponses.get(key);
+  if (response.status === 304 && stored) {
+    return { ...response, status: 200, data: stored.data };
+  }
+
+  const etag = response.headers.etag;
+  if (etag) {
+    // Re-insert so the map stays in least recently used order
+    validatedResponses.delete(key);
+    validatedResponses.set(key, { etag, data: response.data });
+    if (validatedResponses.size > MAX_VALIDATED_RESPONSES) {
+      validatedResponses.delete(validatedResponses.keys().next().value);
+    }
+  }
+  return response;
+});
+
 // Authentication API calls
 export const login = (username, password) => {
   return api.post('/auth/login/', { username, password });
@@ -22,18 +61,201 @@ export const checkAuthStatus = () => {
 };
 
 // Dataset API calls
-export const uploadCSV = (file) => {
+// Upload ids of unfinished chunked uploads, so a reload can resume them
+const PENDING_UPLOADS_KEY = 'pendingUploads';
+const PART_RETRIES = 3;
+// Milliseconds between status requests while waiting for a background job
+const JOB_POLL_INTERVAL = 1000;
+
+const uploadKey = (file) => `${file.name}:${file.size}:${file.lastModified}`;
+
+const loadPendingUploads = () => {
+  try {
+    return JSON.parse(localStorage.getItem(PENDING_UPLOADS_KEY)) || {};
+  } catch (e) {
+    return {};
+  }
+};
+
+const savePendingUpload = (file, uploadId) => {
+  const pending = loadPendingUploads();
+  if (uploadId) {
+    pending[uploadKey(file)] = uploadId;
+  } else {
+    delete pending[uploadKey(file)];
+  }
+  localStorage.setItem(PENDING_UPLOADS_KEY, JSON.stringify(pending));
+};
+
+const sha256Hex = async (buffer) => {
+  const digest = await crypto.subtle.digest('SHA-256', buffer);
+  return Array.from(new Uint8Array(digest))
+    .map((byte) => byte.toString(16).padStart(2, '0'))
+    .join('');
+};
+
+const resumeUpload = async (file) => {
+  const uploadId = loadPendingUploads()[uploadKey(file)];
+  if (uploadId) {
+    try {
+      const response = await api.get(`/uploads/${uploadId}/`);
+      return response.data;
+    } catch (e) {
+      savePendingUpload(file, null);
+    }
+  }
+
+  const response = await api.post('/uploads/', { filename: file.name, size: file.size });
+  savePendingUpload(file, response.data.upload_id);
+  return response.data;
+};
+
+const putPart = async (uploadId, number, body) => {
+  const checksum = await sha256Hex(body);
+  for (let attempt = 1; ; attempt++) {
+    try {
+      return await api.put(`/uploads/${uploadId}/parts/${number}/`, body, {
+        headers: {
+          'Content-Type': 'application/octet-stream',
+          'X-Content-SHA256': checksum,
+        },
+      });
+    } catch (error) {
+      const status = error.response?.status;
+      const retryable = !status || status >= 500 || status === 400;
+      if (!retryable || attempt >= PART_RETRIES) {
+        throw error;
+      }
+    }
+  }
+};
+
+// Upload a CSV file in resumable parts; onProgress receives (sentBytes, totalBytes)
+export const uploadCSV = async (file, onProgress) => {
+  const upload = await resumeUpload(file);
+  let sent = upload.received_parts.reduce((total, part) => total + part.size, 0);
+  if (onProgress) {
+    onProgress(sent, file.size);
+  }
+
+  for (const [first, last] of upload.missing_ranges) {
+    for (let number = first; number <= last; number++) {
+      const start = (number - 1) * upload.part_size;
+      const body = await file.slice(start, start + upload.part_size).arrayBuffer();
+      await putPart(upload.upload_id, number, body);
+
+      sent += body.byteLength;
+      if (onProgress) {
+        onProgress(sent, file.size);
+      }
+    }
+  }
+
+  let response;
+  try {
+    response = await api.post(`/uploads/${upload.upload_id}/complete/`);
+    savePendingUpload(file, null);
+  } catch (error) {
+    // Anything but a server error ends the session on the server side
+    if (error.response && error.response.status !== 500) {
+      savePendingUpload(file, null);
+    }
+    throw error;
+  }
+
+  // The server ingests the file in a background job; resolve with its final status
+  return waitForJob(response.data.job_id);
+};
+
+export const getJobStatus = (jobId) => {
+  return api.get(`/jobs/${jobId}/`);
+};
+
+// Poll a background job until it succeeds (resolving with the status
+// response) or fails (rejecting with the job error)
+export const waitForJob = async (jobId) => {
+  for (;;) {
+    const response = await getJobStatus(jobId);
+    if (response.data.status === 'succeeded') {
+      return response;
+    }
+    if (response.data.status === 'failed') {
+      throw new Error(response.data.error || 'Processing failed');
+    }
+    await new Promise((resolve) => setTimeout(resolve, JOB_POLL_INTERVAL));
+  }
+};
+
+export const appendCSV = (datasetId, file) => {
   const formData = new FormData();
   formData.append('file', file);
-  return api.post('/upload/', formData, {
+  return api.post(`/datasets/${datasetId}/append/`, formData, {
     headers: {
       'Content-Type': 'multipart/form-data',
     },
   });
 };
 
-export const getAnalytics = (datasetId) => {
-  return api.get(`/analytics/${datasetId}/`);
+// Download every record of a dataset as 'csv', 'ndjson' or 'json'
+export const exportDataset = (datasetId, format = 'csv') => {
+  return api.get(`/datasets/${datasetId}/export/`, {
+    params: { format },
+    responseType: 'blob',
+  });
+};
+
+// Pass { limit, after, fields, records: false } to page or trim equipment records
+export const getAnalytics = (datasetId, params = {}) => {
+  return api.get(`/analytics/${datasetId}/`, { params });
+};
+
+// Count, mean, min, max and std of each parameter per equipment type
+export const getTypeStatistics = (datasetId) => {
+  return api.get(`/analytics/${datasetId}/types/`);
+};
+
+// Decode the binary equipment record layout (see analytics/columnar.py).
+// Numeric fields become Float64Array views over the response buffer.
+export const decodeRecordColumns = (buffer) => {
+  const view = new DataView(buffer);
+  const magic = String.fromCharCode(...new Uint8Array(buffer, 0, 6));
+  if (magic !== 'EQCOLS' || view.getUint8(6) !== 1) {
+    throw new Error('Unexpected equipment record payload');
+  }
+
+  const headerLength = view.getUint32(8, true);
+  const decoder = new TextDecoder();
+  const header = JSON.parse(decoder.decode(new Uint8Array(buffer, 12, headerLength)));
+  const rowCount = header.row_count;
+  const columns = {};
+  let position = 12 + headerLength;
+
+  header.columns.forEach((entry) => {
+    if (entry.type === 'float64') {
+      columns[entry.name] = new Float64Array(buffer, position, rowCount);
+    } else if (entry.type === 'dictionary') {
+      const codes = new Int32Array(buffer, position, rowCount);
+      columns[entry.name] = Array.from(codes, (code) => entry.categories[code]);
+    } else {
+      const offsets = new Int32Array(buffer, position, rowCount + 1);
+      const dataStart = position + Math.ceil(offsets.byteLength / 8) * 8;
+      columns[entry.name] = Array.from({ length: rowCount }, (_, index) =>
+        decoder.decode(new Uint8Array(buffer, dataStart + offsets[index], offsets[index + 1] - offsets[index]))
+      );
+    }
+    position += Math.ceil(entry.byte_length / 8) * 8;
+  });
+
+  return { header, columns };
+};
+
+// Fetch equipment records as one array per field using the binary layout
+export const getRecordColumns = async (datasetId, params = {}) => {
+  const response = await api.get(`/analytics/${datasetId}/`, {
+    params: { ...params, layout: 'binary' },
+    responseType: 'arraybuffer',
+  });
+  return decodeRecordColumns(response.data);
 };
 
 export const getDatasets = () => {